@@ -1 +1,10 @@
 import signal
+import cache
+import fftfilt
+import timebase
+import envelope
+import spectra
+import faketree
+import loadstats
+import prefetch
+import quality
@@ -0,0 +1,188 @@
+'''This module implements a local, on-disk cache of the raw windows
+retrieved from the DIII-D bi-color interferometer (BCI) system.
+
+'''
+
+
+import os
+import shutil
+import tempfile
+import numpy as np
+
+
+class WindowCache(object):
+    '''A local, on-disk cache of raw BCI windows.
+
+    Each window is stored as a `.npy` file at
+
+                <path>/<shot>/<node>.npy,
+
+    where <node> is the window's MDSplus node (e.g. 'PL1V2_UF_3'), which
+    uniquely specifies the window's chord, beam, and type of phase data.
+    Arrays derived from a shot's windows (e.g. the envelope pyramids of
+    :py:meth:`Phase.envelope <bci.signal.Phase.envelope>`) may be stored
+    alongside the windows under any other name that uniquely specifies
+    their parameters. Cached windows are memory-mapped rather than
+    read into memory, such that only the points that are actually
+    used are read from disk.
+
+    When the size of the cache exceeds `max_bytes`, the least-recently
+    used windows are evicted until the size of the cache falls below
+    `max_bytes`.
+
+    Attributes:
+    -----------
+    path - string
+        The cache's root directory.
+
+    max_bytes - int or None
+        The maximum size of the cache. If `None`, the size of
+        the cache is unbounded.
+        [max_bytes] = bytes
+
+    Methods:
+    --------
+    get - get a cached window (memory-mapped) or `None` if not cached
+    has - check whether a window is cached
+    put - store a window in the cache
+    size - get the total size of the cached windows
+    clear - remove all windows from the cache
+
+    '''
+    def __init__(self, path, max_bytes=None):
+        '''Create an instance of the `WindowCache` class.
+
+        Input parameters:
+        -----------------
+        path - string
+            The cache's root directory. The directory is created
+            if it does not already exist.
+
+        max_bytes - int or None
+            The maximum size of the cache. If `None`, the size
+            of the cache is unbounded.
+            [max_bytes] = bytes
+
+        '''
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.max_bytes = max_bytes
+
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+
+    def _filename(self, shot, node):
+        'Get name of file corresponding to `node` in `shot`.'
+        return os.path.join(
+            self.path, str(shot), '%s.npy' % node.lstrip('\\'))
+
+    def get(self, shot, node):
+        '''Get window `node` of `shot` from the cache.
+
+        Returns a read-only, memory-mapped array if the window
+        is cached and `None` otherwise.
+
+        '''
+        fname = self._filename(shot, node)
+
+        try:
+            x = np.load(fname, mmap_mode='r')
+        except IOError:
+            return None
+
+        # Mark as most-recently used
+        os.utime(fname, None)
+
+        return x
+
+    def has(self, shot, node):
+        '''Check whether window `node` of `shot` is cached, without
+        reading the window or marking it as used.'''
+        return os.path.isfile(self._filename(shot, node))
+
+    def put(self, shot, node, x):
+        '''Store window `node` of `shot` with values `x` in the cache.
+
+        The window is first written to a temporary file and then
+        renamed, such that a partially written window is never read
+        from the cache (e.g. if the writing process is interrupted).
+
+        '''
+        fname = self._filename(shot, node)
+        directory = os.path.dirname(fname)
+
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # Directory created concurrently by another writer
+                if not os.path.isdir(directory):
+                    raise
+
+        fd, tmp = tempfile.mkstemp(suffix='.tmp', dir=directory)
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, np.asarray(x))
+
+            os.rename(tmp, fname)
+        except:
+            os.remove(tmp)
+            raise
+
+        if self.max_bytes is not None:
+            self._evict()
+
+        return
+
+    def _files(self):
+        'Get list of (modification time, size, name) of cached windows.'
+        files = []
+
+        for root, dirs, names in os.walk(self.path):
+            for name in names:
+                if name.endswith('.npy'):
+                    fname = os.path.join(root, name)
+
+                    try:
+                        st = os.stat(fname)
+                    except OSError:
+                        # Evicted concurrently by another process
+                        continue
+
+                    files.append((st.st_mtime, st.st_size, fname))
+
+        return files
+
+    def _evict(self):
+        'Evict least-recently used windows until cache is below size limit.'
+        files = sorted(self._files())
+        size = sum([f[1] for f in files])
+
+        # The most-recently used window is never evicted
+        for mtime, fsize, fname in files[:-1]:
+            if size <= self.max_bytes:
+                break
+
+            try:
+                os.remove(fname)
+            except OSError:
+                pass
+
+            size -= fsize
+
+        return
+
+    def size(self):
+        '''Get the total size of the cached windows.
+
+        [size] = bytes
+
+        '''
+        return sum([f[1] for f in self._files()])
+
+    def clear(self):
+        'Remove all windows from the cache.'
+        for name in os.listdir(self.path):
+            shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+
+        return
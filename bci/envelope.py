@@ -0,0 +1,234 @@
+'''This module implements multi-resolution min/max/mean envelopes
+for quickly plotting long signals retrieved from the DIII-D
+bi-color interferometer (BCI) system.
+
+'''
+
+
+import numpy as np
+
+
+# Number of points per block of the finest level of an envelope
+_block = 2 ** 6
+
+
+class Envelope(object):
+    '''A multi-resolution (min, max, mean) pyramid of a uniformly
+    sampled signal, for quick-look plotting at any zoom level.
+
+    The finest level of the pyramid summarizes the signal in consecutive
+    blocks of `block` points, and each successive level summarizes
+    the previous level in pairs of blocks, until a single block spans
+    the signal. The pyramid thus requires roughly 6 / `block` times
+    the memory of the signal, and a plot-ready envelope of any portion
+    of the signal can be obtained without touching the signal itself.
+
+    Attributes:
+    -----------
+    t0 - float
+        The time of the first point of the signal.
+        [t0] = s
+
+    Fs - float
+        The sampling rate of the signal.
+        [Fs] = samples / s
+
+    N - int
+        The number of points in the signal.
+
+    block - int
+        The number of points per block of the finest level.
+
+    data - array_like, (3, `M`)
+        The minimum, maximum, and mean of each block of each level,
+        concatenated from the finest to the coarsest level.
+        See :py:func:`pyramid <bci.envelope.pyramid>`.
+
+    Methods:
+    --------
+    get - get the envelope of the signal between two times,
+        resolved into (at least) a given number of blocks
+
+    '''
+    def __init__(self, t0, Fs, N, data, block=_block):
+        '''Create an instance of the `Envelope` class.
+
+        Input parameters:
+        -----------------
+        t0 - float
+            The time of the first point of the signal.
+            [t0] = s
+
+        Fs - float
+            The sampling rate of the signal.
+            [Fs] = samples / s
+
+        N - int
+            The number of points in the signal.
+
+        data - array_like, (3, `M`)
+            The pyramid of the signal, as computed by
+            :py:func:`pyramid <bci.envelope.pyramid>` with `block`.
+
+        block - int
+            The number of points per block of the finest level.
+
+        '''
+        self.t0 = t0
+        self.Fs = Fs
+        self.N = N
+        self.block = block
+        self.data = data
+
+        # Split the concatenated levels
+        self._levels = []
+        start = 0
+
+        for Nblocks in _level_lengths(N, block):
+            self._levels.append(data[:, start:(start + Nblocks)])
+            start += Nblocks
+
+    def get(self, tlim=None, npixels=1000, x=None):
+        '''Get the envelope of the signal between times `tlim`.
+
+        Parameters:
+        -----------
+        tlim - array_like, (2,), or None
+            The lower and upper limits in time of the envelope. Blocks
+            that overlap `tlim` are returned in full, such that the
+            envelope may extend slightly beyond `tlim`. If `None`,
+            get the envelope of the entire signal.
+            [tlim] = s
+
+        npixels - int
+            The minimum number of blocks spanning `tlim`, e.g. the width
+            of the plot in pixels. The coarsest level with at least
+            `npixels` blocks between `tlim` is used.
+
+        x - array_like, (`N`,), or None
+            The signal itself. If not `None` and fewer than `block` points
+            per block would be needed, the points of `x` between `tlim`
+            are returned directly (with identical minima, maxima,
+            and means). Otherwise, the finest level is used.
+
+        Returns:
+        --------
+        (t, xmin, xmax, xmean) - tuple of array_like, each (`Nblocks`,),
+            with the time at the center of each block and the minimum,
+            maximum, and mean of the signal within each block, e.g. for
+            plotting via `fill_between(t, xmin, xmax)`.
+
+        '''
+        if tlim is None:
+            tlim = [self.t0, self.t0 + ((self.N - 1) / self.Fs)]
+
+        tlim = np.sort(tlim)
+
+        # Indices of the first and last points between `tlim`
+        n0 = int(np.ceil((tlim[0] - self.t0) * self.Fs))
+        n1 = int(np.floor((tlim[1] - self.t0) * self.Fs))
+        n0 = min(max(n0, 0), self.N - 1)
+        n1 = min(max(n1, n0), self.N - 1)
+
+        # Points per block needed to resolve `tlim` into `npixels` blocks
+        ppb = (n1 - n0 + 1) / float(npixels)
+
+        if (ppb < self.block) and (x is not None):
+            t = self.t0 + (np.arange(n0, n1 + 1) / self.Fs)
+            xs = np.asarray(x[n0:(n1 + 1)])
+
+            return t, xs, xs, xs
+
+        level = int(np.floor(np.log2(max(ppb / self.block, 1))))
+        level = min(level, len(self._levels) - 1)
+
+        size = self.block * (2 ** level)
+        b0 = n0 // size
+        b1 = n1 // size
+
+        xmin, xmax, xmean = self._levels[level][:, b0:(b1 + 1)]
+
+        # Center of each block; the final block may be partial
+        start = np.arange(b0, b1 + 1) * size
+        stop = np.minimum(start + size, self.N)
+        t = self.t0 + ((0.5 * (start + stop - 1)) / self.Fs)
+
+        return t, xmin, xmax, xmean
+
+
+def pyramid(x, block=_block):
+    '''Compute the (min, max, mean) pyramid of signal `x`.
+
+    Parameters:
+    -----------
+    x - array_like, (`N`,)
+        The signal. Only a single pass through `x` is made
+        (to compute the finest level).
+
+    block - int
+        The number of points per block of the finest level.
+
+    Returns:
+    --------
+    data - array_like, (3, `M`)
+        The minimum, maximum, and mean of each block of each level,
+        concatenated from the finest to the coarsest level,
+        where level `k` has blocks of `block * (2 ** k)` points.
+        The final block of each level may be partial.
+
+    '''
+    N = len(x)
+    lengths = _level_lengths(N, block)
+
+    data = np.zeros((3, sum(lengths)), dtype=x.dtype)
+
+    # Finest level, with full blocks summarized via a reshaped view
+    Nfull = N // block
+    full = x[:(Nfull * block)].reshape(Nfull, block)
+    level = data[:, :lengths[0]]
+
+    full.min(axis=-1, out=level[0, :Nfull])
+    full.max(axis=-1, out=level[1, :Nfull])
+    full.mean(axis=-1, out=level[2, :Nfull])
+
+    if Nfull < lengths[0]:
+        partial = x[(Nfull * block):]
+        level[:, -1] = [partial.min(), partial.max(), partial.mean()]
+
+    # Coarser levels, by combining pairs of blocks
+    start = 0
+    size = block
+
+    for Nblocks, Ncoarse in zip(lengths[:-1], lengths[1:]):
+        fine = data[:, start:(start + Nblocks)]
+        coarse = data[:, (start + Nblocks):(start + Nblocks + Ncoarse)]
+
+        # Number of points in each fine block
+        counts = np.minimum(size, N - (np.arange(Nblocks) * size))
+
+        # Pad to an even number of blocks; padded blocks have no points
+        if Nblocks % 2:
+            fine = np.concatenate(
+                (fine, fine[:, -1:]), axis=-1)
+            counts = np.append(counts, 0)
+
+        coarse[0] = np.minimum(fine[0, 0::2], fine[0, 1::2])
+        coarse[1] = np.maximum(fine[1, 0::2], fine[1, 1::2])
+        coarse[2] = (
+            ((fine[2, 0::2] * counts[0::2]) + (fine[2, 1::2] * counts[1::2]))
+            / (counts[0::2] + counts[1::2]))
+
+        start += Nblocks
+        size *= 2
+
+    return data
+
+
+def _level_lengths(N, block):
+    'Get the number of blocks of each level of the pyramid of `N` points.'
+    lengths = [-(-N // block)]
+
+    while lengths[-1] > 1:
+        lengths.append(-(-lengths[-1] // 2))
+
+    return lengths
@@ -0,0 +1,231 @@
+'''This module implements a local stand-in for the MDSplus tree of the
+DIII-D bi-color interferometer (BCI) system, which serves synthetic
+windows for testing and benchmarking the retrieval of BCI signals
+without access to the MDSplus server.
+
+'''
+
+
+import re
+import time
+import threading
+import numpy as np
+import MDSplus as mds
+import signal
+
+
+# Synthetic window shared by all nodes, indexed by its number of points
+_templates = {}
+_templates_lock = threading.Lock()
+
+# Number of points synthesized at once
+_chunk = 2 ** 16
+
+
+class FakeTree(object):
+    '''A local stand-in for the BCI tree of a given shot.
+
+    Each window (e.g. '\PL1V2_UF_3' or '\DEN2V2_UF_3') holds
+    deterministic, synthetic data: a scaled and offset copy of a common
+    template comprising several sinusoids and low-level noise, where the
+    scale and offset depend on the shot, the window, and the rest of
+    the node name. Optionally, each request is delayed to emulate
+    the latency and bandwidth of a connection to the MDSplus server.
+
+    Use with :py:func:`set_tree_backend <bci.signal.set_tree_backend>`,
+    e.g.
+
+        import functools
+        from bci import signal, faketree
+        signal.set_tree_backend(
+            functools.partial(faketree.FakeTree, latency=10e-3))
+
+    Attributes:
+    -----------
+    shot - int
+        DIII-D shot number.
+
+    Npts_per_window - int
+        The nominal number of points per window.
+
+    Nwindows - int
+        The number of windows of each node. Requesting a later window
+        raises `MDSplus.MdsException`, as for a nonexistent node.
+
+    short - dict
+        The number of points of windows whose records are shorter
+        than nominal, indexed by window number.
+
+    latency - float
+        The delay of each request, prior to the transfer of any data.
+        [latency] = s
+
+    bandwidth - float or None
+        The rate at which data is transferred. If `None`,
+        the transfer is instantaneous.
+        [bandwidth] = bytes / s
+
+    requests - list
+        Each request made to the tree, as a tuple of (node, start, stop),
+        where `start` and `stop` are the first and last requested points
+        (inclusive), or `None` if the full window was requested.
+
+    Methods:
+    --------
+    data - get the synthetic data of a window
+    getNode - get a node, as in `MDSplus.Tree`
+    tdiExecute - evaluate a subscripted window, as in `MDSplus.Tree`
+
+    '''
+    def __init__(self, shot, Npts_per_window=signal._Npts_per_window,
+                 Nwindows=signal._Nwindows, short={}, latency=0.,
+                 bandwidth=None):
+        '''Create an instance of the `FakeTree` class.
+
+        Input parameters:
+        -----------------
+        shot - int
+            DIII-D shot number.
+
+        Npts_per_window - int
+            The nominal number of points per window.
+
+        Nwindows - int
+            The number of windows of each node.
+
+        short - dict
+            The number of points of windows whose records are shorter
+            than nominal, indexed by window number, e.g. {8: 1000}
+            for a shot whose final window has only 1000 points.
+
+        latency - float
+            The delay of each request.
+            [latency] = s
+
+        bandwidth - float or None
+            The rate at which data is transferred. If `None`,
+            the transfer is instantaneous.
+            [bandwidth] = bytes / s
+
+        '''
+        self.shot = shot
+        self.Npts_per_window = Npts_per_window
+        self.Nwindows = Nwindows
+        self.short = dict(short)
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.requests = []
+
+    def data(self, node, start=0, stop=None):
+        '''Get points `start` through `stop` (inclusive) of the synthetic
+        data of window `node` (without delay). If `stop` is `None`,
+        get the points through the end of the window.
+
+        Raises `MDSplus.MdsException` if `node` is not the name
+        of a BCI window or if the window does not exist.
+
+        '''
+        match = re.match(r'^\\?((?:PL|DEN)[12]?[A-Z0-9]+)_UF_(\d+)$', node)
+
+        if match is None:
+            raise mds.MdsException('%s is not a BCI window' % node)
+
+        name, window = match.group(1), int(match.group(2))
+
+        if window >= self.Nwindows:
+            raise mds.MdsException('%s does not exist' % node)
+
+        Npts = self.short.get(window, self.Npts_per_window)
+
+        if stop is None:
+            stop = Npts - 1
+
+        # Scale and offset depend on the shot, window, and node
+        rng = np.random.RandomState(hash((self.shot, name)) % (2 ** 32))
+        scale, offset = rng.uniform(0.5, 2, size=2)
+        offset *= (window + 1)
+
+        x = _template(self.Npts_per_window)[start:min(stop + 1, Npts)]
+        x = (x * scale) + offset
+
+        return x
+
+    def getNode(self, node):
+        'Get `node`, whose full window is obtained via `getData().data()`.'
+        return _Data(self, node, None, None)
+
+    def tdiExecute(self, expression):
+        '''Evaluate TDI `expression`, which must be a subscripted window
+        of the form 'data(<node>)[<start> : <stop>]'.'''
+        match = re.match(
+            r'^data\((.+)\)\[(\d+) : (\d+)\]$', expression.strip())
+
+        if match is None:
+            raise mds.MdsException('Cannot evaluate %s' % expression)
+
+        node = match.group(1)
+        start, stop = int(match.group(2)), int(match.group(3))
+
+        return _Data(self, node, start, stop).getData()
+
+    def _request(self, node, start, stop):
+        'Get (delayed) points `start` through `stop` of window `node`.'
+        self.requests.append((node, start, stop))
+
+        if start is None:
+            x = self.data(node)
+        else:
+            x = self.data(node, start, stop)
+
+        delay = self.latency
+
+        if self.bandwidth is not None:
+            delay += x.nbytes / float(self.bandwidth)
+
+        if delay > 0:
+            time.sleep(delay)
+
+        return x
+
+
+class _Data(object):
+    'A node (or subscripted node) whose data is requested on demand.'
+    def __init__(self, tree, node, start, stop):
+        self._tree = tree
+        self._node = node
+        self._start = start
+        self._stop = stop
+        self._x = None
+
+    def getData(self):
+        return self
+
+    def data(self):
+        if self._x is None:
+            self._x = self._tree._request(self._node, self._start, self._stop)
+
+        return self._x
+
+
+def _template(N):
+    '''Get the synthetic window of `N` points, which comprises sinusoids
+    at 1 kHz, 50 kHz, and 300 kHz (with unity amplitude, 0.1 radian,
+    and 0.01 radian, respectively) and noise of 1 milliradian.'''
+    with _templates_lock:
+        if N not in _templates:
+            x = np.zeros(N)
+            rng = np.random.RandomState(0)
+
+            # Synthesize in chunks to avoid window-length temporaries
+            for start in xrange(0, N, _chunk):
+                t = np.arange(start, min(start + _chunk, N)) / signal._Fs
+                y = x[start:(start + _chunk)]
+
+                y += np.sin(2 * np.pi * 1e3 * t)
+                y += 0.1 * np.sin(2 * np.pi * 50e3 * t)
+                y += 0.01 * np.sin(2 * np.pi * 300e3 * t)
+                y += 1e-3 * rng.randn(len(t))
+
+            _templates[N] = x
+
+        return _templates[N]
@@ -0,0 +1,156 @@
+'''This module implements FFT-based FIR filtering (and decimation)
+of long records via the overlap-save method.
+
+'''
+
+
+import numpy as np
+
+
+def fftfilt(b, x, Nfft=None, out=None):
+    '''Filter `x` with FIR filter `b` via FFT-based overlap-save,
+    returning only the points that are *not* influenced by the
+    boundaries of `x` (i.e. the "valid" convolution).
+
+    The record is processed in blocks of `Nfft` points, each of which
+    produces (`Nfft` - `M` + 1) filtered points, where `M` = `len(b)`.
+    The working memory is thus bounded by `Nfft` (per row of `x`)
+    rather than the length of `x`, and the computational cost scales
+    as log(`Nfft`) per point rather than the `M` per point
+    of direct convolution.
+
+    Parameters:
+    -----------
+    b - array_like, (`M`,) or (`Nch`, `M`)
+        The FIR filter coefficients. If `b` is 2-dimensional,
+        row `i` of `x` is filtered with coefficients `b[i]`
+        (e.g. to fold per-row scale factors into the filter).
+
+    x - array_like, (`N`,) or (`Nch`, `N`)
+        The record(s) to filter. If `x` is 2-dimensional, each row
+        is filtered, with the FFTs of all rows computed together.
+
+    Nfft - int or None
+        The length of the FFTs. Must be at least `M`; a ValueError
+        is raised otherwise. If `None`, use the smallest power of 2
+        that is at least 8 * `M`, which balances the number of
+        blocks against the cost of each FFT.
+
+    out - array_like, (`N` - `M` + 1,) or (`Nch`, `N` - `M` + 1), or None
+        If not `None`, the array into which the filtered points
+        are written. Because each filtered point only depends on
+        the input points at or after its own position, `out` may be
+        the leading portion of `x` itself (i.e. `x[..., :(N - M + 1)]`),
+        in which case the record is filtered in place.
+
+    Returns:
+    --------
+    y - array_like, (`N` - `M` + 1,) or (`Nch`, `N` - `M` + 1)
+        The filtered record(s), where
+
+                y[..., n] = sum_k b[..., k] * x[..., n + M - 1 - k],
+
+        i.e. `y` matches `np.convolve(x, b, mode='valid')`
+        to floating-point precision.
+
+    '''
+    b = np.asarray(b)
+    M = b.shape[-1]
+    N = x.shape[-1]
+    Nout = N - M + 1
+
+    if Nout < 1:
+        raise ValueError('`x` must be at least as long as `b`.')
+
+    if Nfft is None:
+        Nfft = 2 ** int(np.ceil(np.log2(8 * M)))
+    elif Nfft < M:
+        raise ValueError('`Nfft` must be at least `len(b)`.')
+
+    if out is None:
+        shape = np.broadcast(x[..., :1], b[..., :1]).shape[:-1] + (Nout,)
+        out = np.zeros(shape, dtype=np.result_type(x, b))
+
+    # Number of filtered points produced by each block
+    L = Nfft - M + 1
+
+    B = np.fft.rfft(b, Nfft)
+
+    for start in np.arange(0, Nout, L):
+        stop = min(start + L, Nout)
+
+        # The first (M - 1) points of each inverse transform
+        # are corrupted by circular wrap-around and are discarded
+        X = np.fft.rfft(x[..., start:(stop + M - 1)], Nfft)
+        X *= B
+        out[..., start:stop] = np.fft.irfft(X, Nfft)[
+            ..., (M - 1):(M - 1 + stop - start)]
+
+    return out
+
+
+def fftdecimate(b, x, q, Nfft=None):
+    '''Filter `x` with FIR filter `b` and decimate by a factor of `q`,
+    returning only the points that are *not* influenced by
+    the boundaries of `x`.
+
+    Rather than filtering every point of `x` and discarding all but every
+    `q`th point, the filter is decomposed into its `q` polyphase
+    components, each of which is applied to the corresponding
+    `q`-decimated phase of `x` via :py:func:`fftfilt
+    <bci.fftfilt.fftfilt>`. Only the retained points are thus computed,
+    reducing the computational cost by a factor of roughly `q`.
+
+    Parameters:
+    -----------
+    b - array_like, (`L`,)
+        The FIR filter coefficients, where `L` must be an integer
+        multiple of `q` (e.g. by zero-padding the coefficients);
+        a ValueError is raised otherwise.
+
+    x - array_like, (`N`,) or (`Nch`, `N`)
+        The record(s) to filter and decimate.
+
+    q - int
+        The decimation factor.
+
+    Nfft - int or None
+        The length of the FFTs applied to each polyphase component;
+        see :py:func:`fftfilt <bci.fftfilt.fftfilt>`.
+
+    Returns:
+    --------
+    y - array_like, (`Nout`,) or (`Nch`, `Nout`)
+        The filtered and decimated record(s), where
+
+                y[..., n] = sum_k b[k] * x[..., (n * q) + L - 1 - k],
+
+        and `Nout` = ((`N` - `L`) // `q`) + 1 (or zero, if `N` < `L`).
+
+    '''
+    b = np.asarray(b)
+    L = len(b)
+
+    if L % q:
+        raise ValueError('`len(b)` must be an integer multiple of `q`.')
+
+    # Taps per polyphase component
+    J = L // q
+
+    Nout = max(((x.shape[-1] - L) // q) + 1, 0)
+    y = np.zeros(x.shape[:-1] + (Nout,), dtype=np.result_type(x, b))
+
+    if Nout == 0:
+        return y
+
+    # Substituting k = (j * q) + (q - 1 - p) gives
+    #
+    #   y[n] = sum_p sum_j b[(j * q) + q - 1 - p] * x[(n + J - 1 - j) * q + p],
+    #
+    # i.e. the sum over `p` of the valid convolution
+    # of `x[p::q]` with `b[(q - 1 - p)::q]`
+    for p in range(q):
+        y += fftfilt(
+            b[(q - 1 - p)::q], x[..., p::q][..., :(Nout + J - 1)], Nfft=Nfft)
+
+    return y
@@ -0,0 +1,219 @@
+'''This module implements optional instrumentation of the retrieval
+of signals from the DIII-D bi-color interferometer (BCI) system,
+recording the wall time, bytes transferred, and arrays allocated
+by each stage of a load and by each window read.
+
+'''
+
+
+import time
+import threading
+import collections
+
+
+# Instrumentation is disabled by default, in which case loads
+# only check whether their `LoadStats` is `None`
+_enabled = False
+_callback = None
+
+
+def enable(callback=None):
+    '''Enable instrumentation of all subsequent loads.
+
+    While enabled, each retrieval by a :py:class:`Phase
+    <bci.signal.Phase>` or :py:class:`PhaseArray <bci.signal.PhaseArray>`
+    records a :py:class:`LoadStats <bci.loadstats.LoadStats>`
+    in the object's `load_stats` attribute.
+
+    Parameters:
+    -----------
+    callback - callable or None
+        If not `None`, called as `callback(stats)` with the
+        `LoadStats` of each completed load, e.g. to accumulate
+        statistics over a batch run. Because `str(stats)` is
+        a summary of the load, a logger's method can be used
+        directly, e.g. `callback=logging.getLogger('bci').info`.
+
+    '''
+    global _enabled, _callback
+
+    _enabled = True
+    _callback = callback
+
+    return
+
+
+def disable():
+    'Disable instrumentation of subsequent loads.'
+    global _enabled, _callback
+
+    _enabled = False
+    _callback = None
+
+    return
+
+
+class LoadStats(object):
+    '''Statistics of a single load of BCI signals.
+
+    Attributes:
+    -----------
+    shot - int
+        DIII-D shot number.
+
+    time - float
+        The wall time of the load.
+        [time] = s
+
+    stages - dict
+        The statistics of each stage of the load (e.g. 'allocate',
+        'open', 'read', 'combine', 'copy', 'decimate', 'filter', or
+        'scale'), in the order in which the stages were first entered.
+        Each stage's statistics are a dict with keys 'calls' (the number
+        of times the stage was entered), 'time' (the total wall time
+        spent in the stage, summed over concurrent threads, [s]),
+        'bytes' (the number of bytes transferred from the MDSplus
+        server or from the cache), and 'allocated' (the number
+        of bytes allocated for arrays).
+
+    windows - list of dicts
+        The statistics of each window read, in order of completion,
+        with keys 'node' (e.g. '\PL1V2_UF_3'), 'source' ('tree' for
+        a full window from the MDSplus server, 'subwindow' for a portion
+        of a window from the MDSplus server, or 'cache'), 'start' and
+        'stop' (the requested points, inclusive), 'Npts' (the number
+        of points obtained), 'time' (the wall time of the read,
+        excluding the time to open the tree, [s]), and 'bytes'.
+
+    '''
+    def __init__(self, shot):
+        '''Create an instance of the `LoadStats` class.
+
+        Input parameters:
+        -----------------
+        shot - int
+            DIII-D shot number.
+
+        '''
+        self.shot = shot
+        self.time = 0.
+        self.stages = collections.OrderedDict()
+        self.windows = []
+
+        self._start = time.time()
+        self._lock = threading.Lock()
+
+    @property
+    def bytes(self):
+        'The total number of bytes transferred.'
+        return sum(stage['bytes'] for stage in self.stages.values())
+
+    def add(self, stage, dt, nbytes=0, allocated=0):
+        '''Add a call to `stage` lasting `dt` [s] that transferred `nbytes`
+        and allocated arrays of `allocated` bytes.'''
+        with self._lock:
+            if stage not in self.stages:
+                self.stages[stage] = {
+                    'calls': 0, 'time': 0., 'bytes': 0, 'allocated': 0}
+
+            record = self.stages[stage]
+            record['calls'] += 1
+            record['time'] += dt
+            record['bytes'] += nbytes
+            record['allocated'] += allocated
+
+        return
+
+    def read(self, node, source, start, stop, x, dt):
+        '''Add a read of points `start` through `stop` of window `node`
+        from `source`, which obtained the points `x` in `dt` [s].'''
+        nbytes = x.nbytes
+
+        # Windows from the server are transferred into new arrays,
+        # whereas cached windows are memory-mapped
+        if source == 'cache':
+            allocated = 0
+        else:
+            allocated = nbytes
+
+        self.add('read', dt, nbytes=nbytes, allocated=allocated)
+
+        with self._lock:
+            self.windows.append({
+                'node': node, 'source': source, 'start': start,
+                'stop': stop, 'Npts': len(x), 'time': dt, 'bytes': nbytes})
+
+        return
+
+    def __str__(self):
+        lines = ['Load of shot %i: %.3f s, %.1f MB transferred' % (
+            self.shot, self.time, self.bytes / 2. ** 20)]
+
+        lines.append('%10s %6s %10s %12s %14s' % (
+            'stage', 'calls', 'time [s]', 'bytes [MB]', 'allocated [MB]'))
+
+        for name, stage in self.stages.items():
+            lines.append('%10s %6i %10.3f %12.1f %14.1f' % (
+                name, stage['calls'], stage['time'],
+                stage['bytes'] / 2. ** 20, stage['allocated'] / 2. ** 20))
+
+        return '\n'.join(lines)
+
+
+class _Stage(object):
+    'Context manager that adds its duration to a stage of `stats`.'
+    def __init__(self, stats, stage, nbytes, allocated):
+        self._stats = stats
+        self._stage = stage
+        self._nbytes = nbytes
+        self._allocated = allocated
+
+    def __enter__(self):
+        self._tic = time.time()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stats.add(
+            self._stage, time.time() - self._tic,
+            nbytes=self._nbytes, allocated=self._allocated)
+
+
+class _NullStage(object):
+    'Context manager that does nothing, used when `stats` is `None`.'
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_null_stage = _NullStage()
+
+
+def stage(stats, name, nbytes=0, allocated=0):
+    '''Get a context manager that times stage `name` of `stats`,
+    or that does nothing if `stats` is `None`.'''
+    if stats is None:
+        return _null_stage
+
+    return _Stage(stats, name, nbytes, allocated)
+
+
+def start(shot):
+    'Get a new `LoadStats` for a load of `shot`, or `None` if disabled.'
+    if not _enabled:
+        return None
+
+    return LoadStats(shot)
+
+
+def finish(stats):
+    '''Record the wall time of completed load `stats` and pass it
+    to the registered callback, if any. Returns `stats`.'''
+    if stats is not None:
+        stats.time = time.time() - stats._start
+
+        if _callback is not None:
+            _callback(stats)
+
+    return stats
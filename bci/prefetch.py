@@ -0,0 +1,262 @@
+'''This module implements the `bci-prefetch` command, which retrieves
+the windows of the DIII-D bi-color interferometer (BCI) system needed
+for a list of shots into a local :py:class:`WindowCache
+<bci.cache.WindowCache>`, e.g. ahead of an analysis campaign.
+
+Usage:
+
+    $ bci-prefetch ~/.bci_cache 169570-169580 169600 --chords V1 V2 \\
+        --beams CO2 --tlim 0 2 --workers 4
+
+Windows that are already cached are skipped, and each window is
+stored in the cache atomically as soon as it is retrieved, such that
+an interrupted prefetch resumes where it left off when rerun.
+
+'''
+
+
+import argparse
+import threading
+import time
+from multiprocessing.pool import ThreadPool
+import MDSplus as mds
+import signal
+import cache as window_cache
+
+
+def parse_shots(specs):
+    '''Get the list of shots specified by `specs`, a list of strings
+    each holding a single shot (e.g. '169572'), an inclusive range of
+    shots (e.g. '169570-169580'), or a comma-separated combination of
+    these. Duplicate shots are removed, with the order preserved.'''
+    shots = []
+
+    for spec in specs:
+        for item in spec.split(','):
+            item = item.strip()
+
+            if not item:
+                continue
+
+            if '-' in item:
+                first, last = [int(s) for s in item.split('-', 1)]
+
+                if last < first:
+                    raise ValueError('Invalid range of shots: %s' % item)
+
+                shots.extend(range(first, last + 1))
+            else:
+                shots.append(int(item))
+
+    unique = []
+    seen = set()
+
+    for shot in shots:
+        if shot not in seen:
+            unique.append(shot)
+            seen.add(shot)
+
+    return unique
+
+
+def window_nodes(chords, beams, vibration_subtracted, tlim):
+    '''Get the MDSplus nodes of the windows needed to load each of
+    `chords` and `beams` between times `tlim`, as determined by
+    :py:func:`_windows <bci.signal._windows>`.'''
+    windows = list(signal._windows(tlim))
+    nodes = []
+
+    for chord in chords:
+        for beam in beams:
+            vib = signal._check_vibration_subtracted(
+                vibration_subtracted, beam)
+
+            for node in signal._nodes(chord, beam, vib, windows):
+                # Pairs of raw phase are prefetched individually
+                if isinstance(node, tuple):
+                    nodes.extend(node)
+                else:
+                    nodes.append(node)
+
+    unique = []
+
+    for node in nodes:
+        if node not in unique:
+            unique.append(node)
+
+    return unique
+
+
+def prefetch(cache, shots, nodes, workers=4, verbose=True):
+    '''Retrieve windows `nodes` of each of `shots` into `cache`.
+
+    Parameters:
+    -----------
+    cache - :py:class:`WindowCache <bci.cache.WindowCache>`
+        The cache into which the windows are retrieved. Windows
+        that are already cached are skipped.
+
+    shots - list of ints
+        The DIII-D shot numbers.
+
+    nodes - list of strings
+        The MDSplus nodes of the windows to retrieve.
+
+    workers - int
+        The maximum number of windows retrieved concurrently,
+        each by a thread with its own connection(s) to the tree.
+
+    verbose - bool
+        If True, print the outcome of each window and the throughput.
+
+    Returns:
+    --------
+    summary - dict
+        The number of windows that were 'retrieved', 'skipped' (as they
+        were already cached), 'missing' (e.g. windows following a short
+        window), and 'failed', along with the number of bytes retrieved
+        ('bytes') and the duration of the prefetch ('time', [s]).
+
+    '''
+    tasks = []
+    skipped = 0
+
+    for shot in shots:
+        for node in nodes:
+            if cache.has(shot, node):
+                skipped += 1
+            else:
+                tasks.append((shot, node))
+
+    # Each worker thread holds its own connection to the tree
+    local = threading.local()
+
+    def retrieve(task):
+        shot, node = task
+
+        if not hasattr(local, 'connections'):
+            local.connections = {}
+
+        if shot not in local.connections:
+            # Only the most recent shot's tree is kept open
+            local.connections = {shot: signal._TreeConnection(shot)}
+
+        connection = local.connections[shot]
+
+        try:
+            x = connection.tree.getNode(node).getData().data()
+        except mds.MdsException as e:
+            return task, 'missing', 0, str(e)
+        except Exception as e:
+            return task, 'failed', 0, '%s: %s' % (type(e).__name__, e)
+
+        cache.put(shot, node, x)
+
+        return task, 'retrieved', x.nbytes, None
+
+    summary = {
+        'retrieved': 0, 'skipped': skipped, 'missing': 0, 'failed': 0,
+        'bytes': 0, 'time': 0.}
+
+    if verbose:
+        print '%i windows to retrieve (%i already cached)' % (
+            len(tasks), skipped)
+
+    tic = time.time()
+
+    if len(tasks) > 0:
+        pool = ThreadPool(max(min(workers, len(tasks)), 1))
+
+        try:
+            for i, (task, status, nbytes, error) in enumerate(
+                    pool.imap_unordered(retrieve, tasks)):
+                summary[status] += 1
+                summary['bytes'] += nbytes
+
+                if verbose:
+                    elapsed = time.time() - tic
+                    line = '[%i/%i] %i %s: %s' % (
+                        i + 1, len(tasks), task[0], task[1], status)
+
+                    if error is not None:
+                        line += ' (%s)' % error
+                    else:
+                        line += ' (%.1f MB/s)' % (
+                            summary['bytes'] / 2. ** 20 / max(elapsed, 1e-9))
+
+                    print line
+
+            pool.close()
+        except:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+
+    summary['time'] = time.time() - tic
+
+    if verbose:
+        print ('Retrieved %i, skipped %i, missing %i, failed %i windows: '
+               '%.1f MB in %.1f s (%.1f MB/s)') % (
+            summary['retrieved'], summary['skipped'], summary['missing'],
+            summary['failed'], summary['bytes'] / 2. ** 20, summary['time'],
+            summary['bytes'] / 2. ** 20 / max(summary['time'], 1e-9))
+
+    return summary
+
+
+def main(argv=None):
+    'Run the `bci-prefetch` command with arguments `argv`.'
+    parser = argparse.ArgumentParser(
+        prog='bci-prefetch',
+        description='Retrieve BCI windows for a list of shots '
+                    'into a local cache.')
+    parser.add_argument(
+        'cache', help='root directory of the window cache')
+    parser.add_argument(
+        'shots', nargs='+',
+        help='shots and inclusive ranges of shots, e.g. 169570-169580')
+    parser.add_argument(
+        '--chords', nargs='+', default=['V1', 'V2', 'V3', 'R0'],
+        help='interferometer chords (default: all)')
+    parser.add_argument(
+        '--beams', nargs='+', default=['CO2', 'HeNe'],
+        help='probe beams (default: CO2 HeNe)')
+    parser.add_argument(
+        '--tlim', nargs=2, type=float, default=[-0.05, 5.2],
+        help='lower and upper limits in time [s] (default: -0.05 5.2)')
+    parser.add_argument(
+        '--vibration-subtracted', choices=['no', 'yes', 'compute'],
+        default='no',
+        help='type of CO2 phase data (default: no)')
+    parser.add_argument(
+        '--workers', type=int, default=4,
+        help='maximum number of concurrent retrievals (default: 4)')
+    parser.add_argument(
+        '--max-bytes', type=float, default=None,
+        help='maximum size of the cache [bytes] (default: unbounded)')
+
+    args = parser.parse_args(argv)
+
+    vibration_subtracted = {
+        'no': False, 'yes': True, 'compute': 'compute'}[
+        args.vibration_subtracted]
+
+    try:
+        shots = parse_shots(args.shots)
+        chords = [signal._check_chord(chord) for chord in args.chords]
+        beams = [signal._check_beam(beam) for beam in args.beams]
+        nodes = window_nodes(chords, beams, vibration_subtracted, args.tlim)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.max_bytes is None:
+        max_bytes = None
+    else:
+        max_bytes = int(args.max_bytes)
+
+    cache = window_cache.WindowCache(args.cache, max_bytes=max_bytes)
+
+    summary = prefetch(cache, shots, nodes, workers=args.workers)
+
+    return 1 if summary['failed'] else 0
@@ -0,0 +1,354 @@
+'''This module implements a scan of the raw phase retrieved from the
+DIII-D bi-color interferometer (BCI) system for common data-quality
+problems: fringe jumps, flat-lined (e.g. dropped-out) segments,
+and records that are shorter than nominal.
+
+'''
+
+
+import numpy as np
+from multiprocessing.pool import ThreadPool
+import signal
+
+
+# Default minimum magnitude of a fringe jump between successive points
+# of the raw (double-pass) phase, [_jump_threshold] = radian
+_jump_threshold = np.pi
+
+# Default minimum number of points of a flat-lined segment
+_flat_len = 2 ** 10
+
+# Fields of the event table returned by `scan`
+_event_dtype = np.dtype([
+    ('shot', 'i8'),
+    ('chord', 'S2'),
+    ('beam', 'S4'),
+    ('event', 'S5'),
+    ('t', 'f8'),
+    ('duration', 'f8'),
+    ('value', 'f8')])
+
+
+def scan(shot, chords=['V1', 'V2', 'V3', 'R0'], beams=['CO2', 'HeNe'],
+         tlim=None, jump_threshold=_jump_threshold, flat_len=_flat_len,
+         flat_tol=0., subwindow=True, workers=1, cache=None):
+    '''Scan the raw phase of `shot` for data-quality problems.
+
+    Each window is scanned as soon as it is retrieved, and only
+    a single window per channel is held in memory. The scan is
+    based on the differences between successive points, which
+    are computed once per window and then thresholded, such that
+    all events within a window are found via vectorized operations.
+    Events spanning the boundary between windows are found
+    by carrying the last point of each window (and any
+    flat-lined segment in progress) to the next window.
+
+    Three types of events are found:
+
+        - 'jump': a fringe jump (e.g. from a momentary loss of the
+          heterodyne signal), i.e. a change in the raw phase between
+          successive points exceeding `jump_threshold` in magnitude.
+          The `value` of a jump is the change in phase in units of
+          2 pi radians (i.e. fringes), which is close to an integer
+          for genuine fringe jumps.
+
+        - 'flat': a flat-lined segment (e.g. a digitizer dropout), i.e.
+          at least `flat_len` successive points that differ from their
+          predecessor by at most `flat_tol`. The `value` of a flat-lined
+          segment is the phase at its last point.
+
+        - 'short': a record that ends before the end of the scanned
+          interval because one of its windows is shorter than nominal
+          (as reported by "Signal shorter than nominal" when loading
+          the phase). Scanning of the channel ends with the short
+          window. The `value` is the number of missing points.
+
+    Parameters:
+    -----------
+    shot - int
+        DIII-D shot number.
+
+    chords - list of strings
+        The interferometer chords. Valid values are 'V1', 'V2', 'V3',
+        and 'R0'; a ValueError is raised for other values.
+
+    beams - list of strings
+        The probe beams. Valid values are 'CO2' and 'HeNe';
+        a ValueError is raised for other values.
+
+    tlim - array_like, (2,), or None
+        The lower and upper limits in time of the scan.
+        If `None`, scan the full record.
+        [tlim] = s
+
+    jump_threshold - float
+        The minimum magnitude of a fringe jump.
+        [jump_threshold] = radian
+
+    flat_len - int
+        The minimum number of points of a flat-lined segment.
+
+    flat_tol - float
+        The maximum change in phase between successive points
+        of a flat-lined segment. By default, only points that are
+        identical to their predecessor are considered flat-lined.
+        [flat_tol] = radian
+
+    subwindow - bool
+        If True, request only the points within `tlim` from each window.
+
+    workers - int
+        The number of channels scanned concurrently, each by
+        a thread with its own connection to the MDSplus tree.
+
+    cache - :py:class:`WindowCache <bci.cache.WindowCache>` instance or None
+        If not `None`, cached windows are read from `cache`, and
+        uncached windows are stored in `cache` after retrieval.
+
+    Returns:
+    --------
+    events - :py:class:`np.recarray`, (`Nevents`,)
+        The events, sorted by chord, beam, and time, with fields
+        'shot', 'chord', 'beam', 'event' (the type of event, as described
+        above), 't' (the time of the event's first point, [s]),
+        'duration' (the duration of a flat-lined segment or of the
+        missing portion of a short record, or zero for a jump, [s]),
+        and 'value' (as described above).
+
+    '''
+    chords = [signal._check_chord(chord) for chord in chords]
+    beams = [signal._check_beam(beam) for beam in beams]
+
+    if tlim is None:
+        gstart, gstop = 0, signal._Npts_total - 1
+    else:
+        gstart, gstop = signal._global_bounds(tlim)
+
+    bounds = signal._window_bounds(gstart, gstop)
+    windows = [b[0] for b in bounds]
+
+    def scan_channel(channel):
+        chord, beam = channel
+        nodes = signal._nodes(chord, beam, False, windows)
+
+        connection = signal._TreeConnection(shot)
+        scanner = _Scanner(gstart, jump_threshold, flat_len, flat_tol)
+
+        for (window, start, stop, offset), node in zip(bounds, nodes):
+            x = signal._get_window_data(
+                connection, node, start, stop,
+                subwindow=subwindow, cache=cache)
+
+            scanner.update(x)
+
+            if len(x) < (stop - start + 1):
+                scanner.end(gstop)
+                break
+
+        scanner.finish()
+
+        # Events are found in order of completion rather than of time
+        events = sorted(scanner.events, key=lambda event: event[1])
+
+        return [(shot, chord, beam) + event for event in events]
+
+    channels = [(chord, beam) for chord in chords for beam in beams]
+
+    if (workers > 1) and (len(channels) > 1):
+        pool = ThreadPool(min(workers, len(channels)))
+
+        try:
+            results = pool.map(scan_channel, channels)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [scan_channel(channel) for channel in channels]
+
+    events = np.zeros(sum([len(r) for r in results]), dtype=_event_dtype)
+
+    i = 0
+
+    for result in results:
+        for shot_, chord, beam, event, g, Npts, value in result:
+            events[i] = (
+                shot_, chord, beam, event,
+                signal._trigger_time + (g / signal._Fs),
+                Npts / signal._Fs, value)
+            i += 1
+
+    return events.view(np.recarray)
+
+
+def scan_many(shots, **kwargs):
+    '''Scan each of `shots` for data-quality problems, as described in
+    :py:func:`scan <bci.quality.scan>`, to which `kwargs` are passed.
+
+    Returns:
+    --------
+    (events, failures) - tuple, with
+        events - :py:class:`np.recarray`, the events of all shots,
+            in order of `shots`
+        failures - dict, a description of the error encountered
+            when scanning each shot that could not be scanned,
+            indexed by shot
+
+    '''
+    tables = []
+    failures = {}
+
+    for shot in shots:
+        try:
+            tables.append(scan(shot, **kwargs))
+        except Exception as e:
+            failures[shot] = '%s: %s' % (type(e).__name__, e)
+
+    if len(tables) == 0:
+        events = np.zeros(0, dtype=_event_dtype).view(np.recarray)
+    else:
+        events = np.concatenate(tables).view(np.recarray)
+
+    return events, failures
+
+
+class _Scanner(object):
+    '''Scanner of a single channel's record, which is supplied as
+    consecutive blocks of points via `update`.
+
+    The events found are accumulated in `events` as tuples of (`event`,
+    `g`, `Npts`, `value`), where `g` is the global index of the event's
+    first point and `Npts` is its duration in points. Events are
+    accumulated as they are completed, which is not necessarily
+    in order of `g`.
+
+    '''
+    def __init__(self, gstart, jump_threshold, flat_len, flat_tol):
+        self.events = []
+
+        self._g = gstart            # global index of the next point
+        self._last = None           # last point of the previous block
+        self._run_start = None      # first point of an unfinished flat run
+        self._run_value = None
+
+        self._jump_threshold = jump_threshold
+        self._flat_len = flat_len
+        self._flat_tol = flat_tol
+
+    def update(self, x):
+        'Scan the next block of points `x`.'
+        N = len(x)
+
+        if N == 0:
+            return
+
+        # Differences between successive points, where `d[i]` is the
+        # change *into* the point with global index `first + i`
+        if self._last is None:
+            if N == 1:
+                self._last = x[-1]
+                self._g += 1
+                return
+
+            d = np.subtract(x[1:], x[:-1])
+            first = self._g + 1
+            pos = 1     # position in `x` of the point of `d[0]`
+        else:
+            d = np.empty(N, dtype=np.result_type(x, np.float64))
+            d[0] = x[0] - self._last
+            np.subtract(x[1:], x[:-1], out=d[1:])
+            first = self._g
+            pos = 0
+
+        # Fringe jumps
+        ind = np.flatnonzero(np.abs(d) > self._jump_threshold)
+
+        for i, jump in zip(ind, d[ind] / (2 * np.pi)):
+            self.events.append(('jump', first + i, 0, jump))
+
+        # Flat-lined segments, from runs of small differences
+        np.abs(d, out=d)
+        flat = (d <= self._flat_tol).view(np.int8)
+        self._flat(flat, first, x, pos)
+
+        self._last = x[-1]
+        self._g += N
+
+        return
+
+    def _flat(self, flat, first, x, pos):
+        'Find runs of flat-lined points within the current block.'
+        edges = np.flatnonzero(flat[1:] != flat[:-1]) + 1
+
+        starts = edges[flat[edges] == 1]
+        stops = edges[flat[edges] == 0]   # exclusive
+
+        if flat[0]:
+            starts = np.concatenate(([0], starts))
+
+        if flat[-1]:
+            stops = np.concatenate((stops, [len(flat)]))
+
+        # A run in progress at the end of the previous block
+        # either continues into this block or has ended
+        if self._run_start is not None:
+            if len(starts) and (starts[0] == 0):
+                g0 = self._run_start
+                starts, stops, head = starts[1:], stops[1:], stops[0]
+                self._run_start = None
+                self._close(g0, first + head - 1, x[pos + head - 1], head,
+                            len(flat))
+            else:
+                self._emit(self._run_start, first - 1, self._run_value)
+                self._run_start = None
+
+        # A run in progress at the end of this block is carried over
+        if len(stops) and (stops[-1] == len(flat)):
+            self._run_start = first + starts[-1] - 1
+            self._run_value = x[-1]
+            starts, stops = starts[:-1], stops[:-1]
+
+        # Runs of `n` differences span (`n` + 1) points
+        keep = np.flatnonzero((stops - starts + 1) >= self._flat_len)
+
+        for start, stop in zip(starts[keep], stops[keep]):
+            self.events.append((
+                'flat', first + start - 1, stop - start + 1,
+                x[pos + stop - 1]))
+
+        return
+
+    def _close(self, g0, glast, value, head, N):
+        '''Close or carry over the run from `g0` that continues
+        through the first `head` differences of the current block.'''
+        if head == N:
+            # Run continues through the entire block
+            self._run_start = g0
+            self._run_value = value
+        else:
+            self._emit(g0, glast, value)
+
+        return
+
+    def _emit(self, g0, glast, value):
+        'Record the run of points `g0` through `glast`, if long enough.'
+        if (glast - g0 + 1) >= self._flat_len:
+            self.events.append(('flat', g0, glast - g0 + 1, value))
+
+        return
+
+    def end(self, gstop):
+        '''Record that the record ended (with a short window) before
+        global index `gstop`.'''
+        self.finish()
+        self.events.append(('short', self._g, gstop - self._g + 1,
+                            gstop - self._g + 1))
+
+        return
+
+    def finish(self):
+        'Record any flat-lined segment in progress.'
+        if self._run_start is not None:
+            self._emit(self._run_start, self._g - 1, self._run_value)
+            self._run_start = None
+
+        return
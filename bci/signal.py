@@ -4,9 +4,25 @@ the DIII-D bi-color interferometer (BCI) system.
 '''
 
 
+import os
+import copy
+import collections
+import glob
+import json
+import hashlib
+import shutil
+import tempfile
+import threading
+import time
+import multiprocessing
+from multiprocessing.pool import ThreadPool
 import numpy as np
 import MDSplus as mds
 import filters
+import fftfilt
+import timebase
+import envelope
+import loadstats
 
 
 # Nominal trigger time
@@ -22,254 +38,1859 @@ _Nwindows = 9
 _Npts_per_window = 2 ** 21
 _Npts_total = (_Nwindows * _Npts_per_window)
 
+# Probe-beam wavelengths
+# [_lambda_CO2] = [_lambda_HeNe] = m
+_lambda_CO2 = 10.6e-6
+_lambda_HeNe = 0.633e-6
+
+# Parameters of a Kaiser filter, which is designed on first use
+# (see `_check_filter`) rather than when it is specified
+_KaiserSpec = collections.namedtuple(
+    '_KaiserSpec', ['ripple', 'width', 'f_6dB', 'pass_zero', 'Fs'])
+
 # Default highpass filter to be used w/ interferometer data
-_hpf = filters.fir.Kaiser(-120, 5e3, 10e3, pass_zero=False, Fs=_Fs)
+_hpf = _KaiserSpec(-120, 5e3, 10e3, pass_zero=False, Fs=_Fs)
+
+# Maximum number of designed filters retained by `_kaiser`
+_filter_cache_size = 16
+
+# Number of threads shared by all asynchronous retrievals
+_async_workers = 4
+
+# Number of points per block when combining raw CO2 and HeNe phase
+_combine_block_len = 2 ** 16
+
+# Number of points filtered per block of direct convolution
+_filter_block_len = 2 ** 18
+
+# Number of points per chunk of a saved signal
+_save_chunk_len = 2 ** 20
+
+
+class Phase(object):
+    '''An object corresponding to the signal retrieved from the BCI system.
+
+    Attributes:
+    -----------
+    shot - int
+        DIII-D shot number.
+
+    chord - string
+        The interferometer chord.
+
+    beam - string
+        The type of probe beam.
+
+    filt - :py:class:`Kaiser <filters.fir.Kaiser>` instance or None
+        The filter applied to the phase signal. If `None`, the phase
+        signal has not been filtered. Signal and time points
+        contaminated by the filter's boundary effects are *not*
+        returned/accessible from the attributes and methods
+        of the `Phase` class.
+
+    x - array-like, (`N`,)
+        The retrieved, single-pass phase signal. While all of the BCI chords
+        employ a Michelson configuration (and thus make a double pass through
+        the plasma), this class compensates for the double-pass measurement
+        for easier comparison to the MIT PCI system, which employs a
+        Mach-Zehnder (i.e. single-pass) configuration.
+        [x] = radian
+
+    Fs - float
+        The sampling rate, which is reduced from that of the BCI system
+        by a factor of `decimate`.
+        [Fs] = samples / second
+
+    decimate - int
+        The factor by which the signal has been decimated.
+
+    t0 - float
+        The time corresponding to the first retrieved point in the signal;
+        that is, if x(t) corresponds to the continuous signal being sampled,
+        then `Phase.x[0]` = x(t0)
+        [t0] = s
+
+    vibration_subtracted - bool or 'compute'
+        If True and `self.beam` is CO2, the vibrational contributions
+        to the phase data `self.x` have been removed. If 'compute',
+        the vibrational contributions were removed by combining
+        the raw CO2 and HeNe phase with `self.wavelengths`.
+
+    wavelengths - list, (2,)
+        The CO2 and HeNe wavelengths used to remove the vibrational
+        contributions when `self.vibration_subtracted` is 'compute'.
+        [wavelengths] = m
+
+    windows - array_like
+        The BCI windows spanned by the retrieved signal.
+
+    Npts - int
+        The number of points in the signal, `N`. This is known
+        without retrieving the signal.
+
+    Npts_missing - int
+        The number of raw points within the retrieved interval that
+        could not be retrieved because the record is shorter than
+        nominal; these points are set to zero prior to filtering.
+        Zero if the record is complete or has not yet been retrieved.
+
+    load_stats - :py:class:`LoadStats <bci.loadstats.LoadStats>` or None
+        The per-stage and per-window statistics of the most recent
+        retrieval (including any retrieval by `extend`), if
+        instrumentation was enabled via :py:func:`enable
+        <bci.loadstats.enable>`; otherwise, `None`.
+
+    Methods:
+    --------
+    t - returns retrieved signal time-base,
+        :py:class:`TimeBase <bci.timebase.TimeBase>` instance, (`N`,)
+        The time-base is generated on the fly as needed and is not stored
+        as an object property; this helps save memory and processing time,
+        as we do not typically look at the raw signal vs. time.
+        The returned object computes times on demand, supports indexing,
+        slicing, and `searchsorted` without evaluating the full
+        time-base, and is only materialized when converted to an array.
+        [t] = s
+
+    load - retrieve the signal `x`, if it has not already been retrieved
+
+    between - get a `Phase` corresponding to a sub-interval in time,
+        which shares memory with (i.e. does not copy) the parent `Phase`
+
+    extend - extend the signal to a wider interval in time,
+        retrieving and filtering only the newly spanned points
+
+    envelope - get the (min, max, mean) envelope of the signal
+        for fast plotting at any zoom level
+
+    save - save the signal and its parameters in chunks, such that
+        portions of the signal can later be read via :py:func:`load_saved
+        <bci.signal.load_saved>` without reading the full signal
+
+    '''
+    def __init__(self, shot, chord='V2', beam='CO2', filt=_hpf,
+                 tlim=[-0.05, 5.2], vibration_subtracted=False,
+                 subwindow=True, workers=1, cache=None, Nfft=None,
+                 lazy=False, dtype=np.float64,
+                 wavelengths=[_lambda_CO2, _lambda_HeNe], decimate=1):
+        '''Create an instance of the `Phase` class.
+
+        Input parameters:
+        -----------------
+        shot - int
+            DIII-D shot number.
+
+        chord - string
+            The interferometer chord. Valid values are 'V1', 'V2',
+            'V3', and 'R0'; a ValueError is raised for other values.
+
+        beam - string
+            The type of probe beam. Valid values are 'CO2' and 'HeNe';
+            a ValueError is raised for other values.
+
+        filt - :py:class:`Kaiser <filters.fir.Kaiser>` instance,
+                `_KaiserSpec`, or None
+            The filter applied to the phase signal. If `None`,
+            do not filter the phase signal. A `_KaiserSpec` (e.g. the
+            default highpass filter) holds the parameters of a Kaiser
+            filter (`ripple`, `width`, `f_6dB`, `pass_zero`, and `Fs`),
+            which is designed on first use. A ValueError is raised
+            if `filt` is *not* an instance of `filters.fir.Kaiser`,
+            a `_KaiserSpec`, or `None`. If `filt` was designed for
+            (or specifies) a sample rate that differs from that of
+            the BCI system, the parameters (i.e. cutoffs, ripple, etc.)
+            will be used to design a comparable filter for use
+            with the BCI sample rate.
+
+        tlim - array_like, (2,)
+            The lower and upper limits in time for which the signal
+            will be retrieved. The default values correspond to
+            the default digitization limits of the mitpci system.
+
+            The specified `tlim` values will always bracket the retrieved
+            signal. That is, if `tlim[0]` does not correspond to an exact
+            digitization time, then the initial time returned (`Phase.t0`)
+            will be the closest digitization time *greater* than `tlim[0]`.
+            Similarly, if `tlim[1]` does not correspond to an exact
+            digitization time, then the final time (`Phase.t[-1]`) will be
+            the closest digitization time *less* than `tlim[1]`. Further,
+            if `tlim[0]` is less than the initial digitization time,
+            the retrieved signal will begin with the initial digitized point.
+            Similarly, if `tlim[1]` exceeds the final digitization time,
+            the retrieved signal will end with the final digitized point.
+
+            If `tlim` is not `None` and it is *not* a length-two array,
+            a ValueError is raised.
+
+            [tlim] = s
+
+        vibration_subtracted - bool or 'compute'
+            If True *and* `beam` is CO2, use vibration-subtracted phase data.
+            If 'compute' *and* `beam` is CO2, compute the vibration-subtracted
+            phase from the raw CO2 and HeNe phase of `chord` (via
+            :py:func:`_plasma_induced_phase
+            <bci.signal._plasma_induced_phase>` with `wavelengths`)
+            rather than using the precomputed vibration-subtracted data.
+            The two raw windows are combined as each pair is retrieved,
+            directly into the phase record, such that neither raw record
+            is stored in full. A ValueError is raised for other strings.
+
+        subwindow - bool
+            If True, only the points within `tlim` are requested from
+            each window via a subscripted TDI expression, such that
+            short time windows do not require transferring
+            all `_Npts_per_window` points of each window.
+            If the subscripted expression cannot be evaluated,
+            the full window is retrieved and cropped locally.
+            If False, always retrieve full windows.
+
+        workers - int
+            The number of windows to retrieve concurrently. If greater
+            than one, windows are retrieved by a pool of (at most)
+            `workers` threads, each of which opens its own connection
+            to the MDSplus tree; the windows' points are written directly
+            into the appropriate locations of the phase record.
+
+        cache - :py:class:`WindowCache <bci.cache.WindowCache>` or None
+            If not `None`, raw windows are read from the local,
+            on-disk `cache` when available; windows that are not
+            yet cached are retrieved from the MDSplus server in full
+            and stored in `cache`. If all of the needed windows
+            are cached, the MDSplus tree is never opened.
+
+        Nfft - int or None
+            If `None`, apply `filt` via direct convolution
+            (i.e. `filt.applyTo`) in blocks. Otherwise, apply `filt` via
+            FFT-based overlap-save with FFTs of length `Nfft`, which
+            gives the same result to floating-point precision but is
+            much faster for long filters and records and only requires
+            working memory proportional to `Nfft`. `Nfft` must be at
+            least the number of filter taps; a few times the number
+            of taps is typically fastest (e.g. 2 ** 15 for
+            the default filter).
+
+        lazy - bool
+            If True, defer retrieval of the signal until `x` is first
+            accessed (or `load()` is called). Metadata such as `t0`,
+            `Npts`, and `windows` are available immediately, as they
+            are determined without any I/O.
+
+        dtype - numpy floating-point type
+            The type used to store and process the phase signal.
+            The retrieved points are written directly into an array
+            of this type, which is then filtered and scaled in place.
+            `np.float32` halves the memory required relative to
+            the default `np.float64`; while the FFTs of overlap-save
+            filtering are computed in double precision, the raw points
+            are rounded to single precision, such that the absolute
+            error in `x` is roughly 1e-7 times the magnitude of
+            the raw phase (e.g. ~1e-5 rad for a raw phase of ~100 rad).
+            This is negligible for most fluctuation studies.
+
+        wavelengths - list, (2,)
+            The CO2 and HeNe wavelengths used when `vibration_subtracted`
+            is 'compute'; e.g. to correct for the actual wavelengths
+            of the probe beams.
+            [wavelengths] = m
+
+        decimate - int
+            If greater than one, reduce the sample rate by a factor of
+            `decimate`. The raw windows are lowpass filtered to prevent
+            aliasing (with a Kaiser filter whose transition band spans
+            the top 20% of the decimated Nyquist frequency) and
+            decimated as they are retrieved, via a polyphase filter that
+            only computes the retained points. Only `workers` windows
+            of raw points are stored at any given time, such that memory
+            (and subsequent processing, e.g. application of `filt`,
+            which is designed for the decimated sample rate) is reduced
+            by a factor of roughly `decimate`. The retained points
+            correspond to global digitization indices that are integer
+            multiples of `decimate`, independent of `tlim`. A ValueError
+            is raised if `decimate` is not a positive integer.
+
+        '''
+        self.shot = shot
+        self.chord = _check_chord(chord)
+        self.beam = _check_beam(beam)
+
+        self.vibration_subtracted = _check_vibration_subtracted(
+            vibration_subtracted, self.beam)
+        self.wavelengths = list(wavelengths)
+
+        # Sampling rate
+        self.decimate = _check_decimate(decimate)
+        self.Fs = _Fs / self.decimate
+
+        # Filter
+        self.filt = self._getFilter(filt)
+
+        # Metadata of phase signal between `tlim`, which
+        # can be determined without retrieving the signal
+        self.windows, self.t0, self._Npts = self._getMetadata(tlim)
+
+        # Phase signal between `tlim` and its envelope,
+        # which are computed on demand
+        self._x = None
+        self._envelope = None
+        self.load_stats = None
+        self.Npts_missing = 0
+        self._retrieval = {
+            'tlim': tlim,
+            'subwindow': subwindow,
+            'workers': workers,
+            'cache': cache,
+            'Nfft': Nfft,
+            'dtype': dtype
+        }
+
+        if not lazy:
+            self.load()
+
+    @property
+    def x(self):
+        'The single-pass phase signal, retrieved on first access if needed.'
+        self.load()
+        return self._x
+
+    @x.setter
+    def x(self, x):
+        self._x = x
+        self._envelope = None
+
+    @property
+    def Npts(self):
+        'The number of points in `x`.'
+        if self._x is None:
+            return self._Npts
+        else:
+            return len(self._x)
+
+    def _getMetadata(self, tlim):
+        'For window `tlim`, get windows, initial time, and number of points.'
+        gstart, gstop = _global_bounds(tlim)
+        first, N = _decimated_bounds(gstart, gstop, self.decimate)
+
+        windows = np.array([b[0] for b in _window_bounds(gstart, gstop)])
+        t0 = _initial_time(first, self.filt, self.decimate)
+        Npts = _valid_length(self.filt, N)
+
+        return windows, t0, Npts
+
+    def _getWindows(self, first, last):
+        '''Get windows spanned by the raw points needed for the points
+        with global indices `first` through `last` (inclusive).'''
+        head, tail = _boundary_points(self.filt, self.decimate)
+        bounds = _window_bounds(first - head, last + tail)
+
+        return np.array([b[0] for b in bounds])
+
+    def load(self):
+        'Retrieve the phase signal, if it has not already been retrieved.'
+        if self._x is None:
+            stats = loadstats.start(self.shot)
+            self.t0, self._x = self._getSignal(stats=stats, **self._retrieval)
+            self.load_stats = loadstats.finish(stats)
+
+        return
+
+    def _getFilter(self, filt):
+        'Ensure `filt` is of correct type and compatible with BCI data.'
+        return _check_filter(filt, self.Fs)
+
+    def _getSignal(self, tlim, subwindow=True, workers=1, cache=None,
+                   Nfft=None, dtype=np.float64, stats=None):
+        '''For window `tlim`, get initial time and (phase) signal,
+        recording the statistics of the load in `stats` (if not `None`).'''
+        gstart, gstop = _global_bounds(tlim)
+        missing = {}
+
+        t0, sig = _load(
+            self.shot, [self.chord], [self.beam],
+            [self.vibration_subtracted], self.filt, gstart, gstop,
+            subwindow=subwindow, workers=workers, cache=cache, Nfft=Nfft,
+            dtype=dtype, wavelengths=self.wavelengths,
+            decimate=self.decimate, stats=stats, missing=missing)
+
+        self.Npts_missing = missing.get(0, 0)
+
+        return t0, sig[0]
+
+    def t(self):
+        'Get times for points in `self.x`.'
+        return timebase.TimeBase(self.t0, self.Fs, self.Npts)
+
+    def envelope(self, tlim=None, npixels=1000):
+        '''Get the (min, max, mean) envelope of the phase signal between
+        times `tlim`, resolved into at least `npixels` blocks, for fast
+        plotting (e.g. via `fill_between(t, xmin, xmax)`).
+
+        The envelope is obtained from a multi-resolution pyramid of
+        the signal (see :py:class:`Envelope <bci.envelope.Envelope>`),
+        which is computed in a single pass through `x` on first use.
+        If the `Phase` has a `cache`, the pyramid is stored alongside
+        the cached windows, and later instances with identical
+        parameters use the cached pyramid without retrieving `x`
+        (e.g. when `lazy` is True). If fewer points than those of
+        the finest level are needed and `x` has been retrieved,
+        the points of `x` between `tlim` are returned directly.
+
+        Parameters:
+        -----------
+        tlim - array_like, (2,), or None
+            The lower and upper limits in time of the envelope.
+            If `None`, get the envelope of the entire signal.
+            [tlim] = s
+
+        npixels - int
+            The minimum number of blocks between `tlim`,
+            e.g. the width of the plot in pixels.
+
+        Returns:
+        --------
+        (t, xmin, xmax, xmean) - tuple of array_like, each (`Nblocks`,),
+            with the time at the center of each block and the minimum,
+            maximum, and mean of the phase within each block.
+            [t] = s, [xmin] = [xmax] = [xmean] = radian
+
+        '''
+        return self._getEnvelope().get(tlim, npixels, x=self._x)
+
+    def _getEnvelope(self):
+        'Get the envelope pyramid, computing or retrieving it if needed.'
+        if self._envelope is None:
+            cache = self._retrieval['cache']
+            node = 'ENVELOPE_%s%s_%i_%s' % (
+                self.chord, self.beam, envelope._block, self._getKey())
+
+            data = None
+
+            if cache is not None:
+                data = cache.get(self.shot, node)
+
+            if data is None:
+                data = envelope.pyramid(self.x)
+
+                if cache is not None:
+                    cache.put(self.shot, node, data)
+
+            self._envelope = envelope.Envelope(
+                self.t0, self.Fs, self.Npts, data)
+
+        return self._envelope
+
+    def _getKey(self):
+        '''Get a key that uniquely identifies the parameters that determine
+        the signal (e.g. for caching quantities derived from the signal).'''
+        if self.filt is None:
+            b = None
+        else:
+            b = hashlib.md5(np.asarray(self.filt.b).tostring()).hexdigest()
+
+        params = repr((
+            self.vibration_subtracted, list(self.wavelengths), self.decimate,
+            int(np.round((self.t0 - _trigger_time) * _Fs)), self.Npts,
+            np.dtype(self._retrieval['dtype']).name, b))
+
+        return hashlib.md5(params).hexdigest()
+
+    def between(self, t1, t2):
+        '''Get the portion of the phase signal between times `t1` and `t2`.
+
+        The returned :py:class:`Phase <bci.signal.Phase>` shares memory
+        with `self` (i.e. its signal `x` is a view into `self.x`), such
+        that no data are copied or retrieved. As with `tlim` when creating
+        a `Phase`, `t1` and `t2` always bracket the returned signal; that
+        is, the initial time of the returned signal is the closest
+        digitization time greater than or equal to `t1`, and the final
+        time is the closest digitization time less than or equal to `t2`.
+        A ValueError is raised if no points lie between `t1` and `t2`.
+
+        [t1] = [t2] = s
+
+        '''
+        t1, t2 = np.sort([t1, t2])
+
+        t = self.t()
+        start = t.searchsorted(t1, side='left')
+        stop = t.searchsorted(t2, side='right')
+
+        if stop <= start:
+            raise ValueError('No points between `t1` and `t2`.')
+
+        # Global indices of the first and last points of the slice
+        first = int(np.round((t[start] - _trigger_time) * _Fs))
+        last = first + (self.decimate * (stop - 1 - start))
+
+        ph = copy.copy(self)
+        ph.x = self.x[start:stop]
+        ph.t0 = t[start]
+        ph.windows = self._getWindows(first, last)
+
+        # The retrieval parameters are shared with `self`,
+        # so they are replaced rather than modified
+        ph._retrieval = dict(self._retrieval, tlim=[t[start], t[stop - 1]])
+
+        return ph
+
+    def extend(self, tlim):
+        '''Extend the phase signal such that it spans `tlim`.
+
+        Only the raw points that are not already spanned by `self.x`
+        are retrieved (along with the few neighboring points needed
+        to filter them without boundary effects), and only these points
+        are filtered before being spliced onto either end of `self.x`.
+        The extended signal is thus identical (to floating-point precision)
+        to that retrieved by a new `Phase` spanning both the original
+        signal and `tlim`. The signal is never shortened, so nothing
+        is retrieved if `tlim` lies within the times already spanned.
+        If the signal has not yet been retrieved (e.g. `lazy` is True),
+        the times to be retrieved are widened without any I/O.
+
+        Parameters:
+        -----------
+        tlim - array_like, (2,)
+            The lower and upper limits in time to extend the signal to,
+            which bracket the extended signal as described for `tlim`
+            when creating a `Phase`.
+            [tlim] = s
+
+        '''
+        gstart, gstop = _global_bounds(tlim)
+
+        # The retrieval parameters may be shared with other instances
+        # (e.g. as returned by `between`), so they are replaced
+        # rather than modified
+        tlim = np.sort(tlim)
+        tlim_old = self._retrieval['tlim']
+        self._retrieval = dict(
+            self._retrieval,
+            tlim=[min(tlim[0], tlim_old[0]), max(tlim[1], tlim_old[1])])
+
+        if self._x is None:
+            self.windows, self.t0, self._Npts = self._getMetadata(
+                self._retrieval['tlim'])
+
+            return
+
+        # Global indices of the first and last points of the current
+        # and of the extended signal; the extended signal excludes
+        # the points contaminated by the filters' boundary effects
+        # and only includes points that are retained by decimation
+        q = self.decimate
+        head, tail = _boundary_points(self.filt, q)
+
+        first = int(np.round((self.t0 - _trigger_time) * _Fs))
+        last = first + (q * (self.Npts - 1))
+
+        new_first = min(first, q * -(-(gstart + head) // q))
+        new_last = max(last, q * ((gstop - tail) // q))
+
+        if (new_first == first) and (new_last == last):
+            return
+
+        stats = loadstats.start(self.shot)
+
+        self.x = np.concatenate((
+            self._getPoints(new_first, first - 1, stats=stats),
+            self.x,
+            self._getPoints(last + 1, new_last, stats=stats)))
+
+        if stats is not None:
+            self.load_stats = loadstats.finish(stats)
+
+        # The time of `new_first` is obtained as for a new `Phase`,
+        # i.e. from the first raw point of the filtered record,
+        # rather than as `_trigger_time + (new_first / _Fs)`; the two
+        # differ by rounding, and only the former gives a `t0` that
+        # is identical to that of a new `Phase` spanning `tlim`
+        self.t0 = _initial_time(
+            new_first - (q * _boundary_points(self.filt)[0]), self.filt, q)
+        self.windows = self._getWindows(new_first, new_last)
+
+        return
+
+    def save(self, path, chunk_len=_save_chunk_len, compress=False):
+        '''Save the phase signal and its parameters to directory `path`.
+
+        The signal is split into consecutive chunks of `chunk_len`
+        points, each of which is saved as a `.npy` file (or, if
+        `compress` is True, as a compressed `.npz` file), and the
+        parameters needed to recreate the `Phase` (e.g. shot, chord,
+        beam, filter parameters, `t0`, and `Fs`) are saved as a JSON
+        header. Any portion of the signal can then be read via
+        :py:func:`load_saved <bci.signal.load_saved>` while only
+        reading the overlapping chunks. If the signal has not
+        yet been retrieved, it is retrieved first.
+
+        Parameters:
+        -----------
+        path - string
+            The directory to save to, which is created if it does not
+            exist. Any signal previously saved to `path` is replaced.
+
+        chunk_len - int
+            The number of points per chunk.
+
+        compress - bool
+            If True, compress each chunk (losslessly). Compressed
+            chunks are smaller on disk, but must be decompressed
+            in full when read rather than memory-mapped.
+
+        '''
+        chunk_len = int(chunk_len)
+
+        if chunk_len < 1:
+            raise ValueError('`chunk_len` must be a positive integer.')
+
+        x = self.x
+
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+        # The header is removed first and written last, such that
+        # an interrupted save cannot be mistaken for a complete one
+        for fname in ([os.path.join(path, _saved_header)]
+                      + glob.glob(os.path.join(path, 'x_*.np[yz]'))):
+            if os.path.exists(fname):
+                os.remove(fname)
+
+        for i, start in enumerate(range(0, len(x), chunk_len)):
+            fname = os.path.join(path, _saved_chunk(i, compress))
+            chunk = x[start:(start + chunk_len)]
+
+            if compress:
+                np.savez_compressed(fname, x=chunk)
+            else:
+                np.save(fname, chunk)
+
+        if self.filt is None:
+            filt = None
+        else:
+            filt = dict(_KaiserSpec(
+                self.filt.ripple, self.filt.width, self.filt.f_6dB,
+                self.filt.pass_zero, self.filt.Fs)._asdict())
+
+        header = {
+            'shot': self.shot,
+            'chord': self.chord,
+            'beam': self.beam,
+            'vibration_subtracted': self.vibration_subtracted,
+            'wavelengths': list(self.wavelengths),
+            'decimate': self.decimate,
+            'filt': filt,
+            'tlim': list(self._retrieval['tlim']),
+            'Nfft': self._retrieval['Nfft'],
+            'dtype': np.dtype(x.dtype).name,
+            't0': self.t0,
+            'Fs': self.Fs,
+            'Npts': len(x),
+            'chunk_len': chunk_len,
+            'compress': bool(compress)
+        }
+
+        with open(os.path.join(path, _saved_header), 'w') as f:
+            json.dump(header, f, indent=2)
+
+        return
+
+    def _getPoints(self, first, last, stats=None):
+        '''Get the points of the phase signal with global indices `first`
+        through `last` (inclusive); empty if `last` precedes `first`.'''
+        if last < first:
+            return np.zeros(0, dtype=self._x.dtype)
+
+        head, tail = _boundary_points(self.filt, self.decimate)
+
+        retrieval = dict(self._retrieval)
+        del retrieval['tlim']
+
+        missing = {}
+
+        t0, sig = _load(
+            self.shot, [self.chord], [self.beam],
+            [self.vibration_subtracted], self.filt,
+            first - head, last + tail, wavelengths=self.wavelengths,
+            decimate=self.decimate, stats=stats, missing=missing,
+            **retrieval)
+
+        self.Npts_missing += missing.get(0, 0)
+
+        return sig[0]
+
+
+class PhaseArray(object):
+    '''An object corresponding to the signals retrieved from multiple
+    chords and/or beams of the BCI system for a single shot.
+
+    The signals are retrieved through a single connection to the
+    MDSplus tree and are cropped, filtered, and scaled together.
+    Each retrieved signal is referred to as a "channel".
+
+    Attributes:
+    -----------
+    shot - int
+        DIII-D shot number.
+
+    chords - list of strings, (`Nch`,)
+        The interferometer chord of each channel.
+
+    beams - list of strings, (`Nch`,)
+        The type of probe beam of each channel.
+
+    vibration_subtracted - list of bools or 'compute', (`Nch`,)
+        If True (or 'compute'), the vibrational contributions to
+        the corresponding channel's phase data have been removed.
+        Only CO2 channels can be vibration subtracted.
+
+    wavelengths - list, (2,)
+        The CO2 and HeNe wavelengths used for channels
+        whose `vibration_subtracted` is 'compute'.
+        [wavelengths] = m
+
+    filt - :py:class:`Kaiser <filters.fir.Kaiser>` instance or None
+        The filter applied to each channel's phase signal.
+        See :py:class:`Phase <bci.signal.Phase>` for details.
+
+    x - array-like, (`Nch`, `N`)
+        The retrieved, single-pass phase signals, where `x[i]`
+        is the phase signal of the `i`th channel.
+        [x] = radian
+
+    Fs - float
+        The sampling rate, which is reduced from that of the BCI system
+        by a factor of `decimate`.
+        [Fs] = samples / second
+
+    decimate - int
+        The factor by which the signals have been decimated.
+
+    t0 - float
+        The time corresponding to the first retrieved point
+        in each channel's signal.
+        [t0] = s
+
+    Npts_missing - list of ints, (`Nch`,)
+        The number of raw points of each channel that could not be
+        retrieved because its record is shorter than nominal, as
+        described in :py:class:`Phase <bci.signal.Phase>`.
+
+    Methods:
+    --------
+    t - returns retrieved signal time-base,
+        :py:class:`TimeBase <bci.timebase.TimeBase>` instance, (`N`,)
+        [t] = s
+
+    '''
+    def __init__(self, shot, chords=['V1', 'V2', 'V3', 'R0'],
+                 beams=['CO2', 'HeNe'], filt=_hpf,
+                 tlim=[-0.05, 5.2], vibration_subtracted=False,
+                 subwindow=True, workers=1, cache=None, Nfft=None,
+                 dtype=np.float64, wavelengths=[_lambda_CO2, _lambda_HeNe],
+                 decimate=1):
+        '''Create an instance of the `PhaseArray` class.
+
+        Input parameters:
+        -----------------
+        shot - int
+            DIII-D shot number.
+
+        chords - list of strings
+            The interferometer chords. Valid values are 'V1', 'V2',
+            'V3', and 'R0'; a ValueError is raised for other values.
+
+        beams - list of strings
+            The types of probe beam. Valid values are 'CO2' and 'HeNe';
+            a ValueError is raised for other values. A channel is
+            retrieved for each beam of each chord, in that order;
+            e.g. `chords = ['V1', 'V2']` and `beams = ['CO2', 'HeNe']`
+            correspond to channels V1 CO2, V1 HeNe, V2 CO2, and V2 HeNe.
+
+        vibration_subtracted - bool or 'compute'
+            If True (or 'compute'), use vibration-subtracted phase data
+            for all CO2 channels, as described in :py:class:`Phase
+            <bci.signal.Phase>`.
+
+        The remaining parameters (`filt`, `tlim`, `subwindow`, `workers`,
+        `cache`, `Nfft`, `dtype`, `wavelengths`, and `decimate`) are as
+        described in :py:class:`Phase <bci.signal.Phase>`; `workers` bounds
+        the number of windows retrieved concurrently across *all* channels.
+
+        '''
+        self.shot = shot
+
+        chords = [_check_chord(chord) for chord in chords]
+        beams = [_check_beam(beam) for beam in beams]
+
+        self.chords = [chord for chord in chords for beam in beams]
+        self.beams = [beam for chord in chords for beam in beams]
+        self.vibration_subtracted = [
+            _check_vibration_subtracted(vibration_subtracted, beam)
+            for beam in self.beams]
+        self.wavelengths = list(wavelengths)
+
+        # Sampling rate
+        self.decimate = _check_decimate(decimate)
+        self.Fs = _Fs / self.decimate
+
+        # Filter
+        self.filt = _check_filter(filt, self.Fs)
+
+        # Phase signals between `tlim`
+        gstart, gstop = _global_bounds(tlim)
+        stats = loadstats.start(self.shot)
+        missing = {}
+
+        self.t0, self.x = _load(
+            self.shot, self.chords, self.beams, self.vibration_subtracted,
+            self.filt, gstart, gstop,
+            subwindow=subwindow, workers=workers, cache=cache, Nfft=Nfft,
+            dtype=dtype, wavelengths=self.wavelengths,
+            decimate=self.decimate, stats=stats, missing=missing)
+
+        self.Npts_missing = [missing.get(i, 0) for i in range(len(self.x))]
+        self.load_stats = loadstats.finish(stats)
+
+    def t(self):
+        'Get times for points in `self.x`.'
+        return timebase.TimeBase(self.t0, self.Fs, self.x.shape[-1])
+
+
+def load_shot(shot, chords=['V1', 'V2', 'V3', 'R0'], beams=['CO2', 'HeNe'],
+              filt=_hpf, tlim=[-0.05, 5.2], vibration_subtracted=False,
+              subwindow=True, workers=1, cache=None, Nfft=None,
+              dtype=np.float64, wavelengths=[_lambda_CO2, _lambda_HeNe],
+              decimate=1):
+    '''Load the phase of each chord and beam of the BCI system for `shot`.
+
+    Rather than opening the MDSplus tree and processing the data once
+    per chord and beam, as when creating separate :py:class:`Phase
+    <bci.signal.Phase>` instances, the tree is opened once and
+    the data from all channels are cropped, filtered, and scaled
+    together. See :py:class:`PhaseArray <bci.signal.PhaseArray>`
+    for a description of the parameters.
+
+    Returns:
+    --------
+    phases - :py:class:`PhaseArray <bci.signal.PhaseArray>` instance
+        The retrieved phase signals, stacked as (channel x time).
+
+    '''
+    return PhaseArray(
+        shot, chords=chords, beams=beams, filt=filt, tlim=tlim,
+        vibration_subtracted=vibration_subtracted,
+        subwindow=subwindow, workers=workers, cache=cache, Nfft=Nfft,
+        dtype=dtype, wavelengths=wavelengths, decimate=decimate)
+
+
+def load_saved(path, tlim=None):
+    '''Load a phase signal saved via :py:meth:`Phase.save
+    <bci.signal.Phase.save>`, reading only the portion between `tlim`.
+
+    Parameters:
+    -----------
+    path - string
+        The directory to which the signal was saved.
+
+    tlim - array_like, (2,), or None
+        The lower and upper limits in time of the signal to load,
+        which bracket the loaded signal as described for
+        :py:meth:`Phase.between <bci.signal.Phase.between>`.
+        Only the saved chunks that overlap `tlim` are read, and
+        uncompressed chunks are memory-mapped, such that only
+        the points between `tlim` are read from disk. If `None`,
+        load the full signal. A ValueError is raised if no
+        points lie between `tlim`.
+        [tlim] = s
+
+    Returns:
+    --------
+    ph - :py:class:`Phase <bci.signal.Phase>`
+        The saved signal, with the parameters (e.g. `shot`, `chord`,
+        `filt`) of the `Phase` that was saved. Nothing is retrieved
+        from the MDSplus server.
+
+    '''
+    with open(os.path.join(path, _saved_header)) as f:
+        header = json.load(f)
+
+    if header['filt'] is None:
+        filt = None
+    else:
+        filt = _KaiserSpec(**header['filt'])
+
+    # JSON strings are loaded as unicode
+    vibration_subtracted = header['vibration_subtracted']
+
+    if isinstance(vibration_subtracted, basestring):
+        vibration_subtracted = str(vibration_subtracted)
+
+    ph = Phase(
+        header['shot'], chord=str(header['chord']), beam=str(header['beam']),
+        filt=filt, tlim=header['tlim'],
+        vibration_subtracted=vibration_subtracted,
+        Nfft=header['Nfft'], lazy=True, dtype=np.dtype(header['dtype']),
+        wavelengths=header['wavelengths'], decimate=header['decimate'])
+
+    t = timebase.TimeBase(header['t0'], header['Fs'], header['Npts'])
+
+    if tlim is None:
+        start, stop = 0, header['Npts']
+    else:
+        t1, t2 = np.sort(tlim)
+        start = t.searchsorted(t1, side='left')
+        stop = t.searchsorted(t2, side='right')
+
+        if stop <= start:
+            raise ValueError('No points between `tlim`.')
+
+    L = header['chunk_len']
+    x = np.zeros(stop - start, dtype=header['dtype'])
+
+    for i in range(start // L, ((stop - 1) // L) + 1):
+        fname = os.path.join(path, _saved_chunk(i, header['compress']))
+
+        if header['compress']:
+            with np.load(fname) as npz:
+                chunk = npz['x']
+        else:
+            chunk = np.load(fname, mmap_mode='r')
+
+        # Overlap of chunk with requested points
+        cstart = max(start, i * L)
+        cstop = min(stop, (i + 1) * L)
+        x[(cstart - start):(cstop - start)] = chunk[
+            (cstart - (i * L)):(cstop - (i * L))]
+
+    first = int(np.round((t[start] - _trigger_time) * _Fs))
+
+    ph.x = x
+    ph.t0 = t[start]
+    ph.windows = ph._getWindows(
+        first, first + (ph.decimate * (stop - 1 - start)))
+
+    return ph
+
+
+# Name of the header of a saved signal
+_saved_header = 'header.json'
+
+
+def _saved_chunk(i, compress):
+    'Get the file name of the `i`th chunk of a saved signal.'
+    return 'x_%06i.%s' % (i, 'npz' if compress else 'npy')
+
+
+def load_many(shots, chord='V2', beam='CO2', filt=_hpf, tlim=[-0.05, 5.2],
+              vibration_subtracted=False, workers=1, directory=None,
+              subwindow=True, cache=None, Nfft=None, dtype=np.float64,
+              wavelengths=[_lambda_CO2, _lambda_HeNe], decimate=1):
+    '''Load the phase of a single BCI chord and beam for each of `shots`.
+
+    The shots are loaded by a pool of `workers` processes, such that
+    the retrieval and filtering of different shots proceed in parallel.
+    Rather than pickling each phase signal back to the calling process,
+    each worker saves its signal to a `.npy` file in `directory`,
+    which is then memory-mapped by the calling process.
+    A shot that cannot be loaded (e.g. because its tree does not exist)
+    is reported in `failures` rather than aborting the remaining shots.
+    As when creating a :py:class:`Phase <bci.signal.Phase>`, a record
+    that is shorter than nominal is padded with zeros; such a shot
+    is returned *and* reported in `failures`, along with the number
+    of missing raw points (see `Phase.Npts_missing`).
+
+    Parameters:
+    -----------
+    shots - list of ints
+        DIII-D shot numbers.
+
+    workers - int
+        The number of processes used to load the shots. If 1,
+        the shots are loaded sequentially by the calling process
+        (and no files are written).
+
+    directory - string or None
+        The directory in which the workers' phase signals are saved.
+        If `None`, a temporary directory is used, which is removed
+        once the signals are memory-mapped (the mapped signals remain
+        valid until the returned instances are deleted).
+
+    The remaining parameters are as described in :py:class:`Phase
+    <bci.signal.Phase>`. Each process retrieves
+    the windows of its shot sequentially.
+
+    Returns:
+    --------
+    (phases, failures) - tuple, with
+        phases - list of :py:class:`Phase <bci.signal.Phase>` instances,
+            (`len(shots)`,), where `phases[i]` corresponds to `shots[i]`
+            and is `None` if `shots[i]` could not be loaded. The signal `x`
+            of a memory-mapped instance is copy-on-write, such that
+            modifying it does not modify the underlying file.
+        failures - dict, mapping each shot that could not be loaded
+            to a description of the corresponding error, and each shot
+            whose record is shorter than nominal to a description
+            of the number of missing points
+
+    '''
+    kwargs = {
+        'chord': chord,
+        'beam': beam,
+        'filt': filt,
+        'tlim': tlim,
+        'vibration_subtracted': vibration_subtracted,
+        'subwindow': subwindow,
+        'cache': cache,
+        'Nfft': Nfft,
+        'dtype': dtype,
+        'wavelengths': wavelengths,
+        'decimate': decimate
+    }
+
+    phases = []
+    failures = {}
+
+    if workers <= 1:
+        for shot in shots:
+            try:
+                phases.append(Phase(shot, **kwargs))
+            except Exception as e:
+                phases.append(None)
+                failures[shot] = '%s: %s' % (type(e).__name__, e)
+                continue
+
+            if phases[-1].Npts_missing:
+                failures[shot] = _short_record(phases[-1].Npts_missing)
+
+        return phases, failures
+
+    if directory is None:
+        tmpdir = tempfile.mkdtemp(prefix='bci_')
+    else:
+        tmpdir = None
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    tasks = [
+        (shot, kwargs, os.path.join(
+            (directory or tmpdir), '%i_%i.npy' % (i, shot)))
+        for i, shot in enumerate(shots)]
+
+    pool = multiprocessing.Pool(workers)
+
+    try:
+        # `imap` yields results in the order of `tasks`,
+        # independent of the order in which the shots finish
+        for (shot, kw, fname), (t0, Npts_missing, error) in zip(
+                tasks, pool.imap(_load_to_file, tasks)):
+            if error is not None:
+                phases.append(None)
+                failures[shot] = error
+                continue
+
+            ph = Phase(shot, lazy=True, **kwargs)
+            ph.t0 = t0
+            ph.x = np.load(fname, mmap_mode='c')
+            ph.Npts_missing = Npts_missing
+            phases.append(ph)
+
+            if Npts_missing:
+                failures[shot] = _short_record(Npts_missing)
+
+        pool.close()
+    except:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+        if tmpdir is not None:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    return phases, failures
+
+
+def _load_to_file(task):
+    '''Load the phase of `shot` and save its signal to file `fname`,
+    where `task` = (`shot`, `kwargs`, `fname`) and `kwargs` are passed
+    to :py:class:`Phase <bci.signal.Phase>`.
+
+    Returns:
+    --------
+    (t0, Npts_missing, error) - tuple, with
+        t0 - float, the time of the first point in the saved signal
+        Npts_missing - int, the number of raw points that could not
+            be retrieved because the record is shorter than nominal
+        error - string, a description of the error encountered
+            when loading `shot`, or `None` if `shot` was loaded
+
+    '''
+    shot, kwargs, fname = task
+
+    try:
+        ph = Phase(shot, **kwargs)
+        np.save(fname, ph.x)
+    except Exception as e:
+        return None, None, '%s: %s' % (type(e).__name__, e)
+
+    return ph.t0, ph.Npts_missing, None
+
+
+def _short_record(Npts_missing):
+    'Describe a record that is missing `Npts_missing` raw points.'
+    return ('ShortRecord: %i raw points missing (padded with zeros)'
+            % Npts_missing)
+
+
+def load_async(shot, callback=None, error_callback=None, **kwargs):
+    '''Asynchronously load the phase of a BCI chord and beam for `shot`.
+
+    The :py:class:`Phase <bci.signal.Phase>` is created by a pool of
+    `_async_workers` threads that is shared by all asynchronous
+    retrievals, such that many concurrent requests (e.g. from a server)
+    do not each spawn a thread; requests beyond the size of the pool
+    are queued. The tree reads and filtering largely release the GIL
+    and thus proceed in parallel with the calling thread. The windows
+    of each shot can also be retrieved concurrently via `workers`.
+
+    To await the result from an event loop (e.g. asyncio in Python 3),
+    pass callbacks that hand the result back to the loop's thread, e.g.
+
+        future = loop.create_future()
+        load_async(
+            shot,
+            callback=lambda ph: loop.call_soon_threadsafe(
+                future.set_result, ph),
+            error_callback=lambda e: loop.call_soon_threadsafe(
+                future.set_exception, e),
+            tlim=[2.0, 2.5], workers=4)
+        ph = await future
+
+    Parameters:
+    -----------
+    shot - int
+        DIII-D shot number.
+
+    callback - callable or None
+        If not `None`, called with the created `Phase`
+        (from a thread of the pool) once it is loaded.
+
+    error_callback - callable or None
+        If not `None`, called with the raised exception
+        (from a thread of the pool) if loading fails.
+
+    kwargs - keyword arguments
+        Passed to :py:class:`Phase <bci.signal.Phase>`.
+
+    Returns:
+    --------
+    result - :py:class:`AsyncResult <multiprocessing.pool.AsyncResult>`
+        The pending result; `result.get()` blocks until the `Phase`
+        is loaded and returns it (or raises the exception
+        encountered while loading).
+
+    '''
+    return _get_async_pool().apply_async(
+        _call_with_callbacks,
+        (Phase, (shot,), kwargs, callback, error_callback))
+
+
+# Pool shared by asynchronous retrievals, created on first use
+_async_pool = None
+_async_pool_lock = threading.Lock()
+
+
+def _get_async_pool():
+    'Get the pool of threads shared by all asynchronous retrievals.'
+    global _async_pool
+
+    with _async_pool_lock:
+        if _async_pool is None:
+            _async_pool = ThreadPool(_async_workers)
+
+    return _async_pool
+
+
+def _call_with_callbacks(func, args, kwargs, callback, error_callback):
+    '''Call `func(*args, **kwargs)`, passing the returned value
+    to `callback` or the raised exception to `error_callback`.'''
+    try:
+        result = func(*args, **kwargs)
+    except Exception as e:
+        if error_callback is not None:
+            error_callback(e)
+
+        raise
+
+    if callback is not None:
+        callback(result)
+
+    return result
+
+
+def iter_blocks(shot, chord='V2', beam='CO2', filt=_hpf, tlim=[-0.05, 5.2],
+                vibration_subtracted=False, block_len=(2 ** 16), overlap=0,
+                subwindow=True, cache=None, Nfft=None,
+                wavelengths=[_lambda_CO2, _lambda_HeNe]):
+    '''Iterate over the phase of a BCI chord and beam in fixed-length blocks.
+
+    Rather than retrieving and processing the entire record between
+    `tlim` at once (as is done by :py:class:`Phase <bci.signal.Phase>`),
+    the windows are retrieved lazily, one at a time, and filtered with
+    state carried over from the preceding window. The yielded blocks
+    are thus identical (to floating-point precision) to the corresponding
+    portions of the record retrieved by :py:class:`Phase
+    <bci.signal.Phase>`, without any edge effects at block or window
+    boundaries, while peak memory is bounded by the size of a single
+    window and `block_len`, independent of `tlim`.
+
+    Parameters:
+    -----------
+    block_len - int
+        The number of points in each block.
+
+    overlap - int
+        The number of points shared by successive blocks. Must satisfy
+        0 <= `overlap` < `block_len`; a ValueError is raised otherwise.
+
+    Nfft - int or None
+        The length of the FFTs used to apply `filt` via overlap-save;
+        see :py:func:`fftfilt <bci.fftfilt.fftfilt>`. If `None`,
+        the length is chosen automatically. (Direct convolution
+        via `filt.applyTo` cannot carry state across blocks
+        and is thus not used here).
+
+    The remaining parameters (`shot`, `chord`, `beam`, `filt`, `tlim`,
+    `vibration_subtracted`, `subwindow`, `cache`, and `wavelengths`)
+    are as described in :py:class:`Phase <bci.signal.Phase>`.
+
+    Yields:
+    -------
+    (t0, x) - tuple, with
+        t0 - float, the time corresponding to the first point in `x`,
+            [t0] = s
+        x - array_like, (`block_len`,), the single-pass phase, [x] = radian
+
+    The final block may be shorter than `block_len`. If a window's record
+    is shorter than nominal, iteration ends with that window's points.
+
+    '''
+    chord = _check_chord(chord)
+    beam = _check_beam(beam)
+    vibration_subtracted = _check_vibration_subtracted(
+        vibration_subtracted, beam)
+    filt = _check_filter(filt, _Fs)
+
+    if (overlap < 0) or (overlap >= block_len):
+        raise ValueError('`overlap` must satisfy 0 <= `overlap` < `block_len`')
+
+    gstart, gstop = _global_bounds(tlim)
+    bounds = _window_bounds(gstart, gstop)
+    nodes = _nodes(chord, beam, vibration_subtracted, [b[0] for b in bounds])
+
+    t0 = _initial_time(gstart, filt)
+
+    factor = _scale_factor(beam, vibration_subtracted)
+
+    if filt is not None:
+        # Conversion to single-pass phase is folded into the filter
+        b = factor * filt.b
+        start, stop = _valid_convolution_slice(filt, gstop - gstart + 1)
+    else:
+        b = None
+        start, stop = 0, None
+
+    connection = _TreeConnection(shot)
+
+    def chunks():
+        for (window, wstart, wstop, offset), node in zip(bounds, nodes):
+            x = np.zeros(wstop - wstart + 1)
+            x = x[:_read_window(
+                connection, node, wstart, wstop, x,
+                subwindow=subwindow, cache=cache, wavelengths=wavelengths)]
+
+            if filt is None:
+                yield factor * x
+            else:
+                yield x
+
+            if len(x) < (wstop - wstart + 1):
+                print 'Signal shorter than nominal -- ending retrieval'
+                return
+
+    for offset, x in _iter_filtered_blocks(
+            chunks(), b, block_len, overlap=overlap,
+            start=start, stop=stop, Nfft=Nfft):
+        yield t0 + (offset / _Fs), x
+
+
+def _iter_filtered_blocks(chunks, b, block_len, overlap=0, start=0,
+                          stop=None, Nfft=None):
+    '''Filter a record supplied as consecutive `chunks` with FIR filter
+    `b` and yield the filtered record in blocks of `block_len` points.
+
+    Parameters:
+    -----------
+    chunks - iterable of array_like
+        Consecutive portions of the record to be filtered.
+
+    b - array_like, (`M`,), or None
+        The FIR filter coefficients. The last (`M` - 1) points of each
+        chunk are carried over to the next chunk, such that the filtered
+        record is the valid convolution of the full record with `b`,
+        regardless of how the record is split into chunks.
+        If `None`, the record is not filtered.
+
+    block_len, overlap - int
+        The number of points in each block and the number of points
+        shared by successive blocks, respectively.
+
+    start, stop - int and int or None
+        Only the points `start` through `stop` (exclusive) of the filtered
+        record are yielded. If `stop` is `None`, all points from `start`
+        onward are yielded.
+
+    Nfft - int or None
+        The length of the FFTs used for overlap-save filtering; see
+        :py:func:`fftfilt <bci.fftfilt.fftfilt>`.
+
+    Yields:
+    -------
+    (offset, x) - tuple, with
+        offset - int, the index of `x[0]` relative to the point `start`
+        x - array_like, (`block_len`,), the filtered block; the final
+            block may be shorter than `block_len`
+
+    '''
+    hop = block_len - overlap
+
+    history = np.zeros(0)   # trailing input points carried between chunks
+    pending = np.zeros(0)   # filtered points that have not been yielded
+    produced = 0            # filtered points produced from all chunks
+    offset = 0              # index of `pending[0]` relative to `start`
+    yielded = False
+
+    for x in chunks:
+        if b is None:
+            y = x
+        else:
+            x = np.concatenate((history, x))
+
+            if len(x) < len(b):
+                history = x
+                continue
+
+            y = fftfilt.fftfilt(b, x, Nfft=Nfft)
+            history = x[(len(x) - len(b) + 1):].copy()
+
+        # Only retain points between `start` and `stop`
+        lo = max(start - produced, 0)
+
+        if stop is None:
+            hi = len(y)
+        else:
+            hi = max(min(stop - produced, len(y)), lo)
+
+        produced += len(y)
+        pending = np.concatenate((pending, y[lo:hi]))
+
+        while len(pending) >= block_len:
+            yield offset, pending[:block_len].copy()
+            yielded = True
+
+            pending = pending[hop:]
+            offset += hop
+
+    # Yield any remaining points that have not yet been yielded
+    if len(pending) > (overlap if yielded else 0):
+        yield offset, pending.copy()
+
+
+def _check_chord(chord):
+    'Ensure `chord` is a valid interferometer chord.'
+    if str.upper(chord) in set(['V1', 'V2', 'V3', 'R0']):
+        return str.upper(chord)
+    else:
+        raise ValueError('`chord` may be V1, V2, V3, or R0.')
+
+
+def _check_beam(beam):
+    'Ensure `beam` is a valid type of probe beam.'
+    if str.upper(beam) == 'CO2':
+        return 'CO2'
+    elif str.upper(beam) == 'HENE':
+        return 'HeNe'
+    else:
+        raise ValueError('`beam` may be CO2 or HeNe.')
+
+
+def _check_vibration_subtracted(vibration_subtracted, beam):
+    '''Ensure `vibration_subtracted` is a valid type of phase data
+    for (validated) `beam`, returning True, False, or 'compute'.'''
+    if isinstance(vibration_subtracted, basestring):
+        if vibration_subtracted != 'compute':
+            raise ValueError(
+                "`vibration_subtracted` may be True, False, or 'compute'.")
+    else:
+        vibration_subtracted = bool(vibration_subtracted)
+
+    # Only CO2 data can be vibration subtracted
+    if beam != 'CO2':
+        return False
+
+    return vibration_subtracted
+
+
+def _check_decimate(decimate):
+    'Ensure `decimate` is a positive integer.'
+    if (int(decimate) != decimate) or (decimate < 1):
+        raise ValueError('`decimate` must be a positive integer.')
+
+    return int(decimate)
+
+
+def _check_filter(filt, Fs):
+    '''Ensure `filt` is of correct type and compatible with sample rate `Fs`.
+
+    A :py:class:`Kaiser <filters.fir.Kaiser>` designed for sample rate
+    `Fs` is returned as is. Otherwise, the parameters of `filt`
+    (a `Kaiser` designed for another sample rate or a `_KaiserSpec`)
+    are used to obtain a comparable filter for sample rate `Fs`
+    from :py:func:`_kaiser <bci.signal._kaiser>`, such that each
+    filter is only designed once.
+
+    '''
+    if isinstance(filt, filters.fir.Kaiser):
+        if filt.Fs != Fs:
+            # Design similar filter for use at BCI sample rate
+            filt = _kaiser(
+                filt.ripple, filt.width, filt.f_6dB, filt.pass_zero, Fs)
+    elif isinstance(filt, _KaiserSpec):
+        filt = _kaiser(
+            filt.ripple, filt.width, filt.f_6dB, filt.pass_zero, Fs)
+    elif filt is not None:
+        raise ValueError(
+            '`filt` must be `filters.fir.Kaiser`, `_KaiserSpec`, or `None`')
+
+    return filt
+
+
+def _kaiser(ripple, width, f_6dB, pass_zero, Fs):
+    '''Get the :py:class:`Kaiser <filters.fir.Kaiser>` filter with the
+    given parameters, designing it only if it is not among the
+    `_filter_cache_size` most recently used filters.'''
+    key = _KaiserSpec(ripple, width, f_6dB, pass_zero, Fs)
+
+    with _filter_cache_lock:
+        filt = _filter_cache.pop(key, None)
+
+        if filt is None:
+            filt = filters.fir.Kaiser(
+                ripple, width, f_6dB, pass_zero=pass_zero, Fs=Fs)
+
+        # Most recently used filters are last
+        _filter_cache[key] = filt
+
+        while len(_filter_cache) > _filter_cache_size:
+            _filter_cache.popitem(last=False)
+
+    return filt
+
+
+# Designed filters, keyed by `_KaiserSpec`
+_filter_cache = collections.OrderedDict()
+_filter_cache_lock = threading.Lock()
+
+
+def _nodes(chord, beam, vibration_subtracted, windows):
+    'Get MDSplus node of each of `windows` for `chord` and `beam`.'
+    # The MDSplus node for each beam type is specified
+    # by a number rather than a string
+    if beam == 'CO2':
+        beam_number = 1
+    elif beam == 'HeNe':
+        beam_number = 2
+    else:
+        raise ValueError('%s is not a valid beam type' % beam)
+
+    # Determine whether to retrieve raw or vibration-subtracted phase
+    if (vibration_subtracted == 'compute') and (beam == 'CO2'):
+        # Pairs of raw CO2 and HeNe phase, [phase] = radians
+        return [('\PL1%s_UF_%i' % (chord, window),
+                 '\PL2%s_UF_%i' % (chord, window))
+                for window in windows]
+    elif vibration_subtracted and (beam == 'CO2'):
+        # [line-integrated density] = m / cm^3
+        return ['\DEN%s_UF_%i' % (chord, window) for window in windows]
+    else:
+        # [phase] = radians
+        return ['\PL%i%s_UF_%i' % (beam_number, chord, window)
+                for window in windows]
+
+
+def _scale_factor(beam, vibration_subtracted):
+    'Get factor converting retrieved data to single-pass phase.'
+    # Convert from double-pass to single-pass measurement
+    factor = 0.5
+
+    # Convert vibration-subtracted, line-integrated density
+    # to corresponding phase, if needed. Vibration-subtracted
+    # phase computed from the raw phases needs no conversion.
+    if (vibration_subtracted is True) and (beam == 'CO2'):
+        re = 2.818e-15      # classical electron radius, [re] = m
+        lambda0 = 10.6e-6   # CO2 wavelength, [lambda0] = m
+        cm_per_m = 100
+        factor *= (re * lambda0 * (cm_per_m ** 3))
+
+    return factor
+
+
+def _global_bounds(tlim):
+    '''Get global indices (i.e. if all windows were concatenated)
+    of the first and last digitized points within `tlim`.'''
+    if tlim is not None:
+        # Ensure limits in time are correctly sized and sorted
+        if len(tlim) != 2:
+            raise ValueError('`tlim` must be an iterable of length 2.')
+        else:
+            tlim = np.sort(tlim)
+
+    gstart = _closest_digitized_point(tlim[0], mode=np.ceil)
+    gstop = _closest_digitized_point(tlim[1], mode=np.floor)
+
+    return gstart, gstop
+
+
+def _initial_time(gstart, filt, decimate=1):
+    '''Get the time of the first point of the record that begins
+    at global index `gstart`, after removing the points contaminated
+    by the boundary effects of `filt` (if not `None`), where
+    the record has been decimated by `decimate`.'''
+    # Determine time closest to `tlim[0]`
+    t0 = _trigger_time + (gstart / _Fs)
+
+    if filt is not None:
+        t0 += (decimate * filt.getValidSlice().start / _Fs)
+
+    return t0
+
+
+def _valid_length(filt, N):
+    '''Get the number of points of a length-`N` record that remain after
+    removing the points contaminated by the boundary effects of `filt`
+    (if not `None`).'''
+    if filt is None:
+        return N
+
+    start, stop, step = filt.getValidSlice().indices(N)
+
+    return len(xrange(start, stop, step))
+
+
+def _boundary_points(filt, decimate=1):
+    '''Get the number of raw points at the beginning and at the end of
+    a record that are contaminated by the boundary effects of `filt`
+    (if not `None`) and, if `decimate` is greater than one, of the
+    anti-aliasing filter, and are thus removed from the record.'''
+    if decimate > 1:
+        b, delay = _antialias_filter(decimate)
+        head = len(b) - 1 - delay
+        tail = delay
+    else:
+        head = 0
+        tail = 0
+
+    if filt is not None:
+        # `filt` is applied after decimation
+        start, stop, step = filt.getValidSlice().indices(_Npts_total)
+        head += (decimate * start)
+        tail += (decimate * (_Npts_total - stop))
+
+    return head, tail
+
+
+def _antialias_filter(decimate):
+    '''Get the lowpass filter applied prior to decimation by `decimate`.
+
+    The filter is a :py:class:`Kaiser <filters.fir.Kaiser>` filter
+    whose transition band spans the top 20% of the decimated Nyquist
+    frequency, with the same ripple as the default highpass filter.
+    It is obtained from :py:func:`_kaiser <bci.signal._kaiser>`,
+    such that it is only designed once.
+
+    Returns:
+    --------
+    (b, delay) - tuple, with
+        b - array_like, (`L`,), the filter coefficients, zero-padded
+            such that `L` is an integer multiple of `decimate`
+        delay - int, the filter's delay (in raw points)
+
+    '''
+    fNyquist = 0.5 * _Fs / decimate
+    width = 0.2 * fNyquist
+
+    lpf = _kaiser(-120, width, fNyquist - (0.5 * width), True, _Fs)
+
+    M = len(lpf.b)
+    b = np.zeros(decimate * -(-M // decimate))
+    b[:M] = lpf.b
 
+    return b, (M - 1) // 2
 
-class Phase(object):
-    '''An object corresponding to the signal retrieved from the BCI system.
 
-    Attributes:
+def _decimated_bounds(gstart, gstop, decimate):
+    '''Get the global index of the first retained point and the number
+    of retained points when the raw points with global indices `gstart`
+    through `gstop` (inclusive) are decimated by `decimate`.
+
+    Retained points have global indices that are integer multiples of
+    `decimate` and are not contaminated by the boundary effects of the
+    anti-aliasing filter. A ValueError is raised if no points are retained.
+
+    '''
+    head, tail = _boundary_points(None, decimate)
+
+    first = decimate * -(-(gstart + head) // decimate)
+    last = decimate * ((gstop - tail) // decimate)
+
+    if last < first:
+        raise ValueError('`tlim` is too short to decimate by %i.' % decimate)
+
+    return first, ((last - first) // decimate) + 1
+
+
+def _load(shot, chords, beams, vibration_subtracted, filt, gstart, gstop,
+          subwindow=True, workers=1, cache=None, Nfft=None,
+          dtype=np.float64, wavelengths=[_lambda_CO2, _lambda_HeNe],
+          decimate=1, stats=None, missing=None):
+    '''Load the phase of one or more BCI channels from the raw points
+    between global indices `gstart` and `gstop` (inclusive).
+
+    Parameters:
     -----------
     shot - int
         DIII-D shot number.
 
-    chord - string
-        The interferometer chord.
-
-    beam - string
-        The type of probe beam.
+    chords, beams, vibration_subtracted - lists, (`Nch`,)
+        The (validated) chord, beam, and type of phase data
+        of each channel.
 
     filt - :py:class:`Kaiser <filters.fir.Kaiser>` instance or None
-        The filter applied to the phase signal. If `None`, the phase
-        signal has not been filtered. Signal and time points
-        contaminated by the filter's boundary effects are *not*
-        returned/accessible from the attributes and methods
-        of the `Phase` class.
+        The filter applied to each channel. Must be designed
+        for the BCI sample rate.
 
-    x - array-like, (`N`,)
-        The retrieved, single-pass phase signal. While all of the BCI chords
-        employ a Michelson configuration (and thus make a double pass through
-        the plasma), this class compensates for the double-pass measurement
-        for easier comparison to the MIT PCI system, which employs a
-        Mach-Zehnder (i.e. single-pass) configuration.
-        [x] = radian
+    gstart, gstop - int
+        The global indices (i.e. if all windows were concatenated)
+        of the first and last raw points to retrieve, as determined
+        by :py:func:`_global_bounds <bci.signal._global_bounds>`.
+        The points contaminated by the boundary effects of `filt`
+        (and of the anti-aliasing filter, if decimating) are removed
+        from the returned record.
 
-    Fs - float
-        The sampling rate.
-        [Fs] = samples / second
+    decimate - int
+        The factor by which to decimate the record. If greater than one,
+        `filt` must be designed for the decimated sample rate.
 
-    t0 - float
-        The time corresponding to the first retrieved point in the signal;
-        that is, if x(t) corresponds to the continuous signal being sampled,
-        then `Phase.x[0]` = x(t0)
-        [t0] = s
+    stats - :py:class:`LoadStats <bci.loadstats.LoadStats>` or None
+        If not `None`, the statistics of each stage of the load
+        and of each window read are recorded in `stats`.
 
-    vibration_subtracted - bool
-        If True and `self.beam` is CO2, the vibrational contributions
-        to the phase data `self.x` have been removed.
+    missing - dict or None
+        If not `None`, updated with the number of raw points that
+        could not be retrieved (and were set to zero) for each channel
+        whose record is shorter than nominal, indexed by channel.
 
-    Methods:
+    The remaining parameters are as described in :py:class:`Phase
+    <bci.signal.Phase>`.
+
+    Returns:
     --------
-    t - returns retrieved signal time-base, array-like, (`N`,)
-        The time-base is generated on the fly as needed and is not stored
-        as an object property; this helps save memory and processing time,
-        as we do not typically look at the raw signal vs. time.
-        [t] = s
+    (t0, x) - tuple, with
+        t0 - float, the time of the first point in `x`
+        x - array_like, (`Nch`, `N`), the single-pass phase of each channel
 
     '''
-    def __init__(self, shot, chord='V2', beam='CO2', filt=_hpf,
-                 tlim=[-0.05, 5.2], vibration_subtracted=False):
-        '''Create an instance of the `Phase` class.
+    # Initialize array to store (potentially) concatenated phase data.
+    # The BCI record for each chord and beam in any given shot
+    # is split across `_Nwindows` windows; each window's contribution
+    # is written directly into its location within the cropped record.
+    first, N = _decimated_bounds(gstart, gstop, decimate)
 
-        Input parameters:
-        -----------------
-        shot - int
-            DIII-D shot number.
+    nbytes = len(chords) * N * np.dtype(dtype).itemsize
 
-        chord - string
-            The interferometer chord. Valid values are 'V1', 'V2',
-            'V3', and 'R0'; a ValueError is raised for other values.
+    with loadstats.stage(stats, 'allocate', allocated=nbytes):
+        sig = np.zeros((len(chords), N), dtype=dtype)
 
-        beam - string
-            The type of probe beam. Valid values are 'CO2' and 'HeNe';
-            a ValueError is raised for other values.
+    # Only the raw points needed for the retained points are read
+    head, tail = _boundary_points(None, decimate)
+    bounds = _window_bounds(first - head, first + (decimate * (N - 1)) + tail)
+    windows = [b[0] for b in bounds]
 
-        filt - :py:class:`Kaiser <filters.fir.Kaiser>` instance or None
-            The filter applied to the phase signal. If `None`,
-            do not filter the phase signal. A ValueError is raised
-            if `filt` is *not* an instance of `filters.fir.Kaiser`
-            or `None`. If `filt` was designed for a sample rate
-            that differs from that of the BCI system,
-            the parameters (i.e. cutoffs, ripple, etc.) will
-            be used to design a comparable filter for use
-            with the BCI sample rate.
+    nodes = []
+    labels = []
 
-        tlim - array_like, (2,)
-            The lower and upper limits in time for which the signal
-            will be retrieved. The default values correspond to
-            the default digitization limits of the mitpci system.
+    for chord, beam, vib in zip(chords, beams, vibration_subtracted):
+        nodes.append(_nodes(chord, beam, vib, windows))
 
-            The specified `tlim` values will always bracket the retrieved
-            signal. That is, if `tlim[0]` does not correspond to an exact
-            digitization time, then the initial time returned (`Phase.t0`)
-            will be the closest digitization time *greater* than `tlim[0]`.
-            Similarly, if `tlim[1]` does not correspond to an exact
-            digitization time, then the final time (`Phase.t[-1]`) will be
-            the closest digitization time *less* than `tlim[1]`. Further,
-            if `tlim[0]` is less than the initial digitization time,
-            the retrieved signal will begin with the initial digitized point.
-            Similarly, if `tlim[1]` exceeds the final digitization time,
-            the retrieved signal will end with the final digitized point.
+        if (vib == 'compute') and (beam == 'CO2'):
+            phase_datatype = 'computed vibration-subtracted'
+        elif vib and (beam == 'CO2'):
+            phase_datatype = 'vibration-subtracted'
+        else:
+            phase_datatype = 'plasma + vibration'
 
-            If `tlim` is not `None` and it is *not* a length-two array,
-            a ValueError is raised.
+        labels.append('\nLoading %s %s phase data (%s)'
+                      % (chord, beam, phase_datatype))
 
-            [tlim] = s
+    # Offset of the first discarded raw point of each channel
+    # whose record is shorter than nominal
+    ended = {}
 
-        vibration_subtracted - bool
-            If True *and* `beam` is CO2, use vibration-subtracted phase data.
+    if decimate > 1:
+        _read_decimated(
+            shot, nodes, bounds, sig, decimate,
+            subwindow=subwindow, workers=workers, cache=cache, labels=labels,
+            wavelengths=wavelengths, ended=ended, stats=stats)
+    else:
+        _read_windows(
+            shot, nodes, bounds, sig,
+            subwindow=subwindow, workers=workers, cache=cache, labels=labels,
+            wavelengths=wavelengths, ended=ended, stats=stats)
 
-        '''
-        self.shot = shot
+    if missing is not None:
+        last = bounds[-1]
+        end = last[3] + (last[2] - last[1] + 1)
 
-        if str.upper(chord) in set(['V1', 'V2', 'V3', 'R0']):
-            self.chord = str.upper(chord)
-        else:
-            raise ValueError('`chord` may be V1, V2, V3, or R0.')
+        for i, offset in ended.items():
+            missing[i] = end - offset
 
-        if str.upper(beam) == 'CO2':
-            self.beam = 'CO2'
-        elif str.upper(beam) == 'HENE':
-            self.beam = 'HeNe'
-        else:
-            raise ValueError('`beam` may be CO2 or HeNe.')
+    t0 = _initial_time(first, filt, decimate)
 
-        if vibration_subtracted and (self.beam == 'CO2'):
-            self.vibration_subtracted = True
-        else:
-            self.vibration_subtracted = False
+    # Filter and convert to single-pass phase in place;
+    # points contaminated by the filter's boundary effects
+    # are removed from the record
+    factors = [
+        _scale_factor(beam, vib)
+        for beam, vib in zip(beams, vibration_subtracted)]
 
-        # Sampling rate
-        self.Fs = _Fs
+    name = 'scale' if (filt is None) else 'filter'
 
-        # Filter
-        self.filt = self._getFilter(filt)
+    with loadstats.stage(stats, name):
+        sig = _filter_and_scale(sig, filt, factors, Nfft=Nfft)
 
-        # Phase signal between `tlim`
-        self.t0, self.x = self._getSignal(tlim)
+    return t0, sig
 
-    def _getFilter(self, filt):
-        'Ensure `filt` is of correct type and compatible with BCI data.'
-        if isinstance(filt, filters.fir.Kaiser):
-            if filt.Fs == self.Fs:
-                self.filt = filt
-            else:
-                # Design similar filter for use at BCI sample rate
-                filt = filters.fir.Kaiser(
-                    filt.ripple, filt.width, filt.f_6dB,
-                    pass_zero=filt.pass_zero, Fs=self.Fs)
-        elif filt is not None:
-            raise ValueError(
-                '`filt` must be `filters.fir.Kaiser` or `None`')
 
-        return filt
+def _filter_and_scale(sig, filt, factors, Nfft=None,
+                      block_len=_filter_block_len):
+    '''Filter each row of `sig` with `filt` and scale it by the
+    corresponding element of `factors`, *in place*, returning only
+    the points that are *not* contaminated by the filter's boundary
+    effects (i.e. the points within `filt.getValidSlice()`).
 
-    def _getSignal(self, tlim):
-        'For window `tlim`, get initial time and (phase) signal.'
-        if tlim is not None:
-            # Ensure limits in time are correctly sized and sorted
-            if len(tlim) != 2:
-                raise ValueError('`tlim` must be an iterable of length 2.')
-            else:
-                tlim = np.sort(tlim)
+    No record-length arrays are allocated, such that peak memory
+    remains close to the size of `sig`.
+
+    Parameters:
+    -----------
+    sig - array_like, (`Nch`, `N`)
+        The signals to be filtered and scaled. `sig` is overwritten.
 
-        # The BCI record for each chord and beam in any given shot
-        # is split across `_Nwindows` windows; determine which windows
-        # to load data from.
-        windows = _windows([tlim[0], tlim[1]])
+    filt - :py:class:`Kaiser <filters.fir.Kaiser>` instance or None
+        The filter to apply. If `None`, `sig` is only scaled.
 
-        # Initialize array to store (potentially) concatenated phase data
-        sig = np.zeros(_Npts_per_window * len(windows))
+    factors - array_like, (`Nch`,)
+        The scale factor for each row of `sig`. When filtering via
+        overlap-save, the factors are folded into the filter
+        coefficients, such that scaling requires no additional pass.
 
-        # Open MDSplus tree
-        tree = mds.Tree('bci', self.shot, 'ReadOnly')
+    Nfft - int or None
+        If `None`, apply `filt` via direct convolution
+        (i.e. `filt.applyTo`) in blocks of `block_len` valid points.
+        Otherwise, apply `filt` via FFT-based overlap-save with FFTs
+        of length `Nfft`; see :py:func:`fftfilt <bci.fftfilt.fftfilt>`.
 
-        # The MDSplus node for each beam type is specified
-        # by a number rather than a string
-        if self.beam == 'CO2':
-            beam_number = 1
-        elif self.beam == 'HeNe':
-            beam_number = 2
-        else:
-            raise ValueError('%s is not a valid beam type' % self.beam)
+    block_len - int
+        The number of valid points filtered per block when `Nfft`
+        is `None`. Each block is filtered from a segment extended by
+        the points contaminated by the filter's boundary effects,
+        such that the blocks match the filtering of the full record.
 
-        if self.vibration_subtracted and (self.beam == 'CO2'):
-            phase_datatype = 'vibration-subtracted'
-        else:
-            phase_datatype = 'plasma + vibration'
+    Returns:
+    --------
+    y - array_like, (`Nch`, `Nvalid`)
+        The valid points of the filtered and scaled signals,
+        a view into `sig`.
 
-        print ('\nLoading %s %s phase data (%s)'
-               % (self.chord, self.beam, phase_datatype))
+    '''
+    factors = np.asarray(factors)[:, np.newaxis]
 
-        # Cycle through each window to iteratively build up signal
-        for i, window in enumerate(windows):
-            print 'Window %i (%i of %i)' % (window, i + 1, len(windows))
+    if filt is None:
+        sig *= factors
+        return sig
 
-            # Determine whether to retrieve raw or vibration-subtracted phase
-            if self.vibration_subtracted and (self.beam == 'CO2'):
-                # [line-integrated density] = m / cm^3
-                node = tree.getNode('\DEN%s_UF_%i' % (self.chord, window))
-            else:
-                # [phase] = radians
-                node = tree.getNode(
-                    '\PL%i%s_UF_%i' % (beam_number, self.chord, window))
+    N = sig.shape[-1]
 
-            # Insert retrieved signal into appropriate location
-            sl = slice(_Npts_per_window * i, (_Npts_per_window * (i + 1)))
+    if Nfft is None:
+        valid = filt.getValidSlice()
+        Nvalid = _valid_length(filt, N)
 
-            try:
-                sig[sl] = node.getData().data()
-            except ValueError:
-                print 'Signal shorter than nominal -- ending retrieval'
+        # Number of points of each segment contaminated
+        # by the filter's boundary effects
+        edge = N - Nvalid
 
-                x = node.getData().data()
+        # Each valid point only depends on points at or after
+        # its own position, so the filtered blocks can overwrite `sig`;
+        # valid points are scaled as they are copied back into `sig`
+        for i in range(len(sig)):
+            for start in xrange(0, Nvalid, block_len):
+                stop = min(start + block_len, Nvalid)
 
-                istart = sl.start
-                istop = istart + len(x)
-                sl = slice(istart, istop)
+                np.multiply(
+                    filt.applyTo(sig[i, start:(stop + edge)])[valid],
+                    factors[i], out=sig[i, start:stop])
 
-                sig[sl] = x
+        return sig[:, :Nvalid]
 
-                break
+    start, stop = _valid_convolution_slice(filt, N)
+    b = np.asarray(factors * filt.b, dtype=sig.dtype)
 
-        # Crop signal to desired time window
-        t0, sig = _crop(sig, tlim)
+    # Each filtered point only depends on points at or after
+    # its own position, so the filtered points can overwrite `sig`
+    y = fftfilt.fftfilt(b, sig, Nfft=Nfft, out=sig[:, :(N - b.shape[-1] + 1)])
 
-        # Apply filter; points contaminated by
-        # the filter's boundary effects are
-        # removed from the record
-        if self.filt is not None:
-            valid = self.filt.getValidSlice()
-            sig = self.filt.applyTo(sig)[valid]
-            t0 += (valid.start / self.Fs)
+    return y[:, start:stop]
 
-        # Convert from double-pass to single-pass measurement
-        sig /= 2.
 
-        # Convert vibration-subtracted, line-integrated density
-        # to corresponding phase, if needed.
-        if self.vibration_subtracted and (self.beam == 'CO2'):
-            re = 2.818e-15      # classical electron radius, [re] = m
-            lambda0 = 10.6e-6   # CO2 wavelength, [lambda0] = m
-            cm_per_m = 100
-            sig *= (re * lambda0 * (cm_per_m ** 3))
+def _valid_convolution_slice(filt, N):
+    '''Get the portion of the valid convolution of a length-`N` record
+    with the coefficients of `filt` that corresponds to the points
+    within `filt.getValidSlice()`.
 
-        return t0, sig
+    `filt.applyTo` compensates for the filter's delay, such that
+    filtered point `n` is centered on input point `n`; the valid
+    convolution (e.g. as computed by :py:func:`fftfilt
+    <bci.fftfilt.fftfilt>`) is offset from this by the delay
+    of (M - 1) // 2 points, where M is the number of filter taps.
 
-    def t(self):
-        'Get times for points in `self.x`.'
-        return self.t0 + (np.arange(len(self.x)) / self.Fs)
+    Returns:
+    --------
+    (start, stop) - tuple of ints
+        The valid convolution's indices corresponding to
+        the first point within and the first point beyond
+        `filt.getValidSlice()`, respectively.
+
+    '''
+    M = len(filt.b)
+    delay = (M - 1) // 2
+
+    start, stop, step = filt.getValidSlice().indices(N)
+
+    if (step != 1) or (start < delay) or ((stop - delay) > (N - M + 1)):
+        raise ValueError(
+            'Valid slice of `filt` incompatible with overlap-save filtering')
+
+    return start - delay, stop - delay
 
 
 def _closest_digitized_point(t, mode=np.round):
@@ -346,6 +1967,454 @@ def _windows(tlim):
     return np.arange(wlo, whi + 1)
 
 
+def _window_bounds(gstart, gstop):
+    '''Get the portion of each BCI window spanned by the points
+    with global indices `gstart` through `gstop` (inclusive).
+
+    Parameters:
+    -----------
+    gstart - int
+        Global index of the first desired point.
+
+    gstop - int
+        Global index of the last desired point.
+
+    Returns:
+    --------
+    bounds - list of tuples, each of form (`window`, `start`, `stop`, `offset`)
+        `window` is the BCI window; `start` and `stop` are the "local"
+        indices (i.e. relative to the beginning of `window`) of
+        the first and last desired points (inclusive) in `window`;
+        and `offset` is the index of the point at `start` within
+        the cropped record that begins at global index `gstart`.
+
+    '''
+    bounds = []
+
+    for window in np.arange(
+            gstart // _Npts_per_window, (gstop // _Npts_per_window) + 1):
+        wstart = window * _Npts_per_window
+
+        start = max(gstart - wstart, 0)
+        stop = min(gstop - wstart, _Npts_per_window - 1)
+
+        bounds.append((window, start, stop, wstart + start - gstart))
+
+    return bounds
+
+
+def set_tree_backend(backend=None):
+    '''Set the function used to open the BCI tree of a given shot.
+
+    Parameters:
+    -----------
+    backend - callable or None
+        Called as `backend(shot)` whenever a connection to the tree
+        of `shot` is opened, and returning an object with the
+        interface of `MDSplus.Tree` used here, namely
+        `getNode(node).getData().data()` and (optionally)
+        `tdiExecute(expression).data()`, where missing windows raise
+        `MDSplus.MdsException`. If `None`, open the tree on the
+        MDSplus server. For example, a :py:class:`FakeTree
+        <bci.faketree.FakeTree>` serves synthetic windows locally
+        for testing and benchmarking. The backend applies to all
+        subsequent retrievals, including those by the worker
+        processes of :py:func:`load_many <bci.signal.load_many>`
+        on platforms where workers are forked.
+
+    Returns:
+    --------
+    previous - callable or None
+        The previous backend, such that it may be restored.
+
+    '''
+    global _tree_backend
+
+    previous = _tree_backend
+    _tree_backend = backend
+
+    return previous
+
+
+# Function that opens the BCI tree of a shot, or None for MDSplus
+_tree_backend = None
+
+
+class _TreeConnection(object):
+    '''A connection to the BCI tree for a given shot, opened on first use,
+    whose reads are recorded in `stats` (if not `None`).'''
+    def __init__(self, shot, stats=None):
+        self.shot = shot
+        self.stats = stats
+        self._tree = None
+        self._open_time = 0.
+
+    @property
+    def tree(self):
+        'The open BCI tree.'
+        if self._tree is None:
+            tic = time.time()
+
+            if _tree_backend is None:
+                self._tree = mds.Tree('bci', self.shot, 'ReadOnly')
+            else:
+                self._tree = _tree_backend(self.shot)
+
+            self._open_time = time.time() - tic
+
+            if self.stats is not None:
+                self.stats.add('open', self._open_time)
+
+        return self._tree
+
+
+def _get_window_data(connection, node, start, stop, subwindow=True,
+                     cache=None):
+    '''Get points `start` through `stop` (inclusive) of BCI window `node`.
+
+    Parameters:
+    -----------
+    connection - :py:class:`_TreeConnection <bci.signal._TreeConnection>`
+        The connection to the BCI tree. The tree is only opened
+        if the window must be retrieved from the MDSplus server.
+
+    node - string
+        The MDSplus node (e.g. '\PL1V2_UF_0') of the desired window.
+
+    start, stop - int
+        The "local" indices (i.e. relative to the beginning of the window)
+        of the first and last desired points.
+
+    subwindow - bool
+        If True, request only the desired points via a subscripted
+        TDI expression. If the expression cannot be evaluated
+        (e.g. the version of MDSplus does not support `Tree.tdiExecute`),
+        fall back to retrieving the full window. If False, always
+        retrieve the full window.
+
+    cache - :py:class:`WindowCache <bci.cache.WindowCache>` instance or None
+        If not `None`, the window is read from `cache` if it has been
+        cached. Otherwise, the *full* window is retrieved from the
+        MDSplus server and stored in `cache` (regardless of `subwindow`).
+
+    Returns:
+    --------
+    x - array_like, (`N`,)
+        The desired points. If the window's record is shorter than
+        nominal, `x` will contain fewer than (`stop` - `start` + 1) points.
+
+    '''
+    if connection.stats is None:
+        return _request_window_data(
+            connection, node, start, stop, subwindow, cache)[0]
+
+    # Time to open the tree is recorded separately
+    opened = connection._tree is not None
+    tic = time.time()
+
+    x, source = _request_window_data(
+        connection, node, start, stop, subwindow, cache)
+
+    dt = time.time() - tic
+
+    if not opened:
+        dt -= connection._open_time
+
+    connection.stats.read(node, source, start, stop, x, dt)
+
+    return x
+
+
+def _request_window_data(connection, node, start, stop, subwindow, cache):
+    '''Get points `start` through `stop` (inclusive) of BCI window `node`,
+    as described in :py:func:`_get_window_data
+    <bci.signal._get_window_data>`, along with their source
+    ('cache', 'subwindow', or 'tree').'''
+    if cache is not None:
+        x = cache.get(connection.shot, node)
+
+        if x is not None:
+            return x[start:(stop + 1)], 'cache'
+
+        x = connection.tree.getNode(node).getData().data()
+        cache.put(connection.shot, node, x)
+
+        return x[start:(stop + 1)], 'tree'
+
+    if subwindow:
+        try:
+            return connection.tree.tdiExecute(
+                'data(%s)[%i : %i]' % (node, start, stop)).data(), 'subwindow'
+        except (AttributeError, mds.MdsException):
+            pass
+
+    x = connection.tree.getNode(node).getData().data()
+
+    return x[start:(stop + 1)], 'tree'
+
+
+def _read_window(connection, node, start, stop, out, subwindow=True,
+                 cache=None, wavelengths=[_lambda_CO2, _lambda_HeNe]):
+    '''Read points `start` through `stop` of window `node` into `out`.
+
+    If `node` is a pair of nodes, corresponding to the raw CO2 and HeNe
+    phase of a chord, the vibration-subtracted CO2 phase is computed from
+    the pair (using `wavelengths`) as it is written into `out`.
+    The remaining parameters are as described in
+    :py:func:`_get_window_data <bci.signal._get_window_data>`.
+
+    Returns:
+    --------
+    Npts - int
+        The number of points written into `out`, which is less than
+        (`stop` - `start` + 1) if the window is shorter than nominal.
+
+    '''
+    if isinstance(node, tuple):
+        x1 = _get_window_data(
+            connection, node[0], start, stop,
+            subwindow=subwindow, cache=cache)
+        x2 = _get_window_data(
+            connection, node[1], start, stop,
+            subwindow=subwindow, cache=cache)
+
+        Npts = min(len(x1), len(x2))
+
+        with loadstats.stage(connection.stats, 'combine'):
+            _plasma_induced_phase(
+                x1[:Npts], x2[:Npts],
+                lambda1=wavelengths[0], lambda2=wavelengths[1],
+                out=out[:Npts])
+    else:
+        x = _get_window_data(
+            connection, node, start, stop,
+            subwindow=subwindow, cache=cache)
+
+        Npts = len(x)
+
+        with loadstats.stage(connection.stats, 'copy'):
+            out[:Npts] = x
+
+    return Npts
+
+
+def _read_windows(shot, nodes, bounds, sig, subwindow=True, workers=1,
+                  cache=None, labels=None,
+                  wavelengths=[_lambda_CO2, _lambda_HeNe],
+                  windows=None, ended=None, stats=None):
+    '''Read BCI windows `nodes` into the appropriate locations of `sig`.
+
+    Parameters:
+    -----------
+    shot - int
+        DIII-D shot number.
+
+    nodes - list of lists of strings, (`Nch`, `Nw`)
+        The MDSplus node of each window to be read, where `nodes[i][j]`
+        corresponds to the `j`th window of the `i`th channel.
+        A pair of nodes is combined as described in
+        :py:func:`_read_window <bci.signal._read_window>`.
+
+    bounds - list of tuples, (`Nw`,)
+        The portion of each window to be read, as
+        returned by :py:func:`_window_bounds <bci.signal._window_bounds>`.
+
+    sig - array_like, (`Nch`, `N`)
+        The array into which the windows' points are written, where
+        `sig[:, 0]` corresponds to the first point of the first window
+        to be read. If a window's record is shorter than nominal,
+        retrieval of the corresponding channel ends with that window,
+        and all subsequent points of the channel are set to zero.
+
+    subwindow - bool
+        If True, request only the points within `bounds`
+        from each window. See :py:func:`_get_window_data
+        <bci.signal._get_window_data>` for details.
+
+    workers - int
+        The number of windows to read concurrently. If greater than one,
+        the windows are read by a pool of threads, each with its own
+        connection to the MDSplus tree.
+
+    cache - :py:class:`WindowCache <bci.cache.WindowCache>` instance or None
+        If not `None`, cached windows are read from `cache`, and
+        uncached windows are stored in `cache` after retrieval.
+        The MDSplus tree is only opened if some windows are not cached.
+
+    labels - list of strings, (`Nch`,), or None
+        If not `None`, `labels[i]` is printed prior to
+        the progress of the `i`th channel's retrieval.
+
+    wavelengths - list, (2,)
+        The CO2 and HeNe wavelengths used to combine pairs of nodes.
+        [wavelengths] = m
+
+    windows - list of ints or None
+        If not `None`, only read the consecutive windows with these
+        indices into `bounds` (e.g. to read a long record in portions).
+
+    ended - dict or None
+        If not `None`, maps the index of each channel whose retrieval
+        has ended with a short window to the offset (within the record
+        spanned by `bounds`) of the channel's first discarded point.
+        Channels in `ended` are not read, and `ended` is updated
+        with any channels that end while reading, such that the same
+        `ended` can be passed when reading subsequent portions.
+
+    stats - :py:class:`LoadStats <bci.loadstats.LoadStats>` or None
+        If not `None`, the statistics of opening the tree and of each
+        window read are recorded in `stats`.
+
+    '''
+    if windows is None:
+        windows = range(len(bounds))
+
+    # Offset of `sig` within the record spanned by `bounds`
+    base = bounds[windows[0]][3]
+
+    tasks = [(i, j) for i in range(len(nodes)) for j in windows]
+
+    # Offset of the first discarded point of each channel
+    # whose retrieval has ended with a short window
+    if ended is None:
+        ended = {}
+
+    def read(connection, task):
+        i, j = task
+
+        if i in ended:
+            return 0
+
+        window, start, stop, offset = bounds[j]
+
+        return _read_window(
+            connection, nodes[i][j], start, stop,
+            sig[i, (offset - base):(offset - base + stop - start + 1)],
+            subwindow=subwindow, cache=cache, wavelengths=wavelengths)
+
+    if (workers > 1) and (len(tasks) > 1):
+        # Each worker thread holds its own connection to the tree
+        local = threading.local()
+
+        def connect():
+            local.connection = _TreeConnection(shot, stats=stats)
+
+        pool = ThreadPool(min(workers, len(tasks)), initializer=connect)
+        lengths = pool.imap(lambda task: read(local.connection, task), tasks)
+    else:
+        pool = None
+        connection = _TreeConnection(shot, stats=stats)
+        lengths = (read(connection, task) for task in tasks)
+
+    try:
+        # Windows are processed in order, regardless of the order
+        # in which their retrieval completes
+        for i, j in tasks:
+            window, start, stop, offset = bounds[j]
+
+            try:
+                Npts = next(lengths)
+            except mds.MdsException:
+                # Windows following a short window may not exist
+                if i in ended:
+                    continue
+
+                raise
+
+            if i in ended:
+                continue
+
+            if (j == 0) and (labels is not None):
+                print labels[i]
+
+            print 'Window %i (%i of %i)' % (window, j + 1, len(bounds))
+
+            if Npts < (stop - start + 1):
+                print 'Signal shorter than nominal -- ending retrieval'
+                ended[i] = offset + Npts
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    # Discard any points retrieved from windows following a short window
+    for i, end in ended.items():
+        sig[i, max(end - base, 0):] = 0
+
+    return
+
+
+def _read_decimated(shot, nodes, bounds, sig, decimate, workers=1,
+                    ended=None, stats=None, **kwargs):
+    '''Read BCI windows `nodes`, decimating them by `decimate` into `sig`.
+
+    The windows are read in portions of `workers` windows. As soon as
+    a portion is read, it is lowpass filtered and decimated via
+    :py:func:`fftdecimate <bci.fftfilt.fftdecimate>`, with the raw
+    points needed by the next portion's filtering carried over, such that
+    only a single portion of raw points is stored at any given time.
+    The decimated record is identical (to floating-point precision)
+    to that obtained by decimating the full raw record at once.
+
+    Parameters:
+    -----------
+    sig - array_like, (`Nch`, `N`)
+        The array into which the decimated points are written,
+        where `N` is the number of points retained when decimating
+        the record spanned by `bounds`, as determined by
+        :py:func:`_decimated_bounds <bci.signal._decimated_bounds>`.
+
+    decimate - int
+        The decimation factor.
+
+    The remaining parameters are as described in :py:func:`_read_windows
+    <bci.signal._read_windows>`.
+
+    '''
+    b, delay = _antialias_filter(decimate)
+
+    if ended is None:
+        ended = {}
+
+    carry = np.zeros((len(nodes), 0), dtype=sig.dtype)
+    n = 0
+
+    # Number of windows per portion
+    Nw = max(workers, 1)
+
+    for j in range(0, len(bounds), Nw):
+        windows = range(j, min(j + Nw, len(bounds)))
+
+        wfirst = bounds[windows[0]]
+        wlast = bounds[windows[-1]]
+        Npts = wlast[3] + (wlast[2] - wlast[1] + 1) - wfirst[3]
+
+        nbytes = len(nodes) * (carry.shape[-1] + Npts) * sig.itemsize
+
+        with loadstats.stage(stats, 'allocate', allocated=nbytes):
+            raw = np.zeros(
+                (len(nodes), carry.shape[-1] + Npts), dtype=sig.dtype)
+            raw[:, :carry.shape[-1]] = carry
+
+        _read_windows(
+            shot, nodes, bounds, raw[:, carry.shape[-1]:], workers=workers,
+            windows=windows, ended=ended, stats=stats, **kwargs)
+
+        tic = time.time()
+
+        y = fftfilt.fftdecimate(b, raw, decimate)
+        sig[:, n:(n + y.shape[-1])] = y
+        n += y.shape[-1]
+
+        carry = raw[:, (decimate * y.shape[-1]):].copy()
+
+        if stats is not None:
+            stats.add('decimate', time.time() - tic,
+                      allocated=(y.nbytes + carry.nbytes))
+
+    return
+
+
 def _crop(sig, tlim):
     'Crop `sig` to time window `tlim`.'
     # First, determine start and stop indices in global record
@@ -363,7 +2432,8 @@ def _crop(sig, tlim):
 
 
 def _plasma_induced_phase(
-        ph1, ph2, lambda1=10.6e-6, lambda2=0.633e-6):
+        ph1, ph2, lambda1=_lambda_CO2, lambda2=_lambda_HeNe, out=None,
+        block_len=_combine_block_len):
     '''Get plasma-induced phase corresponding to raw phase measurement
     `ph1` by using phase measurements at another wavelength to
     subtract the vibrational contributions from `ph1`.
@@ -391,6 +2461,17 @@ def _plasma_induced_phase(
         Probe wavelength of the secondary beam.
         [lambda2] = m
 
+    out - array_like, (`N`,), or None
+        If not `None`, the array into which the plasma-induced phase
+        is written. `out` may be `ph1` itself, in which case the
+        vibrational contributions are removed in place.
+
+    block_len - int
+        The number of points combined per block. The scaled `ph2`
+        of each block is held in a single reusable buffer, such that
+        no arrays longer than `block_len` are allocated (other than
+        `out`, if `None`).
+
     Returns:
     --------
     ph1_plasma - array_like, (`N`,)
@@ -398,7 +2479,27 @@ def _plasma_induced_phase(
         [ph1_plasma] = radian
 
     '''
-    num = lambda1 * ((lambda1 * ph1) - (lambda2 * ph2))
+    ph1 = np.asarray(ph1)
+    ph2 = np.asarray(ph2)
+
     den = (lambda1 ** 2) - (lambda2 ** 2)
+    c1 = (lambda1 ** 2) / den
+    c2 = (lambda1 * lambda2) / den
+
+    if out is None:
+        out = np.zeros(ph1.shape, dtype=np.result_type(ph1, ph2, c1))
+
+    N = len(out)
+    buf = np.zeros(min(block_len, N), dtype=np.result_type(ph2, c2))
+
+    # Combined block by block, i.e.
+    # lambda1 * ((lambda1 * ph1) - (lambda2 * ph2)) / den
+    for start in xrange(0, N, block_len):
+        stop = min(start + block_len, N)
+        y = buf[:(stop - start)]
+
+        np.multiply(ph1[start:stop], c1, out=out[start:stop])
+        np.multiply(ph2[start:stop], c2, out=y)
+        out[start:stop] -= y
 
-    return num / den
+    return out
@@ -0,0 +1,591 @@
+'''This module implements streaming, Welch-averaged spectral densities
+of signals retrieved from the DIII-D bi-color interferometer (BCI) system.
+
+'''
+
+
+import hashlib
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+import signal
+
+
+# Target number of points per channel processed at once
+_block_len = 2 ** 20
+
+
+class SpectralDensity(object):
+    '''Time-resolved, Welch-averaged spectral densities of one or more
+    BCI chords, computed block by block as the phase is retrieved.
+
+    The phase record is divided into consecutive, non-overlapping
+    ensembles, each of which is divided into `Nreal_per_ens` realizations
+    that overlap by 50%. Each realization is detrended (i.e. its mean
+    is removed) and tapered with a Hanning window, and the one-sided
+    spectral densities of the realizations within each ensemble
+    are averaged. The phase is streamed via :py:func:`iter_blocks
+    <bci.signal.iter_blocks>`, such that peak memory is independent
+    of the record length, and the realizations of many ensembles
+    are transformed with a single, batched real FFT.
+
+    Attributes:
+    -----------
+    shot - int
+        DIII-D shot number.
+
+    chords - list of strings, (`Nch`,)
+        The interferometer chords.
+
+    beam - string
+        The type of probe beam.
+
+    Fs - float
+        The sampling rate of the phase.
+        [Fs] = samples / s
+
+    f - array_like, (`Nf`,)
+        The frequencies of the spectral densities.
+        [f] = Hz
+
+    df - float
+        The frequency resolution.
+        [df] = Hz
+
+    t - array_like, (`Nt`,)
+        The time at the center of each ensemble.
+        [t] = s
+
+    dt - float
+        The time between successive ensembles.
+        [dt] = s
+
+    Gxx - array_like, (`Nch`, `Nf`, `Nt`)
+        The autospectral density of each chord's phase.
+        [Gxx] = radian^2 / Hz
+
+    pairs - list of tuples
+        The indices (`i`, `j`) of the chords of each cross-spectral
+        density, with `i` < `j`. Empty unless `cross` is True.
+
+    Gxy - array_like, (`len(pairs)`, `Nf`, `Nt`), or None
+        The (complex-valued) cross-spectral density of each pair
+        of chords, where `Gxy[k]` is the cross-spectral density of
+        chords `pairs[k][0]` and `pairs[k][1]`, or `None`
+        unless `cross` is True.
+        [Gxy] = radian^2 / Hz
+
+    '''
+    def __init__(self, shot, chords=['V2'], beam='CO2', filt=signal._hpf,
+                 tlim=[-0.05, 5.2], vibration_subtracted=False,
+                 Tens=5e-3, Nreal_per_ens=10, cross=False, cache=None,
+                 subwindow=True, Nfft=None,
+                 wavelengths=[signal._lambda_CO2, signal._lambda_HeNe]):
+        '''Create an instance of the `SpectralDensity` class.
+
+        Input parameters:
+        -----------------
+        shot - int
+            DIII-D shot number.
+
+        chords - list of strings
+            The interferometer chords. Valid values are 'V1', 'V2',
+            'V3', and 'R0'; a ValueError is raised for other values.
+
+        Tens - float
+            The duration of each ensemble. A ValueError is raised
+            if no complete ensemble lies within `tlim`.
+            [Tens] = s
+
+        Nreal_per_ens - int
+            The number of (50% overlapping) realizations per ensemble.
+
+        cross - bool
+            If True, also compute the cross-spectral density of each
+            pair of chords (from the same FFTs as the autospectral
+            densities).
+
+        cache - :py:class:`WindowCache <bci.cache.WindowCache>` or None
+            If not `None`, the spectral densities are stored in `cache`
+            (alongside the raw windows, which are also cached), and
+            subsequent instances with identical parameters are
+            read from `cache` without retrieving or processing
+            any phase data.
+
+        The remaining parameters (`beam`, `filt`, `tlim`,
+        `vibration_subtracted`, `subwindow`, `Nfft`, and `wavelengths`)
+        are as described in :py:class:`Phase <bci.signal.Phase>`.
+
+        '''
+        self.shot = shot
+        self.chords = [signal._check_chord(chord) for chord in chords]
+        self.beam = signal._check_beam(beam)
+
+        # Metadata of the phase record, which is common to all chords
+        ph = signal.Phase(
+            shot, chord=self.chords[0], beam=self.beam, filt=filt,
+            tlim=tlim, vibration_subtracted=vibration_subtracted,
+            lazy=True, wavelengths=wavelengths)
+
+        self.Fs = ph.Fs
+
+        # Points per ensemble and per realization
+        self._Npts_per_ens = int(np.round(Tens * self.Fs))
+        self._Npts_per_real = _realization_length(
+            self._Npts_per_ens, Nreal_per_ens)
+        self._Nreal_per_ens = Nreal_per_ens
+
+        Nens = ph.Npts // self._Npts_per_ens
+
+        if Nens < 1:
+            raise ValueError('`tlim` must span at least one ensemble.')
+
+        self.f = np.fft.rfftfreq(self._Npts_per_real, d=(1. / self.Fs))
+        self.df = self.f[1] - self.f[0]
+
+        self.dt = self._Npts_per_ens / self.Fs
+        self.t = ph.t0 + (
+            ((np.arange(Nens) * self._Npts_per_ens)
+             + (0.5 * (self._Npts_per_ens - 1))) / self.Fs)
+
+        if cross:
+            self.pairs = [
+                (i, j)
+                for i in range(len(self.chords))
+                for j in range((i + 1), len(self.chords))]
+        else:
+            self.pairs = []
+
+        # Spectral densities, retrieved from `cache` if available
+        node = _cache_node(ph, self.chords, self._Npts_per_ens,
+                           self._Npts_per_real, cross)
+
+        if cache is not None:
+            self.Gxx = cache.get(shot, node + '_Gxx')
+            self.Gxy = cache.get(shot, node + '_Gxy') if cross else None
+
+            if (self.Gxx is not None) and ((self.Gxy is not None) or
+                                           (not cross)):
+                return
+
+        self.Gxx, self.Gxy = self._getSpectralDensities(
+            filt=ph.filt, tlim=tlim,
+            vibration_subtracted=vibration_subtracted, cross=cross,
+            Nens=Nens, cache=cache, subwindow=subwindow, Nfft=Nfft,
+            wavelengths=wavelengths)
+
+        if cache is not None:
+            cache.put(shot, node + '_Gxx', self.Gxx)
+
+            if cross:
+                cache.put(shot, node + '_Gxy', self.Gxy)
+
+    def _getSpectralDensities(self, filt, tlim, vibration_subtracted,
+                              cross, Nens, cache, subwindow, Nfft,
+                              wavelengths):
+        'Get spectral densities by streaming the phase of each chord.'
+        Nf = len(self.f)
+
+        Gxx = np.zeros((len(self.chords), Nf, Nens))
+
+        if cross:
+            Gxy = np.zeros((len(self.pairs), Nf, Nens), dtype='complex128')
+        else:
+            Gxy = None
+
+        # Each block spans an integer number of ensembles
+        Nens_per_block = max(_block_len // self._Npts_per_ens, 1)
+        block_len = Nens_per_block * self._Npts_per_ens
+
+        # The chords' blocks are retrieved in lockstep
+        streams = [
+            signal.iter_blocks(
+                self.shot, chord=chord, beam=self.beam, filt=filt,
+                tlim=tlim, vibration_subtracted=vibration_subtracted,
+                block_len=block_len, subwindow=subwindow, cache=cache,
+                Nfft=Nfft, wavelengths=wavelengths)
+            for chord in self.chords]
+
+        window = np.hanning(self._Npts_per_real)
+        norm = _density_normalization(window, self.Fs)
+
+        ens = 0
+
+        for blocks in zip(*streams):
+            # Only complete ensembles are used; if a record
+            # is shorter than nominal, the subsequent ensembles
+            # of all chords remain zero
+            N = min([len(x) for t0, x in blocks])
+            Ne = min(N // self._Npts_per_ens, Nens - ens)
+
+            if Ne < 1:
+                break
+
+            x = np.array([x[:(Ne * self._Npts_per_ens)] for t0, x in blocks])
+
+            # (`Nch`, `Ne`, `Nreal_per_ens`, `Nf`)
+            X = _ensemble_ffts(
+                x, self._Npts_per_ens, self._Npts_per_real,
+                self._Nreal_per_ens, window)
+
+            Sxx, Sxy = _averaged_spectra(X, cross=cross)
+            Gxx[:, :, ens:(ens + Ne)] = Sxx * norm[:, None]
+
+            if cross:
+                Gxy[:, :, ens:(ens + Ne)] = Sxy * norm[:, None]
+
+            ens += Ne
+
+        return Gxx, Gxy
+
+
+def _realization_length(Npts_per_ens, Nreal_per_ens):
+    '''Get the number of points per realization such that `Nreal_per_ens`
+    realizations overlapping by 50% span (at most) `Npts_per_ens` points.'''
+    return int((2 * Npts_per_ens) // (Nreal_per_ens + 1))
+
+
+def _ensemble_ffts(x, Npts_per_ens, Npts_per_real, Nreal_per_ens, window):
+    '''Get the FFTs of the detrended and windowed realizations
+    of each ensemble of each row of `x`.
+
+    Parameters:
+    -----------
+    x - array_like, (`Nch`, `Nens` * `Npts_per_ens`)
+        The signals, which are divided into consecutive ensembles
+        of `Npts_per_ens` points.
+
+    Npts_per_ens - int
+        The number of points per ensemble.
+
+    Npts_per_real - int
+        The number of points per realization. Successive realizations
+        are offset by `Npts_per_real // 2` points.
+
+    Nreal_per_ens - int
+        The number of realizations per ensemble.
+
+    window - array_like, (`Npts_per_real`,)
+        The window applied to each realization.
+
+    Returns:
+    --------
+    X - array_like, (`Nch`, `Nens`, `Nreal_per_ens`, `Nf`)
+        The one-sided FFT of each realization, computed together
+        as a single batched real FFT.
+
+    '''
+    x = np.ascontiguousarray(x)
+    Nch, N = x.shape
+    Nens = N // Npts_per_ens
+
+    # View of the (overlapping) realizations, without copying `x`
+    s = x.strides[-1]
+    reals = as_strided(
+        x,
+        shape=(Nch, Nens, Nreal_per_ens, Npts_per_real),
+        strides=(x.strides[0], Npts_per_ens * s,
+                 (Npts_per_real // 2) * s, s))
+
+    reals = reals - np.mean(reals, axis=-1, keepdims=True)
+    reals *= window
+
+    return np.fft.rfft(reals, axis=-1)
+
+
+class CrossSpectralDensity(object):
+    '''Time-resolved, Welch-averaged auto- and cross-spectral densities
+    of many channels on a common time-base, along with the coherence
+    and the time-lag correlation of each pair of channels.
+
+    The realizations of each channel are transformed only once, and
+    the cross-spectral densities of all pairs of channels are formed
+    from these transforms in batched array operations (rather than
+    pair by pair). The ensembles are processed in chunks of roughly
+    `_block_len` points per channel, such that the working memory
+    is independent of the record length. Realizations are detrended
+    and windowed as described in :py:class:`SpectralDensity
+    <bci.spectra.SpectralDensity>`.
+
+    Attributes:
+    -----------
+    chords, beams - list of strings, (`Nch`,)
+        The chord and beam of each channel.
+
+    Fs - float
+        The sampling rate of the channels.
+        [Fs] = samples / s
+
+    f - array_like, (`Nf`,)
+        The frequencies of the spectral densities.
+        [f] = Hz
+
+    df - float
+        The frequency resolution.
+        [df] = Hz
+
+    t - array_like, (`Nt`,)
+        The time at the center of each ensemble.
+        [t] = s
+
+    dt - float
+        The time between successive ensembles.
+        [dt] = s
+
+    pairs - list of tuples, (`Npairs`,)
+        The indices (`i`, `j`) of the channels of each pair, with
+        `i` < `j`, for all `Nch` * (`Nch` - 1) / 2 pairs of channels.
+
+    Gxx - array_like, (`Nch`, `Nf`, `Nt`)
+        The autospectral density of each channel.
+        [Gxx] = radian^2 / Hz
+
+    Gxy - array_like, (`Npairs`, `Nf`, `Nt`)
+        The (complex-valued) cross-spectral density of each pair
+        of channels, where `Gxy[k]` is the cross-spectral density
+        of channels `pairs[k][0]` and `pairs[k][1]`.
+        [Gxy] = radian^2 / Hz
+
+    Methods:
+    --------
+    coherence - get the magnitude-squared coherence of each pair
+    correlation - get the time-lag correlation coefficient of each pair
+
+    '''
+    def __init__(self, signals, Tens=5e-3, Nreal_per_ens=10):
+        '''Create an instance of the `CrossSpectralDensity` class.
+
+        Input parameters:
+        -----------------
+        signals - :py:class:`PhaseArray <bci.signal.PhaseArray>`,
+                or list of :py:class:`Phase <bci.signal.Phase>`
+            The channels, which must share a common time-base (i.e.
+            identical sampling rates, initial times, and numbers of
+            points, as is the case for channels retrieved with the same
+            `tlim`, filter, and decimation); a ValueError is raised
+            otherwise. The signals of a list of `Phase` objects
+            are read chunk by chunk, and are not copied in full.
+
+        Tens - float
+            The duration of each ensemble. A ValueError is raised
+            if the signals do not span at least one ensemble.
+            [Tens] = s
+
+        Nreal_per_ens - int
+            The number of (50% overlapping) realizations per ensemble.
+
+        '''
+        if isinstance(signals, signal.PhaseArray):
+            self.chords = list(signals.chords)
+            self.beams = list(signals.beams)
+            self.Fs = signals.Fs
+            t0 = signals.t0
+            channels = signals.x
+            Npts = channels.shape[-1]
+        else:
+            signals = list(signals)
+
+            self.chords = [ph.chord for ph in signals]
+            self.beams = [ph.beam for ph in signals]
+            self.Fs = signals[0].Fs
+            t0 = signals[0].t0
+            channels = [ph.x for ph in signals]
+            Npts = len(channels[0])
+
+            for ph in signals[1:]:
+                if ((ph.Fs != self.Fs) or (len(ph.x) != Npts)
+                        or (np.abs(ph.t0 - t0) > (0.5 / self.Fs))):
+                    raise ValueError(
+                        'Signals must share a common time-base.')
+
+        Nch = len(self.chords)
+
+        if Nch < 2:
+            raise ValueError('At least two channels are needed.')
+
+        # Points per ensemble and per realization
+        Npts_per_ens = int(np.round(Tens * self.Fs))
+        Npts_per_real = _realization_length(Npts_per_ens, Nreal_per_ens)
+
+        Nens = Npts // Npts_per_ens
+
+        if Nens < 1:
+            raise ValueError('Signals must span at least one ensemble.')
+
+        self.f = np.fft.rfftfreq(Npts_per_real, d=(1. / self.Fs))
+        self.df = self.f[1] - self.f[0]
+
+        self.dt = Npts_per_ens / self.Fs
+        self.t = t0 + (
+            ((np.arange(Nens) * Npts_per_ens)
+             + (0.5 * (Npts_per_ens - 1))) / self.Fs)
+
+        self.pairs = [(i, j) for i in range(Nch) for j in range((i + 1), Nch)]
+
+        window = np.hanning(Npts_per_real)
+        self._norm = _density_normalization(window, self.Fs)
+        self._Npts_per_real = Npts_per_real
+
+        self.Gxx = np.zeros((Nch, len(self.f), Nens))
+        self.Gxy = np.zeros(
+            (len(self.pairs), len(self.f), Nens), dtype='complex128')
+
+        # Each chunk spans an integer number of ensembles
+        Nens_per_chunk = max(_block_len // Npts_per_ens, 1)
+
+        for ens in range(0, Nens, Nens_per_chunk):
+            Ne = min(Nens_per_chunk, Nens - ens)
+            start = ens * Npts_per_ens
+            stop = start + (Ne * Npts_per_ens)
+
+            x = np.array([xch[start:stop] for xch in channels])
+
+            X = _ensemble_ffts(
+                x, Npts_per_ens, Npts_per_real, Nreal_per_ens, window)
+
+            Sxx, Sxy = _averaged_spectra(X)
+            self.Gxx[:, :, ens:(ens + Ne)] = Sxx * self._norm[:, None]
+            self.Gxy[:, :, ens:(ens + Ne)] = Sxy * self._norm[:, None]
+
+    def coherence(self):
+        '''Get the magnitude-squared coherence of each pair of channels.
+
+        Returns:
+        --------
+        Cxy - array_like, (`Npairs`, `Nf`, `Nt`)
+            The magnitude-squared coherence |Gxy|^2 / (Gxx * Gyy)
+            of each pair of channels, between 0 and 1.
+
+        '''
+        i, j = [np.array(ind) for ind in zip(*self.pairs)]
+
+        return (np.abs(self.Gxy) ** 2) / (self.Gxx[i] * self.Gxx[j])
+
+    def correlation(self, maxlag=None):
+        '''Get the time-lag correlation coefficient of each pair
+        of channels from the (ensemble-averaged) cross-spectral
+        densities, via batched inverse FFTs.
+
+        The correlation is that of the detrended and windowed
+        realizations, which is circular in lag; correlations at lags
+        approaching half the duration of a realization are thus
+        affected by wrap-around and should be disregarded.
+
+        Parameters:
+        -----------
+        maxlag - float or None
+            The maximum magnitude of the returned lags. If `None`,
+            return all lags spanned by a realization.
+            [maxlag] = s
+
+        Returns:
+        --------
+        (tau, rho) - tuple, with
+            tau - array_like, (`Nlag`,), the lags, [tau] = s
+            rho - array_like, (`Npairs`, `Nlag`, `Nt`), the correlation
+                coefficient of each pair of channels, between -1 and 1,
+                where a peak at positive lag indicates that channel
+                `pairs[k][1]` lags channel `pairs[k][0]`
+
+        '''
+        N = self._Npts_per_real
+        Nt = len(self.t)
+
+        lags = np.arange(N) - (N // 2)
+
+        if maxlag is not None:
+            lags = lags[np.abs(lags) <= (maxlag * self.Fs)]
+
+        i, j = [np.array(ind) for ind in zip(*self.pairs)]
+        rho = np.zeros((len(self.pairs), len(lags), Nt))
+
+        # Undo the one-sided density normalization, such that inverse
+        # transforms give correlations of the windowed realizations
+        norm = self._norm[:, None]
+
+        # Ensembles are transformed in chunks to bound memory
+        Nt_per_chunk = max(_block_len // (N * len(self.pairs)), 1)
+
+        for start in range(0, Nt, Nt_per_chunk):
+            sl = slice(start, start + Nt_per_chunk)
+
+            Rxy = np.fft.irfft(self.Gxy[:, :, sl] / norm, n=N, axis=-2)
+            Rxx0 = np.fft.irfft(
+                self.Gxx[:, :, sl] / norm, n=N, axis=-2)[:, 0, :]
+
+            # Negative lags wrap around to the end of the transform
+            rho[:, :, sl] = Rxy[:, (lags % N), :] / np.sqrt(
+                Rxx0[i] * Rxx0[j])[:, None, :]
+
+        return lags / self.Fs, rho
+
+
+def _density_normalization(window, Fs):
+    '''Get the normalization of the one-sided spectral density of
+    realizations tapered by `window`, where the DC and Nyquist
+    components are *not* doubled.'''
+    Nf = (len(window) // 2) + 1
+
+    norm = np.ones(Nf) * (2. / (Fs * np.sum(window ** 2)))
+    norm[0] /= 2
+
+    if (len(window) % 2) == 0:
+        norm[-1] /= 2
+
+    return norm
+
+
+def _averaged_spectra(X, cross=True):
+    '''Get the (unnormalized) realization-averaged auto- and cross-spectra
+    of each channel and each pair of channels of FFTs `X`.
+
+    Parameters:
+    -----------
+    X - array_like, (`Nch`, `Nens`, `Nreal_per_ens`, `Nf`)
+        The FFTs of the realizations of each ensemble of each channel,
+        as returned by :py:func:`_ensemble_ffts
+        <bci.spectra._ensemble_ffts>`.
+
+    cross - bool
+        If False, only compute the autospectra.
+
+    Returns:
+    --------
+    (Sxx, Sxy) - tuple, with
+        Sxx - array_like, (`Nch`, `Nf`, `Nens`), the mean of |X|^2
+        Sxy - array_like, (`Npairs`, `Nf`, `Nens`), the mean of
+            conj(X[i]) * X[j] for each pair of channels `i` < `j`,
+            ordered as `[(i, j) for i in ... for j in ...]`,
+            or `None` if `cross` is False
+
+    '''
+    Nch, Nens, Nreal, Nf = X.shape
+
+    Sxx = np.swapaxes(
+        np.mean((X.real ** 2) + (X.imag ** 2), axis=-2), -1, -2)
+
+    if not cross:
+        return Sxx, None
+
+    Sxy = np.zeros(((Nch * (Nch - 1)) // 2, Nf, Nens), dtype=X.dtype)
+    k = 0
+
+    # Each channel is paired with all subsequent channels at once;
+    # `X[(i + 1):]` is a view, so no FFTs are copied per pair
+    for i in range(Nch - 1):
+        Sxy[k:(k + Nch - 1 - i)] = np.einsum(
+            'erf,jerf->jfe', np.conj(X[i]), X[(i + 1):]) / Nreal
+        k += Nch - 1 - i
+
+    return Sxx, Sxy
+
+
+def _cache_node(ph, chords, Npts_per_ens, Npts_per_real, cross):
+    '''Get the name under which spectral densities with the given
+    parameters are cached, where `ph` is a :py:class:`Phase
+    <bci.signal.Phase>` with the same filter, time window,
+    and type of phase data.'''
+    params = repr((
+        ph._getKey(), list(chords), Npts_per_ens, Npts_per_real, cross))
+
+    return 'SPECTRA_%s%s_%s' % (
+        ''.join(chords), ph.beam, hashlib.md5(params).hexdigest())
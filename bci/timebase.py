@@ -0,0 +1,232 @@
+'''This module implements a class for lazily evaluating the uniformly
+sampled time-base of signals retrieved from the DIII-D bi-color
+interferometer (BCI) system.
+
+'''
+
+
+import numpy as np
+
+
+class TimeBase(object):
+    '''A uniformly sampled time-base whose values are computed on demand.
+
+    The `n`th time of the time-base is
+
+                t[n] = t0 + (n / Fs),       0 <= n < N,
+
+    which is only evaluated for the requested points. Indexing with an
+    integer returns a single time, and slicing returns another `TimeBase`
+    (without evaluating any times). The full time-base is only
+    materialized when explicitly converted to an array (e.g. via
+    `np.asarray`, which is also invoked implicitly when plotting or
+    when performing arithmetic or comparisons with the time-base).
+
+    Attributes:
+    -----------
+    t0 - float
+        The first time of the time-base.
+        [t0] = s
+
+    Fs - float
+        The sampling rate of the time-base.
+        [Fs] = samples / s
+
+    N - int
+        The number of points in the time-base.
+
+    shape, size, ndim, dtype
+        As for the materialized time-base, such that a `TimeBase`
+        can be inspected like an array without being materialized.
+
+    Methods:
+    --------
+    searchsorted - find indices at which times would be inserted,
+        computed in O(1) time per time
+    min, max - get earliest and latest times of the time-base
+
+    '''
+    def __init__(self, t0, Fs, N):
+        '''Create an instance of the `TimeBase` class.
+
+        Input parameters:
+        -----------------
+        t0 - float
+            The first time of the time-base.
+            [t0] = s
+
+        Fs - float
+            The sampling rate of the time-base.
+            [Fs] = samples / s
+
+        N - int
+            The number of points in the time-base.
+
+        '''
+        # The `n`th time is evaluated as
+        #
+        #       t0 + ((_offset + (n * _step)) / Fs),
+        #
+        # where `t0` and `Fs` are those of the original time-base,
+        # such that slicing introduces no additional rounding errors
+        self._t0 = t0
+        self._Fs = Fs
+        self._offset = 0
+        self._step = 1
+
+        self.N = N
+
+    @property
+    def t0(self):
+        'The first time of the time-base.'
+        return self._time(0)
+
+    @property
+    def Fs(self):
+        'The sampling rate of the time-base.'
+        return self._Fs / abs(self._step)
+
+    @property
+    def shape(self):
+        'The shape of the materialized time-base.'
+        return (self.N,)
+
+    @property
+    def size(self):
+        'The number of points of the materialized time-base.'
+        return self.N
+
+    @property
+    def ndim(self):
+        'The number of dimensions of the materialized time-base.'
+        return 1
+
+    @property
+    def dtype(self):
+        'The data type of the materialized time-base.'
+        return np.dtype('float64')
+
+    def _time(self, n):
+        'Get time(s) of point(s) `n`.'
+        return self._t0 + ((self._offset + (n * self._step)) / self._Fs)
+
+    def __len__(self):
+        return self.N
+
+    def __array__(self, dtype=None):
+        t = self._time(np.arange(self.N))
+
+        if dtype is not None:
+            t = t.astype(dtype)
+
+        return t
+
+    def __iter__(self):
+        for n in xrange(self.N):
+            yield self._time(n)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.N)
+
+            tb = TimeBase(self._t0, self._Fs, len(xrange(start, stop, step)))
+            tb._offset = self._offset + (start * self._step)
+            tb._step = self._step * step
+
+            return tb
+
+        if isinstance(key, (int, long, np.integer)):
+            if key < 0:
+                key += self.N
+
+            if (key < 0) or (key >= self.N):
+                raise IndexError('index out of range')
+
+            return self._time(key)
+
+        key = np.asarray(key)
+
+        if key.dtype == bool:
+            return np.asarray(self)[key]
+
+        return self._time(np.where(key < 0, key + self.N, key))
+
+    def __repr__(self):
+        return 'TimeBase(t0=%r, Fs=%r, N=%r)' % (self.t0, self.Fs, self.N)
+
+    def min(self):
+        'Get the earliest time of the time-base.'
+        return min(self[0], self[-1])
+
+    def max(self):
+        'Get the latest time of the time-base.'
+        return max(self[0], self[-1])
+
+    def searchsorted(self, t, side='left'):
+        '''Find indices at which times `t` would be inserted into
+        the (increasing) time-base to maintain order, as in
+        :py:meth:`np.ndarray.searchsorted`, but without
+        materializing the time-base.
+
+        Parameters:
+        -----------
+        t - float or array_like
+            The times to insert.
+            [t] = s
+
+        side - string
+            If 'left', return the index of the first time >= `t`;
+            if 'right', return the index of the first time > `t`.
+            A ValueError is raised for other values.
+
+        Returns:
+        --------
+        n - int or array_like
+            The insertion indices, with 0 <= `n` <= `N`.
+
+        '''
+        if self._step < 0:
+            raise ValueError('Time-base must be increasing.')
+
+        t = np.asarray(t, dtype='float64')
+
+        # Approximate insertion position, refined below
+        # to account for finite-precision arithmetic
+        pos = (((t - self._t0) * self._Fs) - self._offset) / self._step
+
+        if side == 'left':
+            n = np.ceil(pos)
+            n = np.where(self._time(n - 1) >= t, n - 1, n)
+            n = np.where(self._time(n) < t, n + 1, n)
+        elif side == 'right':
+            n = np.floor(pos) + 1
+            n = np.where(self._time(n - 1) > t, n - 1, n)
+            n = np.where(self._time(n) <= t, n + 1, n)
+        else:
+            raise ValueError("`side` may be 'left' or 'right'")
+
+        n = np.clip(n, 0, self.N).astype('int')
+
+        if n.ndim == 0:
+            return int(n)
+
+        return n
+
+
+def _materialized(name):
+    'Get method `name` that operates on the materialized time-base.'
+    def method(self, *args):
+        return getattr(np.asarray(self), name)(*args)
+
+    method.__name__ = name
+
+    return method
+
+
+# Arithmetic and comparisons act on the materialized time-base,
+# such that a `TimeBase` can be used in place of an array
+for _name in ['__add__', '__radd__', '__sub__', '__rsub__',
+              '__mul__', '__rmul__', '__div__', '__rdiv__',
+              '__truediv__', '__rtruediv__', '__neg__',
+              '__lt__', '__le__', '__gt__', '__ge__', '__eq__', '__ne__']:
+    setattr(TimeBase, _name, _materialized(_name))
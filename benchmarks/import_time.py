@@ -0,0 +1,75 @@
+'''Benchmark the time to import `bci` and to obtain its filters.
+
+Each case is run in a fresh interpreter, such that no filters have
+been designed beforehand, and the median time of several runs is
+reported. Because the default highpass filter is designed on first
+use rather than on import, `import bci` should take a small fraction
+of the time needed to design the default filter, and subsequent
+requests for a filter (e.g. when creating many `Phase` objects)
+should be served from the filter cache.
+
+Usage:
+
+    $ python benchmarks/import_time.py
+
+'''
+
+
+import subprocess
+import sys
+import time
+import numpy as np
+
+
+# Number of fresh interpreters per case
+Nruns = 5
+
+# Number of filter requests per run, e.g. one per `Phase` object
+Nrequests = 100
+
+cases = ['import', 'first', 'repeated']
+
+
+def run_case(case):
+    'Run a single case, returning its duration, [run_case()] = s.'
+    tic = time.time()
+    from bci import signal
+
+    if case == 'import':
+        return time.time() - tic
+
+    # Filter designed for a sample rate other than that of the
+    # BCI system, which must be redesigned for use w/ BCI data
+    filt = signal._KaiserSpec(-120, 5e3, 10e3, False, 1e6)
+
+    if case == 'first':
+        tic = time.time()
+        signal._check_filter(signal._hpf, signal._Fs)
+    elif case == 'repeated':
+        signal._check_filter(filt, signal._Fs)
+        tic = time.time()
+
+        for i in xrange(Nrequests):
+            signal._check_filter(filt, signal._Fs)
+
+        return (time.time() - tic) / Nrequests
+
+    return time.time() - tic
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        # Child process: run a single case
+        print run_case(sys.argv[1])
+    else:
+        print '%10s %12s' % ('case', 'time [ms]')
+
+        for case in cases:
+            times = []
+
+            for run in xrange(Nruns):
+                out = subprocess.check_output(
+                    [sys.executable, __file__, case])
+                times.append(float(out.split()[-1]))
+
+            print '%10s %12.3f' % (case, 1e3 * np.median(times))
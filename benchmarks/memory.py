@@ -0,0 +1,79 @@
+'''Benchmark the peak memory used to process a BCI phase record.
+
+Each case is run in a fresh interpreter, which allocates a record
+(as is done during retrieval by `bci.signal._load`), filters and
+scales it in place, and reports the increase in peak resident set
+size (RSS) relative to the size of the processed record. A ratio
+close to 1 indicates that no record-length intermediate arrays
+were allocated.
+
+Usage:
+
+    $ python benchmarks/memory.py
+
+'''
+
+
+import resource
+import subprocess
+import sys
+import numpy as np
+
+
+# Full-shot record, [Npts] = samples
+Npts = 9 * (2 ** 21)
+
+cases = [
+    # (Nfft, dtype)
+    (None, 'float64'),
+    (2 ** 15, 'float64'),
+    (2 ** 15, 'float32'),
+]
+
+
+def peak_rss():
+    'Get peak RSS of this process, [peak_rss()] = bytes.'
+    # On Linux, `ru_maxrss` is reported in kilobytes
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def run_case(Nfft, dtype):
+    'Process a record, returning (peak RSS increase, output size).'
+    from bci import signal
+
+    # Design default filter prior to establishing the baseline RSS
+    filt = signal._check_filter(signal._hpf, signal._Fs)
+    rss0 = peak_rss()
+
+    sig = np.zeros((1, Npts), dtype=dtype)
+
+    # Fill record in chunks to avoid record-length temporaries
+    chunk = 2 ** 20
+
+    for start in np.arange(0, Npts, chunk):
+        sig[0, start:(start + chunk)] = np.random.randn(
+            len(sig[0, start:(start + chunk)]))
+
+    x = signal._filter_and_scale(sig, filt, [0.5], Nfft=Nfft)
+
+    return peak_rss() - rss0, x.nbytes
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        # Child process: run a single case
+        Nfft = None if sys.argv[1] == 'None' else int(sys.argv[1])
+        drss, nbytes = run_case(Nfft, sys.argv[2])
+        print drss, nbytes
+    else:
+        print '%10s %10s %12s %12s %8s' % (
+            'Nfft', 'dtype', 'output [MB]', 'peak [MB]', 'ratio')
+
+        for Nfft, dtype in cases:
+            out = subprocess.check_output(
+                [sys.executable, __file__, str(Nfft), dtype])
+            drss, nbytes = [float(s) for s in out.split()[-2:]]
+
+            print '%10s %10s %12.1f %12.1f %8.2f' % (
+                Nfft, dtype, nbytes / 2 ** 20, drss / 2 ** 20,
+                drss / nbytes)
@@ -0,0 +1,95 @@
+'''Benchmark the retrieval of BCI phase records.
+
+Windows are served by a local :py:class:`FakeTree <bci.faketree.FakeTree>`
+(see :py:func:`set_tree_backend <bci.signal.set_tree_backend>`) that
+emulates the latency and bandwidth of a connection to the MDSplus server,
+such that the retrieval path can be benchmarked without access to
+the DIII-D tree. The final window of the fake shot is shorter than
+nominal, as is typical of real shots.
+
+Each case is run in a fresh interpreter, which reports the duration
+of the retrieval, the throughput (in retrieved points per second),
+and the increase in peak resident set size (RSS) relative to the
+size of the retrieved record(s).
+
+Usage:
+
+    $ python benchmarks/retrieval.py
+
+'''
+
+
+import functools
+import resource
+import subprocess
+import sys
+import time
+
+
+# Emulated connection to the MDSplus server,
+# [latency] = s, [bandwidth] = bytes / s
+latency = 5e-3
+bandwidth = 500e6
+
+# Number of points of the (short) final window
+Npts_final = 2 ** 19
+
+cases = [
+    # (name, keyword arguments of `Phase` or `PhaseArray`)
+    ('window', {'filt': None, 'tlim': [0., 1.]}),
+    ('shot', {'filt': None}),
+    ('shot, w=4', {'filt': None, 'workers': 4}),
+    ('chords', {'filt': None, 'chords': ['V1', 'V2', 'V3', 'R0']}),
+    ('filtered', {}),
+    ('filtered, w=4', {'workers': 4}),
+    ('fftfilt', {'Nfft': 2 ** 15}),
+]
+
+
+def peak_rss():
+    'Get peak RSS of this process, [peak_rss()] = bytes.'
+    # On Linux, `ru_maxrss` is reported in kilobytes
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def run_case(name):
+    'Retrieve a record, returning (duration, points, peak RSS increase).'
+    from bci import signal, faketree
+
+    kwargs = dict(cases)[name]
+
+    signal.set_tree_backend(functools.partial(
+        faketree.FakeTree, short={(signal._Nwindows - 1): Npts_final},
+        latency=latency, bandwidth=bandwidth))
+
+    # Design filter and synthesize windows prior to
+    # establishing the baseline RSS
+    signal._check_filter(kwargs.get('filt', signal._hpf), signal._Fs)
+    faketree._template(signal._Npts_per_window)
+    rss0 = peak_rss()
+
+    tic = time.time()
+
+    if 'chords' in kwargs:
+        x = signal.PhaseArray(1, beams=['CO2'], **kwargs).x
+    else:
+        x = signal.Phase(1, **kwargs).x
+
+    return time.time() - tic, x.size, peak_rss() - rss0, x.nbytes
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        # Child process: run a single case
+        print '%f %i %i %i' % run_case(sys.argv[1])
+    else:
+        print '%14s %10s %10s %12s %12s %8s' % (
+            'case', 'time [s]', 'Mpts', 'Mpts / s', 'peak [MB]', 'ratio')
+
+        for name, kwargs in cases:
+            out = subprocess.check_output([sys.executable, __file__, name])
+            dt, Npts, drss, nbytes = [float(s) for s in out.split()[-4:]]
+
+            print '%14s %10.3f %10.2f %12.2f %12.1f %8.2f' % (
+                name, dt, Npts / 1e6, Npts / 1e6 / dt, drss / 2 ** 20,
+                drss / nbytes)
@@ -7,6 +7,9 @@ config = {
     'name': 'bci',
     'version': '0.1',
     'packages': ['bci'],
+    'entry_points': {
+        'console_scripts': ['bci-prefetch = bci.prefetch:main']
+    },
     'install_requires': ['nose', 'numpy', 'MDSplus'],
         # 'filters'],  # <- Not on PyPI
     'author': 'Evan M. Davis',
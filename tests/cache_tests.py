@@ -0,0 +1,81 @@
+from nose import tools
+import os
+import shutil
+import tempfile
+import numpy as np
+from bci.cache import WindowCache
+
+
+def test_WindowCache():
+    path = tempfile.mkdtemp()
+
+    try:
+        cache = WindowCache(path)
+
+        shot = 167341
+        node = '\PL1V2_UF_3'
+        x = np.random.randn(1000)
+
+        # Uncached windows are not found
+        tools.assert_is_none(cache.get(shot, node))
+
+        # Cached windows are served via memory mapping
+        cache.put(shot, node, x)
+        xcached = cache.get(shot, node)
+
+        tools.assert_is_instance(xcached, np.memmap)
+        np.testing.assert_equal(xcached, x)
+
+        # Windows are keyed by shot *and* node
+        tools.assert_is_none(cache.get(shot + 1, node))
+        tools.assert_is_none(cache.get(shot, '\PL2V2_UF_3'))
+
+        tools.assert_equal(cache.size(), os.path.getsize(
+            os.path.join(path, str(shot), 'PL1V2_UF_3.npy')))
+
+        cache.clear()
+        tools.assert_is_none(cache.get(shot, node))
+        tools.assert_equal(cache.size(), 0)
+    finally:
+        shutil.rmtree(path)
+
+    return
+
+
+def test_WindowCache_eviction():
+    path = tempfile.mkdtemp()
+
+    try:
+        shot = 167341
+        nodes = ['\PL1V2_UF_%i' % window for window in range(3)]
+        x = np.zeros(1000)
+
+        # Determine size of a single cached window
+        cache = WindowCache(path)
+        cache.put(shot, nodes[0], x)
+        window_bytes = cache.size()
+        cache.clear()
+
+        # Size limit only accommodates two windows
+        cache = WindowCache(path, max_bytes=(2 * window_bytes))
+
+        cache.put(shot, nodes[0], x)
+        cache.put(shot, nodes[1], x)
+
+        # Use `nodes[0]` more recently than `nodes[1]`
+        fname0 = cache._filename(shot, nodes[0])
+        fname1 = cache._filename(shot, nodes[1])
+        os.utime(fname0, (100, 100))
+        os.utime(fname1, (50, 50))
+
+        # Adding a third window should evict the least-recently used window
+        cache.put(shot, nodes[2], x)
+
+        tools.assert_is_not_none(cache.get(shot, nodes[0]))
+        tools.assert_is_none(cache.get(shot, nodes[1]))
+        tools.assert_is_not_none(cache.get(shot, nodes[2]))
+        tools.assert_equal(cache.size(), 2 * window_bytes)
+    finally:
+        shutil.rmtree(path)
+
+    return
@@ -0,0 +1,70 @@
+from nose import tools
+import numpy as np
+from bci.envelope import Envelope, pyramid, _level_lengths
+
+
+def test__level_lengths():
+    tools.assert_equal(_level_lengths(1, 4), [1])
+    tools.assert_equal(_level_lengths(16, 4), [4, 2, 1])
+    tools.assert_equal(_level_lengths(17, 4), [5, 3, 2, 1])
+
+    return
+
+
+def test_pyramid():
+    block = 4
+
+    for N in [3, 64, 101]:
+        x = np.random.randn(N)
+        data = pyramid(x, block=block)
+
+        tools.assert_equal(data.shape, (3, sum(_level_lengths(N, block))))
+
+        # Compare each level to brute-force computation
+        start = 0
+        size = block
+
+        for Nblocks in _level_lengths(N, block):
+            for i in range(Nblocks):
+                xb = x[(i * size):((i + 1) * size)]
+                np.testing.assert_allclose(
+                    data[:, start + i], [xb.min(), xb.max(), xb.mean()])
+
+            start += Nblocks
+            size *= 2
+
+    return
+
+
+def test_Envelope():
+    t0 = 1.
+    Fs = 10.
+    N = 1000
+    block = 4
+
+    x = np.random.randn(N)
+    env = Envelope(t0, Fs, N, pyramid(x, block=block), block=block)
+
+    # Entire signal in (at least) 10 blocks
+    t, xmin, xmax, xmean = env.get(npixels=10)
+
+    tools.assert_true(len(t) >= 10)
+    tools.assert_true(len(t) < 20)
+    tools.assert_equal(xmin.min(), x.min())
+    tools.assert_equal(xmax.max(), x.max())
+
+    # Each block's summary bounds the points nearest its center
+    n = np.round((t - t0) * Fs).astype('int')
+    tools.assert_true(np.all(xmin <= x[n]))
+    tools.assert_true(np.all(xmax >= x[n]))
+
+    # Zoomed in, with and without the full-resolution signal
+    t, xmin, xmax, xmean = env.get([t0 + 10, t0 + 12], npixels=100, x=x)
+    np.testing.assert_equal(t, t0 + (np.arange(100, 121) / Fs))
+    np.testing.assert_equal(xmin, x[100:121])
+
+    t, xmin, xmax, xmean = env.get([t0 + 10, t0 + 12], npixels=100)
+    np.testing.assert_allclose(
+        xmean, x[100:124].reshape(-1, block).mean(axis=-1))
+
+    return
@@ -0,0 +1,55 @@
+from nose import tools
+import time
+import numpy as np
+import MDSplus as mds
+from bci.faketree import FakeTree
+
+
+def test_FakeTree_data():
+    N = 100
+    tree = FakeTree(1, Npts_per_window=N, Nwindows=3, short={2: 10})
+
+    # Full and short windows
+    tools.assert_equal(len(tree.data('\PL1V2_UF_0')), N)
+    tools.assert_equal(len(tree.data('\DEN2V2_UF_1')), N)
+    tools.assert_equal(len(tree.data('\PL1V2_UF_2')), 10)
+
+    # Requested points, truncated at end of short window
+    x = tree.data('\PL1V2_UF_0')
+    np.testing.assert_equal(tree.data('\PL1V2_UF_0', 5, 9), x[5:10])
+    tools.assert_equal(len(tree.data('\PL1V2_UF_2', 5, 50)), 5)
+
+    # Data is deterministic but differs between shots and nodes
+    np.testing.assert_equal(FakeTree(1, Npts_per_window=N).data(
+        '\PL1V2_UF_0'), x)
+    tools.assert_false(np.allclose(FakeTree(2, Npts_per_window=N).data(
+        '\PL1V2_UF_0'), x))
+    tools.assert_false(np.allclose(tree.data('\PL2V2_UF_0'), x))
+
+    # Nonexistent windows and nodes
+    tools.assert_raises(mds.MdsException, tree.data, '\PL1V2_UF_3')
+    tools.assert_raises(mds.MdsException, tree.data, '\IP')
+
+    return
+
+
+def test_FakeTree_requests():
+    N = 100
+    tree = FakeTree(1, Npts_per_window=N)
+
+    x = tree.getNode('\PL1V2_UF_0').getData().data()
+    y = tree.tdiExecute('data(\PL1V2_UF_0)[10 : 19]').data()
+
+    np.testing.assert_equal(y, x[10:20])
+    tools.assert_equal(
+        tree.requests, [('\PL1V2_UF_0', None, None), ('\PL1V2_UF_0', 10, 19)])
+
+    tools.assert_raises(mds.MdsException, tree.tdiExecute, 'data(\IP)')
+
+    # Latency and bandwidth
+    tree = FakeTree(1, Npts_per_window=N, latency=0.01, bandwidth=8e4)
+    tic = time.time()
+    tree.getNode('\PL1V2_UF_0').getData().data()
+    tools.assert_true((time.time() - tic) >= 0.02)
+
+    return
@@ -0,0 +1,96 @@
+from nose import tools
+import numpy as np
+from bci.fftfilt import fftfilt, fftdecimate
+
+
+def test_fftfilt():
+    M = 101
+    N = 10000
+
+    b = np.random.randn(M)
+    x = np.random.randn(N)
+
+    yvalid = np.convolve(x, b, mode='valid')
+
+    # Various block sizes, including the minimum block size
+    # and a block size larger than the record
+    for Nfft in [None, M, 128, 1000, 2 ** 14]:
+        np.testing.assert_allclose(
+            fftfilt(b, x, Nfft=Nfft), yvalid, rtol=0, atol=1e-10)
+
+    # Block size smaller than filter is invalid
+    tools.assert_raises(ValueError, fftfilt, b, x, Nfft=(M - 1))
+
+    # Record shorter than filter is invalid
+    tools.assert_raises(ValueError, fftfilt, b, x[:(M - 1)])
+
+    return
+
+
+def test_fftfilt_2d():
+    M = 51
+    N = 5000
+
+    b = np.random.randn(M)
+    x = np.random.randn(3, N)
+
+    y = fftfilt(b, x, Nfft=256)
+
+    tools.assert_equal(y.shape, (3, N - M + 1))
+
+    for i in range(len(x)):
+        np.testing.assert_allclose(
+            y[i], np.convolve(x[i], b, mode='valid'), rtol=0, atol=1e-10)
+
+    # Distinct coefficients for each row
+    b2 = np.random.randn(3, M)
+    y = fftfilt(b2, x, Nfft=256)
+
+    for i in range(len(x)):
+        np.testing.assert_allclose(
+            y[i], np.convolve(x[i], b2[i], mode='valid'), rtol=0, atol=1e-10)
+
+    return
+
+
+def test_fftfilt_inplace():
+    M = 51
+    N = 5000
+
+    b = np.random.randn(M)
+    x = np.random.randn(N)
+
+    yvalid = np.convolve(x, b, mode='valid')
+
+    # Filtered points are written over the leading portion of `x`
+    y = fftfilt(b, x, Nfft=256, out=x[:(N - M + 1)])
+
+    tools.assert_true(np.may_share_memory(y, x))
+    np.testing.assert_allclose(y, yvalid, rtol=0, atol=1e-10)
+
+    return
+
+
+def test_fftdecimate():
+    q = 5
+    L = 100
+    N = 10003
+
+    b = np.random.randn(L)
+    x = np.random.randn(2, N)
+
+    y = fftdecimate(b, x, q, Nfft=128)
+
+    tools.assert_equal(y.shape, (2, ((N - L) // q) + 1))
+
+    for i in range(2):
+        np.testing.assert_allclose(
+            y[i], np.convolve(x[i], b, mode='valid')[::q], rtol=0, atol=1e-10)
+
+    # Record shorter than filter has no retained points
+    tools.assert_equal(fftdecimate(b, x[0, :(L - 1)], q).shape, (0,))
+
+    # Filter length must be a multiple of decimation factor
+    tools.assert_raises(ValueError, fftdecimate, b[:-1], x, q)
+
+    return
@@ -0,0 +1,71 @@
+from nose import tools
+import numpy as np
+from bci import loadstats
+from bci.loadstats import LoadStats
+
+
+def test_LoadStats():
+    stats = LoadStats(1)
+
+    stats.add('allocate', 0.5, allocated=100)
+    stats.add('filter', 1.)
+    stats.add('filter', 2., allocated=10)
+
+    x = np.zeros(8)
+    stats.read('\PL1V2_UF_0', 'tree', 0, 9, x, 0.25)
+    stats.read('\PL1V2_UF_1', 'cache', 0, 7, x, 0.125)
+
+    tools.assert_equal(stats.stages.keys(), ['allocate', 'filter', 'read'])
+    tools.assert_equal(stats.stages['filter'], {
+        'calls': 2, 'time': 3., 'bytes': 0, 'allocated': 10})
+
+    # Cached windows are memory-mapped rather than allocated
+    tools.assert_equal(stats.stages['read'], {
+        'calls': 2, 'time': 0.375, 'bytes': 128, 'allocated': 64})
+    tools.assert_equal(stats.bytes, 128)
+
+    tools.assert_equal(len(stats.windows), 2)
+    tools.assert_equal(stats.windows[0]['node'], '\PL1V2_UF_0')
+    tools.assert_equal(stats.windows[0]['Npts'], 8)
+    tools.assert_equal(stats.windows[1]['source'], 'cache')
+
+    tools.assert_true(str(stats).startswith('Load of shot 1'))
+
+    return
+
+
+def test_stage():
+    # Disabled stages do nothing
+    with loadstats.stage(None, 'filter', allocated=10):
+        pass
+
+    stats = LoadStats(1)
+
+    with loadstats.stage(stats, 'filter', allocated=10):
+        pass
+
+    tools.assert_equal(stats.stages['filter']['calls'], 1)
+    tools.assert_equal(stats.stages['filter']['allocated'], 10)
+
+    return
+
+
+def test_enable():
+    got = []
+
+    try:
+        tools.assert_true(loadstats.start(1) is None)
+        tools.assert_true(loadstats.finish(None) is None)
+
+        loadstats.enable(callback=got.append)
+        stats = loadstats.start(1)
+        tools.assert_true(isinstance(stats, LoadStats))
+        tools.assert_true(loadstats.finish(stats) is stats)
+        tools.assert_equal(got, [stats])
+        tools.assert_true(stats.time >= 0)
+    finally:
+        loadstats.disable()
+
+    tools.assert_true(loadstats.start(1) is None)
+
+    return
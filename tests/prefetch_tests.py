@@ -0,0 +1,86 @@
+from nose import tools
+import functools
+import shutil
+import tempfile
+from bci.cache import WindowCache
+from bci.faketree import FakeTree
+from bci.prefetch import parse_shots, window_nodes, prefetch, main
+from bci.signal import set_tree_backend, _trigger_time, _Fs, _Npts_per_window
+
+
+def test_parse_shots():
+    tools.assert_equal(parse_shots(['5']), [5])
+    tools.assert_equal(parse_shots(['1-3', '7']), [1, 2, 3, 7])
+    tools.assert_equal(parse_shots(['1-3,2', '9,']), [1, 2, 3, 9])
+    tools.assert_raises(ValueError, parse_shots, ['3-1'])
+    tools.assert_raises(ValueError, parse_shots, ['V2'])
+
+    return
+
+
+def test_window_nodes():
+    # Within the first window
+    tlim = [_trigger_time, _trigger_time + 0.1]
+
+    tools.assert_equal(
+        window_nodes(['V2'], ['CO2', 'HeNe'], False, tlim),
+        ['\PL1V2_UF_0', '\PL2V2_UF_0'])
+    tools.assert_equal(
+        window_nodes(['V2'], ['CO2'], True, tlim), ['\DENV2_UF_0'])
+
+    # Raw phase of both beams is needed to compute the
+    # vibration-subtracted phase, but each is only retrieved once
+    tools.assert_equal(
+        window_nodes(['V2'], ['CO2', 'HeNe'], 'compute', tlim),
+        ['\PL1V2_UF_0', '\PL2V2_UF_0'])
+
+    # Spanning the first two windows
+    tlim = [_trigger_time, _trigger_time + (1.5 * _Npts_per_window / _Fs)]
+
+    tools.assert_equal(
+        window_nodes(['V1', 'V2'], ['CO2'], False, tlim),
+        ['\PL1V1_UF_0', '\PL1V1_UF_1', '\PL1V2_UF_0', '\PL1V2_UF_1'])
+
+    return
+
+
+def test_prefetch():
+    nodes = ['\PL1V2_UF_0', '\PL1V2_UF_1', '\PL1V2_UF_2']
+
+    # Only two windows exist
+    previous = set_tree_backend(
+        functools.partial(FakeTree, Npts_per_window=100, Nwindows=2))
+    tmpdir = tempfile.mkdtemp()
+
+    try:
+        cache = WindowCache(tmpdir)
+        cache.put(1, nodes[0], FakeTree(1, Npts_per_window=100).data(
+            nodes[0]))
+
+        summary = prefetch(cache, [1, 2], nodes, workers=2, verbose=False)
+
+        tools.assert_equal(summary['retrieved'], 3)
+        tools.assert_equal(summary['skipped'], 1)
+        tools.assert_equal(summary['missing'], 2)
+        tools.assert_equal(summary['failed'], 0)
+        tools.assert_equal(summary['bytes'], 3 * 100 * 8)
+
+        for shot in [1, 2]:
+            tools.assert_true(cache.has(shot, nodes[1]))
+            tools.assert_false(cache.has(shot, nodes[2]))
+
+        # Rerunning only attempts the missing windows
+        summary = prefetch(cache, [1, 2], nodes, verbose=False)
+        tools.assert_equal(summary['retrieved'], 0)
+        tools.assert_equal(summary['skipped'], 4)
+
+        # Command line
+        tools.assert_equal(
+            main([tmpdir, '1-2', '--chords', 'V2', '--beams', 'CO2',
+                  '--tlim', '-1.4', '-1.3']),
+            0)
+    finally:
+        set_tree_backend(previous)
+        shutil.rmtree(tmpdir)
+
+    return
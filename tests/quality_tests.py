@@ -0,0 +1,89 @@
+from nose import tools
+import numpy as np
+from bci.faketree import FakeTree
+from bci.quality import scan, scan_many, _Scanner
+from bci.signal import set_tree_backend, _trigger_time, _Fs, _Npts_per_window
+
+
+def test__Scanner():
+    x = np.zeros(100)
+    x[10:20] = 0.1 * np.arange(10)  # not flat
+    x[40:] += 2 * np.pi             # fringe jump
+    x[60:] += np.arange(40)         # not flat
+
+    # Flat-lined points are 0-10, 20-39, and 40-60;
+    # scan in blocks, w/ flat-lined segments across block boundaries
+    scanner = _Scanner(1000, np.pi, 15, 0.)
+
+    for block in np.split(x, [5, 30, 35, 41]):
+        scanner.update(block)
+
+    scanner.finish()
+
+    events = sorted(scanner.events, key=lambda event: event[1])
+
+    tools.assert_equal(
+        [event[:3] for event in events],
+        [('flat', 1020, 20), ('jump', 1040, 0), ('flat', 1040, 21)])
+    np.testing.assert_allclose(
+        [event[3] for event in events], [0, 1, 2 * np.pi])
+
+    # Tolerance on flat-lined points
+    scanner = _Scanner(0, np.pi, 50, 1.)
+    scanner.update(x)
+    scanner.finish()
+
+    tools.assert_equal(
+        [event[:3] for event in scanner.events],
+        [('jump', 40, 0), ('flat', 40, 60)])
+
+    return
+
+
+class JumpTree(FakeTree):
+    'Fake tree w/ a fringe jump in the V2 CO2 phase of window 1.'
+    def data(self, node, start=0, stop=None):
+        x = FakeTree.data(self, node, start, stop)
+
+        if node == '\PL1V2_UF_1':
+            n = 1000 - start
+
+            if n < len(x):
+                x[max(n, 0):] -= 4 * np.pi
+
+        return x
+
+
+def test_scan():
+    # Window 1 is short
+    tlim = [-1., 0.5]
+    g = _Npts_per_window + 1000
+
+    previous = set_tree_backend(
+        lambda shot: JumpTree(shot, short={1: 2000}))
+
+    try:
+        events = scan(1, chords=['V2'], tlim=tlim, workers=2)
+        events2, failures = scan_many(
+            [1, 2], chords=['V2'], beams=['CO2'], tlim=tlim)
+        tools.assert_raises(ValueError, scan, 1, chords=['V4'])
+    finally:
+        set_tree_backend(previous)
+
+    tools.assert_equal(len(events), 3)
+
+    tools.assert_equal(events.chord.tolist(), ['V2', 'V2', 'V2'])
+    tools.assert_equal(events.beam.tolist(), ['CO2', 'CO2', 'HeNe'])
+    tools.assert_equal(events.event.tolist(), ['jump', 'short', 'short'])
+    np.testing.assert_allclose(events.t[0], _trigger_time + (g / _Fs))
+    np.testing.assert_allclose(events.value[0], -2, atol=0.01)
+
+    # Short record ends after 2000 points of window 1
+    t = _trigger_time + ((_Npts_per_window + 2000) / _Fs)
+    np.testing.assert_allclose(events.t[1], t)
+    np.testing.assert_allclose(events.duration[1], 0.5 - t, atol=1e-6)
+
+    tools.assert_equal(events2.shot.tolist(), [1, 1, 2, 2])
+    tools.assert_equal(failures, {})
+
+    return
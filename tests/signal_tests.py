@@ -1,8 +1,24 @@
 from nose import tools
+import functools
+import os
+import shutil
+import tempfile
+import threading
 import numpy as np
+import filters
+from bci import loadstats
+from bci.faketree import FakeTree
+from bci.fftfilt import fftfilt
 from bci.signal import (
-    Phase, _plasma_induced_phase, _closest_digitized_point, _crop,
-    _windows, _trigger_time, _Fs, _Npts_per_window, _Nwindows, _Npts_total)
+    Phase, PhaseArray, load_shot, load_saved, load_many, load_async,
+    iter_blocks, set_tree_backend, _load_to_file, _plasma_induced_phase,
+    _closest_digitized_point, _crop, _windows, _window_bounds,
+    _global_bounds, _check_chord, _check_beam, _check_vibration_subtracted,
+    _check_decimate, _check_filter, _KaiserSpec, _hpf, _nodes, _scale_factor,
+    _filter_and_scale, _iter_filtered_blocks,
+    _initial_time, _valid_length, _boundary_points, _antialias_filter,
+    _decimated_bounds, _trigger_time, _Fs, _Npts_per_window, _Nwindows,
+    _Npts_total)
 
 
 def test__closest_digitized_point():
@@ -194,6 +210,957 @@ def test__windows():
     return
 
 
+def test__window_bounds():
+    # Full record
+    x = np.arange(_Nwindows * _Npts_per_window)
+
+    # Range of global indices spanning three windows
+    gstart = np.int(2.75 * _Npts_per_window)
+    gstop = np.int(4.25 * _Npts_per_window)
+
+    bounds = _window_bounds(gstart, gstop)
+
+    np.testing.assert_equal(
+        [b[0] for b in bounds],
+        np.array([2, 3, 4]))
+
+    # Assembling the record from the "local" bounds of each window
+    # should reproduce the desired portion of the global record
+    sig = np.zeros(gstop - gstart + 1, dtype=x.dtype)
+
+    for window, start, stop, offset in bounds:
+        wstart = window * _Npts_per_window
+        xwindow = x[wstart:(wstart + _Npts_per_window)]
+        sig[offset:(offset + stop - start + 1)] = xwindow[start:(stop + 1)]
+
+    np.testing.assert_equal(sig, x[gstart:(gstop + 1)])
+
+    # Bounds that *exactly* coincide with a single window
+    window = 3
+    gstart = window * _Npts_per_window
+    gstop = ((window + 1) * _Npts_per_window) - 1
+
+    tools.assert_equal(
+        _window_bounds(gstart, gstop),
+        [(window, 0, _Npts_per_window - 1, 0)])
+
+    return
+
+
+def test__check_chord():
+    tools.assert_equal(_check_chord('v2'), 'V2')
+    tools.assert_equal(_check_chord('R0'), 'R0')
+    tools.assert_raises(ValueError, _check_chord, 'V4')
+
+    return
+
+
+def test__check_beam():
+    tools.assert_equal(_check_beam('co2'), 'CO2')
+    tools.assert_equal(_check_beam('HENE'), 'HeNe')
+    tools.assert_raises(ValueError, _check_beam, 'Ar')
+
+    return
+
+
+def test__check_vibration_subtracted():
+    tools.assert_equal(_check_vibration_subtracted(1, 'CO2'), True)
+    tools.assert_equal(_check_vibration_subtracted(0, 'CO2'), False)
+    tools.assert_equal(
+        _check_vibration_subtracted('compute', 'CO2'), 'compute')
+
+    # Only CO2 data can be vibration subtracted
+    tools.assert_equal(_check_vibration_subtracted(True, 'HeNe'), False)
+    tools.assert_equal(_check_vibration_subtracted('compute', 'HeNe'), False)
+
+    tools.assert_raises(
+        ValueError, _check_vibration_subtracted, 'yes', 'CO2')
+
+    return
+
+
+def test__nodes():
+    windows = [3, 4]
+
+    tools.assert_equal(
+        _nodes('V2', 'CO2', False, windows),
+        ['\\PL1V2_UF_3', '\\PL1V2_UF_4'])
+
+    tools.assert_equal(
+        _nodes('V2', 'HeNe', False, windows),
+        ['\\PL2V2_UF_3', '\\PL2V2_UF_4'])
+
+    tools.assert_equal(
+        _nodes('R0', 'CO2', True, windows),
+        ['\\DENR0_UF_3', '\\DENR0_UF_4'])
+
+    # Only CO2 data can be vibration subtracted
+    tools.assert_equal(
+        _nodes('R0', 'HeNe', True, windows),
+        ['\\PL2R0_UF_3', '\\PL2R0_UF_4'])
+
+    # Raw CO2 and HeNe phase are retrieved together
+    tools.assert_equal(
+        _nodes('V1', 'CO2', 'compute', windows),
+        [('\\PL1V1_UF_3', '\\PL2V1_UF_3'),
+         ('\\PL1V1_UF_4', '\\PL2V1_UF_4')])
+
+    return
+
+
+def test__scale_factor():
+    # Double-pass to single-pass conversion
+    tools.assert_equal(_scale_factor('CO2', False), 0.5)
+    tools.assert_equal(_scale_factor('HeNe', False), 0.5)
+    tools.assert_equal(_scale_factor('HeNe', True), 0.5)
+    tools.assert_equal(_scale_factor('CO2', 'compute'), 0.5)
+
+    # Line-integrated density to single-pass phase conversion
+    np.testing.assert_allclose(
+        _scale_factor('CO2', True),
+        0.5 * 2.818e-15 * 10.6e-6 * (100 ** 3))
+
+    return
+
+
+def test__plasma_induced_phase():
+    lambda1 = 10.6e-6
+    lambda2 = 0.633e-6
+
+    # Vibrational path-length changes `L` cause phase `2 * pi * L / lambda`,
+    # and plasma causes phase proportional to `lambda`
+    L = np.linspace(0, 1e-5, 11)
+    plasma = np.linspace(1, 2, 11)
+    ph1 = (2 * np.pi * L / lambda1) + plasma
+    ph2 = (2 * np.pi * L / lambda2) + (plasma * lambda2 / lambda1)
+
+    np.testing.assert_allclose(
+        _plasma_induced_phase(ph1, ph2, lambda1=lambda1, lambda2=lambda2),
+        plasma)
+
+    # In blocks, including a partial final block
+    np.testing.assert_allclose(
+        _plasma_induced_phase(
+            ph1, ph2, lambda1=lambda1, lambda2=lambda2, block_len=3),
+        plasma)
+
+    # In place
+    _plasma_induced_phase(
+        ph1, ph2, lambda1=lambda1, lambda2=lambda2, out=ph1)
+    np.testing.assert_allclose(ph1, plasma)
+
+    return
+
+
+def test__filter_and_scale():
+    Fs = 200e3
+    filt = filters.fir.Kaiser(-60, 5e3, 10e3, pass_zero=False, Fs=Fs)
+
+    sig = np.random.randn(2, 10000)
+    factors = [0.5, 2.]
+
+    # Unfiltered
+    y = _filter_and_scale(sig.copy(), None, factors)
+    np.testing.assert_equal(y[0], 0.5 * sig[0])
+    np.testing.assert_equal(y[1], 2. * sig[1])
+
+    # Direct convolution
+    sig_copy = sig.copy()
+    ydirect = _filter_and_scale(sig_copy, filt, factors)
+
+    tools.assert_true(np.may_share_memory(ydirect, sig_copy))
+
+    for i in range(len(sig)):
+        np.testing.assert_allclose(
+            ydirect[i],
+            factors[i] * filt.applyTo(sig[i])[filt.getValidSlice()],
+            rtol=0, atol=1e-12)
+
+    # Direct convolution in blocks should match for any block length,
+    # including blocks shorter than the filter and a partial final block
+    for block_len in [10, 1000, 3333]:
+        sig_copy = sig.copy()
+        y = _filter_and_scale(sig_copy, filt, factors, block_len=block_len)
+
+        tools.assert_true(np.may_share_memory(y, sig_copy))
+        np.testing.assert_allclose(y, ydirect, rtol=0, atol=1e-12)
+
+    # FFT-based overlap-save should match direct convolution
+    # to floating-point precision for any valid block size
+    for Nfft in [len(filt.b), 1024, 2 ** 16]:
+        sig_copy = sig.copy()
+        y = _filter_and_scale(sig_copy, filt, factors, Nfft=Nfft)
+
+        tools.assert_true(np.may_share_memory(y, sig_copy))
+        np.testing.assert_allclose(y, ydirect, rtol=0, atol=1e-10)
+
+    return
+
+
+def test__filter_and_scale_float32():
+    Fs = 200e3
+    filt = filters.fir.Kaiser(-60, 5e3, 10e3, pass_zero=False, Fs=Fs)
+
+    # Raw phase with a large offset and slow drift
+    # superposed on small fluctuations
+    t = np.arange(100000) / Fs
+    sig = (100 + (10 * np.sin(2 * np.pi * 10 * t))
+           + (1e-3 * np.random.randn(len(t))))
+    sig = sig[np.newaxis, :]
+
+    # Single-precision processing should be accurate to roughly
+    # 1e-7 times the magnitude of the raw phase
+    atol = 2e-7 * np.max(np.abs(sig))
+
+    for Nfft in [None, 1024]:
+        y64 = _filter_and_scale(sig.copy(), filt, [0.5], Nfft=Nfft)
+        y32 = _filter_and_scale(
+            sig.astype('float32'), filt, [0.5], Nfft=Nfft)
+
+        tools.assert_equal(y32.dtype, np.float32)
+        np.testing.assert_allclose(y32, y64, rtol=0, atol=atol)
+
+    return
+
+
+def test__iter_filtered_blocks():
+    M = 51
+    b = np.random.randn(M)
+    x = np.random.randn(10000)
+
+    # Split record into unevenly sized chunks,
+    # including chunks shorter than the filter
+    edges = [0, 20, 30, 2000, 2001, 5000, 10000]
+    chunks = [x[edges[i]:edges[i + 1]] for i in range(len(edges) - 1)]
+
+    start = 10
+    stop = 9900
+    y = fftfilt(b, x)[start:stop]
+
+    block_len = 1000
+
+    for overlap in [0, 250]:
+        blocks = list(_iter_filtered_blocks(
+            iter(chunks), b, block_len, overlap=overlap,
+            start=start, stop=stop))
+
+        # All but the final block are full length
+        for offset, block in blocks[:-1]:
+            tools.assert_equal(len(block), block_len)
+
+        # Each block matches the corresponding portion
+        # of the record filtered in its entirety
+        for offset, block in blocks:
+            np.testing.assert_allclose(
+                block, y[offset:(offset + len(block))], rtol=0, atol=1e-10)
+
+        # The blocks collectively span the full filtered record
+        offset, block = blocks[-1]
+        tools.assert_equal(offset + len(block), len(y))
+
+        np.testing.assert_equal(
+            [offset for offset, block in blocks],
+            np.arange(len(blocks)) * (block_len - overlap))
+
+    # Unfiltered record
+    blocks = list(_iter_filtered_blocks(iter(chunks), None, block_len))
+
+    np.testing.assert_equal(
+        np.concatenate([block for offset, block in blocks]), x)
+
+    return
+
+
+def test_iter_blocks():
+    t = _trigger_time + (_Npts_per_window / _Fs)
+    tlim = [t - 2e-3, t + 2e-3]
+    filt = filters.fir.Kaiser(-60, 50e3, 100e3, pass_zero=False, Fs=_Fs)
+
+    previous = set_tree_backend(FakeTree)
+
+    try:
+        ph = Phase(1, filt=filt, tlim=tlim)
+
+        # Blocks span the boundary between windows 0 and 1
+        blocks = list(iter_blocks(1, filt=filt, tlim=tlim, block_len=1000))
+        overlapping = list(iter_blocks(
+            1, filt=filt, tlim=tlim, block_len=1000, overlap=200))
+    finally:
+        set_tree_backend(previous)
+
+    np.testing.assert_allclose(
+        np.concatenate([x for t0, x in blocks]), ph.x, rtol=0, atol=1e-10)
+
+    for k, (t0, x) in enumerate(blocks):
+        np.testing.assert_allclose(t0, ph.t0 + (k * 1000 / _Fs))
+
+    for k, (t0, x) in enumerate(overlapping):
+        np.testing.assert_allclose(
+            x, ph.x[(k * 800):((k * 800) + 1000)], rtol=0, atol=1e-10)
+
+    tools.assert_equal(
+        (len(overlapping) - 1) * 800 + len(overlapping[-1][1]), ph.Npts)
+
+    return
+
+
+def test__initial_time():
+    gstart = 1000
+
+    # Unfiltered
+    tools.assert_equal(
+        _initial_time(gstart, None),
+        _trigger_time + (gstart / _Fs))
+
+    # Filtered: points contaminated by boundary effects are removed
+    filt = filters.fir.Kaiser(-60, 50e3, 100e3, pass_zero=False, Fs=_Fs)
+
+    np.testing.assert_allclose(
+        _initial_time(gstart, filt),
+        _trigger_time + ((gstart + filt.getValidSlice().start) / _Fs),
+        rtol=0, atol=(0.01 / _Fs))
+
+    return
+
+
+def test__valid_length():
+    N = 10000
+
+    tools.assert_equal(_valid_length(None, N), N)
+
+    filt = filters.fir.Kaiser(-60, 50e3, 100e3, pass_zero=False, Fs=_Fs)
+
+    tools.assert_equal(
+        _valid_length(filt, N),
+        len(filt.applyTo(np.zeros(N))[filt.getValidSlice()]))
+
+    return
+
+
+def test_Phase_getSignal():
+    # Span the boundary between windows 0 and 1,
+    # where window 1 is shorter than nominal
+    short = {1: 1000}
+    t = _trigger_time + (_Npts_per_window / _Fs)
+    tlim = [t - 1e-3, t + 1e-3]
+
+    previous = set_tree_backend(functools.partial(FakeTree, short=short))
+
+    try:
+        ph = Phase(1, filt=None, tlim=tlim)
+        ph2 = Phase(1, filt=None, tlim=tlim, workers=2)
+    finally:
+        set_tree_backend(previous)
+
+    # Global index of first point
+    g0 = int(np.round((ph.t0 - _trigger_time) * _Fs))
+
+    tree = FakeTree(1, short=short)
+    raw = np.concatenate((
+        tree.data('\PL1V2_UF_0', g0, _Npts_per_window - 1),
+        tree.data('\PL1V2_UF_1')))
+
+    # Points following the end of the short window are zero
+    xexp = np.zeros(len(ph.x))
+    xexp[:len(raw)] = _scale_factor('CO2', False) * raw
+
+    np.testing.assert_allclose(ph.x, xexp)
+    np.testing.assert_equal(ph2.x, ph.x)
+
+    # Raw points following the end of the short window are missing
+    gstart, gstop = _global_bounds(tlim)
+    tools.assert_equal(
+        ph.Npts_missing, gstop + 1 - (_Npts_per_window + 1000))
+    tools.assert_equal(ph2.Npts_missing, ph.Npts_missing)
+
+    return
+
+
+class _ThreadFakeTree(FakeTree):
+    'A `FakeTree` that records the threads making its requests.'
+    def __init__(self, *args, **kwargs):
+        FakeTree.__init__(self, *args, **kwargs)
+        self.threads = set()
+
+    def _request(self, node, start, stop):
+        self.threads.add(threading.current_thread().ident)
+        return FakeTree._request(self, node, start, stop)
+
+
+def test_Phase_workers():
+    # Span windows 0 through 2
+    t = _trigger_time + (_Npts_per_window / _Fs)
+    tlim = [t - 1e-3, t + (_Npts_per_window / _Fs) + 1e-3]
+
+    trees = []
+
+    def backend(shot):
+        trees.append(_ThreadFakeTree(shot, latency=0.01))
+        return trees[-1]
+
+    previous = set_tree_backend(backend)
+
+    try:
+        ph = Phase(1, filt=None, tlim=tlim)
+        tools.assert_equal(len(trees), 1)
+
+        del trees[:]
+        ph4 = Phase(1, filt=None, tlim=tlim, workers=4)
+    finally:
+        set_tree_backend(previous)
+
+    np.testing.assert_equal(ph4.x, ph.x)
+    np.testing.assert_equal(ph4.windows, [0, 1, 2])
+
+    # Windows were read concurrently, and each thread
+    # only made requests through its own connection
+    tools.assert_true(len(trees) > 1)
+
+    threads = [tree.threads for tree in trees]
+    tools.assert_true(all([len(th) == 1 for th in threads]))
+    tools.assert_equal(len(set.union(*threads)), len(trees))
+
+    return
+
+
+def test_Phase_load_stats():
+    t = _trigger_time + (_Npts_per_window / _Fs)
+    tlim = [t - 1e-3, t + 1e-3]
+
+    previous = set_tree_backend(FakeTree)
+    got = []
+
+    try:
+        ph = Phase(1, filt=None, tlim=tlim)
+        tools.assert_true(ph.load_stats is None)
+
+        loadstats.enable(callback=got.append)
+        ph = Phase(1, tlim=tlim, Nfft=2 ** 15)
+    finally:
+        loadstats.disable()
+        set_tree_backend(previous)
+
+    stats = ph.load_stats
+    tools.assert_equal(got, [stats])
+    tools.assert_equal(stats.shot, 1)
+
+    for stage in ['allocate', 'open', 'read', 'copy', 'filter']:
+        tools.assert_true(stage in stats.stages)
+
+    # Both windows were read, w/ 8-byte points
+    tools.assert_equal(
+        [w['node'] for w in stats.windows], ['\PL1V2_UF_0', '\PL1V2_UF_1'])
+    tools.assert_equal(
+        stats.bytes, 8 * sum([w['Npts'] for w in stats.windows]))
+
+    return
+
+
+def test_PhaseArray():
+    t = _trigger_time + (_Npts_per_window / _Fs)
+    tlim = [t - 1e-3, t + 1e-3]
+    filt = filters.fir.Kaiser(-60, 50e3, 100e3, pass_zero=False, Fs=_Fs)
+
+    chords = ['R0', 'V1']
+    beams = ['HeNe', 'CO2']
+
+    previous = set_tree_backend(FakeTree)
+
+    try:
+        pa = PhaseArray(1, chords=chords, beams=beams, filt=filt, tlim=tlim,
+                        vibration_subtracted='compute')
+        pa2 = load_shot(1, chords=chords, beams=beams, filt=filt, tlim=tlim,
+                        vibration_subtracted='compute')
+
+        phases = [
+            Phase(1, chord=chord, beam=beam, filt=filt, tlim=tlim,
+                  vibration_subtracted='compute')
+            for chord in chords for beam in beams]
+    finally:
+        set_tree_backend(previous)
+
+    # Channels are ordered by chord, then by beam
+    tools.assert_equal(pa.chords, ['R0', 'R0', 'V1', 'V1'])
+    tools.assert_equal(pa.beams, ['HeNe', 'CO2', 'HeNe', 'CO2'])
+    tools.assert_equal(
+        pa.vibration_subtracted, [False, 'compute', False, 'compute'])
+    tools.assert_equal(pa.x.shape, (4, phases[0].Npts))
+
+    # Each channel matches the corresponding single-channel retrieval
+    for i, ph in enumerate(phases):
+        tools.assert_equal(pa.t0, ph.t0)
+        np.testing.assert_allclose(pa.x[i], ph.x, rtol=0, atol=1e-12)
+
+    np.testing.assert_equal(pa2.x, pa.x)
+
+    return
+
+
+def test_Phase_save():
+    tlim = [1., 1.01]
+    filt = filters.fir.Kaiser(-60, 50e3, 100e3, pass_zero=False, Fs=_Fs)
+
+    ph = Phase(1, filt=filt, tlim=tlim, vibration_subtracted='compute',
+               lazy=True)
+    ph.x = np.random.randn(ph.Npts)
+
+    tmpdir = tempfile.mkdtemp()
+
+    try:
+        for compress in [False, True]:
+            path = os.path.join(tmpdir, str(compress))
+            ph.save(path, chunk_len=1000, compress=compress)
+
+            # Full signal and parameters
+            ph2 = load_saved(path)
+            np.testing.assert_equal(ph2.x, ph.x)
+            tools.assert_equal(ph2.t0, ph.t0)
+            tools.assert_equal(ph2.Fs, ph.Fs)
+            tools.assert_equal(ph2.chord, ph.chord)
+            tools.assert_equal(ph2.vibration_subtracted, 'compute')
+            np.testing.assert_equal(ph2.filt.b, ph.filt.b)
+
+            # Portion of signal, which spans several chunks
+            t1, t2 = 1.002, 1.007
+            ph3 = load_saved(path, tlim=[t1, t2])
+            ph4 = ph.between(t1, t2)
+            np.testing.assert_equal(ph3.x, ph4.x)
+            tools.assert_equal(ph3.t0, ph4.t0)
+            np.testing.assert_equal(ph3.windows, ph4.windows)
+
+            tools.assert_raises(ValueError, load_saved, path, [5., 6.])
+
+        # Saving again replaces previous chunks
+        ph.save(path, chunk_len=ph.Npts)
+        tools.assert_equal(len(os.listdir(path)), 2)
+        np.testing.assert_equal(load_saved(path).x, ph.x)
+    finally:
+        shutil.rmtree(tmpdir)
+
+    return
+
+
+def test_Phase_between():
+    # Lazy `Phase` with a synthetic (rather than retrieved) signal
+    ph = Phase(0, tlim=[0, 0.01], filt=None, lazy=True)
+    ph.x = np.arange(ph.Npts, dtype='float')
+
+    t = np.asarray(ph.t())
+
+    # Bracketing times that do *not* correspond to digitization times
+    t1 = t[100] - (0.5 / _Fs)
+    t2 = t[200] + (0.5 / _Fs)
+
+    sub = ph.between(t1, t2)
+
+    tools.assert_true(np.may_share_memory(sub.x, ph.x))
+    np.testing.assert_equal(sub.x, ph.x[100:201])
+    tools.assert_equal(sub.t0, t[100])
+    np.testing.assert_allclose(
+        np.asarray(sub.t()), t[100:201], rtol=0, atol=(1e-3 / _Fs))
+
+    # Times that *exactly* correspond to digitization times
+    sub = ph.between(t[100], t[200])
+    np.testing.assert_equal(sub.x, ph.x[100:201])
+
+    # Limits are sorted, and limits beyond the record are clipped
+    sub = ph.between(t[-1] + 1, t[10])
+    np.testing.assert_equal(sub.x, ph.x[10:])
+
+    # The parent is unaffected
+    tools.assert_equal(ph.t0, t[0])
+    tools.assert_equal(len(ph.x), len(t))
+    tools.assert_equal(ph._retrieval['tlim'], [0, 0.01])
+
+    tools.assert_raises(ValueError, ph.between, t1, t1)
+
+    # The slice has its own span and matches a freshly
+    # created `Phase` spanning the same points, including
+    # the raw points contaminated by the filter
+    filt = filters.fir.Kaiser(-60, 50e3, 100e3, pass_zero=False, Fs=_Fs)
+    tw = _trigger_time + (_Npts_per_window / _Fs)
+
+    ph = Phase(0, tlim=[tw - 0.1, tw + 0.1], filt=filt, lazy=True)
+    ph.x = np.zeros(ph.Npts)
+
+    sub = ph.between(tw - 1e-3, tw + 1e-3)
+    head, tail = _boundary_points(filt)
+
+    ref = Phase(0, tlim=[sub.t()[0] - (head / _Fs),
+                         sub.t()[-1] + (tail / _Fs)],
+                filt=filt, lazy=True)
+
+    np.testing.assert_allclose(
+        sub._retrieval['tlim'], [sub.t()[0], sub.t()[-1]],
+        rtol=0, atol=(1e-3 / _Fs))
+    np.testing.assert_allclose(sub.t0, ref.t0, rtol=0, atol=(1e-3 / _Fs))
+    tools.assert_equal(sub.Npts, ref.Npts)
+    np.testing.assert_equal(sub.windows, ref.windows)
+    np.testing.assert_equal(sub.windows, [0, 1])
+
+    # Windows only include the raw points needed for the slice
+    sub = ph.between(tw - 0.05, tw - 1e-3)
+    np.testing.assert_equal(sub.windows, [0])
+
+    return
+
+
+def test__load_to_file():
+    # Invalid chord is reported rather than raised
+    t0, Npts_missing, error = _load_to_file(
+        (0, {'chord': 'V4'}, 'unused.npy'))
+
+    tools.assert_is_none(t0)
+    tools.assert_is_none(Npts_missing)
+    tools.assert_true(error.startswith('ValueError'))
+
+    return
+
+
+def test_load_many():
+    # Failures are reported per shot, in order, without aborting the batch
+    for workers in [1, 2]:
+        phases, failures = load_many([1, 2, 3], chord='V4', workers=workers)
+
+        tools.assert_equal(phases, [None, None, None])
+        tools.assert_equal(sorted(failures.keys()), [1, 2, 3])
+
+    # Successful loads by worker processes are returned in order
+    # of `shots` and are memory-mapped from the workers' files
+    shots = [3, 1, 2]
+    tlim = [1., 1.01]
+    filt = filters.fir.Kaiser(-60, 50e3, 100e3, pass_zero=False, Fs=_Fs)
+
+    previous = set_tree_backend(FakeTree)
+
+    try:
+        phases, failures = load_many(shots, filt=filt, tlim=tlim, workers=2)
+        refs = [Phase(shot, filt=filt, tlim=tlim) for shot in shots]
+    finally:
+        set_tree_backend(previous)
+
+    tools.assert_equal(failures, {})
+    tools.assert_equal([ph.shot for ph in phases], shots)
+
+    for ph, ref in zip(phases, refs):
+        tools.assert_is_instance(ph.x, np.memmap)
+        tools.assert_equal(ph.t0, ref.t0)
+        np.testing.assert_equal(ph.x, ref.x)
+
+    # Records that are shorter than nominal are returned *and* reported,
+    # along with the number of missing raw points
+    t = _trigger_time + (_Npts_per_window / _Fs)
+    tlim = [t - 1e-3, t + 2e-3]
+    gstart, gstop = _global_bounds(tlim)
+    Npts_missing = gstop + 1 - (_Npts_per_window + 1000)
+
+    previous = set_tree_backend(functools.partial(FakeTree, short={1: 1000}))
+
+    try:
+        for workers in [1, 2]:
+            phases, failures = load_many(
+                [1, 2], filt=filt, tlim=tlim, workers=workers)
+
+            tools.assert_equal(sorted(failures.keys()), [1, 2])
+
+            for ph in phases:
+                tools.assert_equal(ph.Npts_missing, Npts_missing)
+                tools.assert_true(failures[ph.shot].startswith('ShortRecord'))
+                tools.assert_true(str(Npts_missing) in failures[ph.shot])
+    finally:
+        set_tree_backend(previous)
+
+    return
+
+
+def test_load_async():
+    results = []
+    errors = []
+
+    # Lazy `Phase` does not require any I/O
+    result = load_async(
+        0, callback=results.append, error_callback=errors.append,
+        tlim=[0, 0.01], filt=None, lazy=True)
+
+    ph = result.get()
+    tools.assert_equal(results, [ph])
+    tools.assert_equal(errors, [])
+    tools.assert_equal(ph.Npts, Phase(0, tlim=[0, 0.01], filt=None,
+                                      lazy=True).Npts)
+
+    # Exceptions are passed to `error_callback` and raised by `get`
+    result = load_async(
+        0, callback=results.append, error_callback=errors.append,
+        chord='V4', lazy=True)
+
+    tools.assert_raises(ValueError, result.get)
+    tools.assert_equal(len(results), 1)
+    tools.assert_true(isinstance(errors[0], ValueError))
+
+    return
+
+
+def test_Phase_envelope():
+    # Lazy `Phase` with a synthetic (rather than retrieved) signal
+    ph = Phase(0, tlim=[0, 0.01], filt=None, lazy=True)
+    ph.x = np.random.randn(ph.Npts)
+
+    t, xmin, xmax, xmean = ph.envelope(npixels=100)
+
+    tools.assert_true(len(t) >= 100)
+    tools.assert_equal(xmin.min(), ph.x.min())
+    tools.assert_equal(xmax.max(), ph.x.max())
+    tools.assert_true(np.all(xmin <= xmean))
+    tools.assert_true(np.all(xmean <= xmax))
+
+    # Envelope is recomputed when the signal changes
+    ph.x = 2 * ph.x
+    tools.assert_equal(ph.envelope(npixels=100)[2].max(), ph.x.max())
+
+    return
+
+
+def test__boundary_points():
+    N = 10000
+
+    tools.assert_equal(_boundary_points(None), (0, 0))
+
+    filt = filters.fir.Kaiser(-60, 50e3, 100e3, pass_zero=False, Fs=_Fs)
+    head, tail = _boundary_points(filt)
+
+    tools.assert_equal(_valid_length(filt, N), N - head - tail)
+    tools.assert_equal(_initial_time(0, filt), _trigger_time + (head / _Fs))
+
+    return
+
+
+def test__check_filter():
+    # No filter
+    tools.assert_true(_check_filter(None, _Fs) is None)
+
+    # Default filter is designed on first use and then reused
+    hpf = _check_filter(_hpf, _Fs)
+    tools.assert_true(isinstance(hpf, filters.fir.Kaiser))
+    tools.assert_equal(hpf.Fs, _Fs)
+    tools.assert_true(_check_filter(_hpf, _Fs) is hpf)
+
+    # Filter designed for sample rate of interest is used as is
+    filt = filters.fir.Kaiser(-60, 5e3, 10e3, pass_zero=False, Fs=_Fs)
+    tools.assert_true(_check_filter(filt, _Fs) is filt)
+
+    # Filter designed for another sample rate is redesigned once
+    # and is shared with an identically specified `_KaiserSpec`
+    filt = filters.fir.Kaiser(-60, 5e3, 10e3, pass_zero=False, Fs=1e6)
+    filt2 = _check_filter(filt, _Fs)
+    tools.assert_equal(filt2.Fs, _Fs)
+    tools.assert_equal(filt2.ripple, -60)
+    tools.assert_true(_check_filter(filt, _Fs) is filt2)
+    tools.assert_true(_check_filter(
+        _KaiserSpec(-60, 5e3, 10e3, False, 1e6), _Fs) is filt2)
+
+    tools.assert_raises(ValueError, _check_filter, 'hpf', _Fs)
+
+    return
+
+
+def test__check_decimate():
+    tools.assert_equal(_check_decimate(1), 1)
+    tools.assert_equal(_check_decimate(4.), 4)
+    tools.assert_raises(ValueError, _check_decimate, 0)
+    tools.assert_raises(ValueError, _check_decimate, 2.5)
+
+    return
+
+
+def test__antialias_filter():
+    q = 8
+    b, delay = _antialias_filter(q)
+
+    # Padded to an integer multiple of the decimation factor
+    tools.assert_equal(len(b) % q, 0)
+
+    # Unity gain at DC and strong attenuation beyond decimated Nyquist
+    H = np.abs(np.fft.rfft(b, 2 ** 16))
+    f = np.fft.rfftfreq(2 ** 16, d=(1. / _Fs))
+    np.testing.assert_allclose(H[0], 1, rtol=1e-3)
+    tools.assert_true(np.all(H[f >= (0.5 * _Fs / q)] < 1e-5))
+
+    # The filter is designed once, and is shared with other
+    # filters of the same parameters via `_check_filter`
+    fNyquist = 0.5 * _Fs / q
+    spec = _KaiserSpec(-120, 0.2 * fNyquist, 0.9 * fNyquist, True, _Fs)
+    lpf = _check_filter(spec, _Fs)
+
+    tools.assert_true(_check_filter(spec, _Fs) is lpf)
+    np.testing.assert_equal(b[:len(lpf.b)], lpf.b)
+    np.testing.assert_equal(b[len(lpf.b):], 0)
+
+    return
+
+
+def test__decimated_bounds():
+    # No decimation
+    tools.assert_equal(_decimated_bounds(10, 100, 1), (10, 91))
+
+    q = 8
+    head, tail = _boundary_points(None, q)
+    gstart = 1001
+    gstop = 100001
+
+    first, N = _decimated_bounds(gstart, gstop, q)
+    last = first + (q * (N - 1))
+
+    # Retained points lie on the decimated grid and are not
+    # contaminated by the anti-aliasing filter's boundary effects
+    tools.assert_equal(first % q, 0)
+    tools.assert_true((first - head) >= gstart)
+    tools.assert_true((first - head - q) < gstart)
+    tools.assert_true((last + tail) <= gstop)
+    tools.assert_true((last + tail + q) > gstop)
+
+    tools.assert_raises(ValueError, _decimated_bounds, 0, head + tail - 1, q)
+
+    # Highpass filtering after decimation removes additional points
+    filt = filters.fir.Kaiser(-60, 5e3, 10e3, pass_zero=False, Fs=(_Fs / q))
+    head_filt, tail_filt = _boundary_points(filt, q)
+    hp_head, hp_tail = _boundary_points(filt)
+
+    tools.assert_equal(head_filt, head + (q * hp_head))
+    tools.assert_equal(tail_filt, tail + (q * hp_tail))
+    tools.assert_equal(
+        _initial_time(first, filt, q),
+        _trigger_time + (first / _Fs) + (q * hp_head / _Fs))
+
+    return
+
+
+def test_Phase_decimate():
+    q = 8
+    tlim = [1.0, 1.1]
+
+    ph = Phase(0, tlim=tlim, decimate=q, lazy=True)
+    ref = Phase(0, tlim=tlim, lazy=True)
+
+    tools.assert_equal(ph.Fs, _Fs / q)
+    tools.assert_equal(ph.filt.Fs, _Fs / q)
+
+    # Roughly `q` times fewer points spanning the same times
+    tools.assert_true(abs(ph.Npts - (ref.Npts / q)) < 0.01 * ph.Npts)
+    tools.assert_true(abs(ph.t0 - ref.t0) < (0.01 * (tlim[1] - tlim[0])))
+
+    # Points lie on the decimated grid
+    g0 = (ph.t0 - _trigger_time) * _Fs
+    tools.assert_equal(np.round(g0) % q, 0)
+
+    return
+
+
+def test_Phase_decimate_retrieved():
+    q = 8
+    t = _trigger_time + (_Npts_per_window / _Fs)
+    tlim = [t - 2e-3, t + 2e-3]
+
+    b, delay = _antialias_filter(q)
+    M = (2 * delay) + 1
+
+    # Span the boundary between windows 0 and 1, with and without
+    # window 1 being shorter than nominal
+    for short in [{}, {1: 1000}]:
+        previous = set_tree_backend(functools.partial(FakeTree, short=short))
+
+        try:
+            phases = [
+                Phase(1, filt=None, tlim=tlim, decimate=q, workers=workers)
+                for workers in [1, 2]]
+        finally:
+            set_tree_backend(previous)
+
+        # Raw record, where points following a short window are zero
+        tree = FakeTree(1, short=short)
+        raw = np.zeros(2 * _Npts_per_window)
+
+        for window in range(2):
+            x = tree.data('\PL1V2_UF_%i' % window)
+            start = window * _Npts_per_window
+            raw[start:(start + len(x))] = x
+
+        # Anti-aliased raw record at global indices that are multiples of `q`
+        g0 = int(np.round((phases[0].t0 - _trigger_time) * _Fs))
+        tools.assert_equal(g0 % q, 0)
+
+        xexp = _scale_factor('CO2', False) * np.array([
+            np.dot(b[:M][::-1], raw[(g - delay):(g + delay + 1)])
+            for g in (g0 + (q * np.arange(phases[0].Npts)))])
+
+        # Raw points following the end of a short window are missing
+        if short:
+            gstop = g0 + (q * (phases[0].Npts - 1)) + _boundary_points(
+                None, q)[1]
+            Npts_missing = gstop + 1 - (_Npts_per_window + 1000)
+        else:
+            Npts_missing = 0
+
+        for ph in phases:
+            np.testing.assert_allclose(ph.x, xexp, rtol=0, atol=1e-10)
+            tools.assert_equal(ph.Npts_missing, Npts_missing)
+
+    return
+
+
+def test_Phase_extend():
+    filt = filters.fir.Kaiser(-60, 50e3, 100e3, pass_zero=False, Fs=_Fs)
+
+    # Extending an unretrieved signal only updates its metadata
+    ph = Phase(0, tlim=[1.0, 1.1], filt=filt, lazy=True)
+    ph.extend([0.9, 1.05])
+    ph.extend([1.0, 1.2])
+
+    ref = Phase(0, tlim=[0.9, 1.2], filt=filt, lazy=True)
+
+    tools.assert_equal(ph.t0, ref.t0)
+    tools.assert_equal(ph.Npts, ref.Npts)
+    np.testing.assert_equal(ph.windows, ref.windows)
+    tools.assert_equal(ph._retrieval['tlim'], [0.9, 1.2])
+
+    # Nothing is retrieved if the signal already spans `tlim`
+    ph = Phase(0, tlim=[0, 0.01], filt=None, lazy=True)
+    ph.x = np.arange(ph.Npts, dtype='float')
+    x = ph.x
+    ph.extend([0.002, 0.008])
+    tools.assert_true(ph.x is x)
+
+    return
+
+
+def test_Phase_extend_retrieved():
+    # Extended signal spans the boundary between windows 0 and 1
+    t = _trigger_time + (_Npts_per_window / _Fs)
+    tlim = [t - 3e-3, t + 4e-3]
+
+    previous = set_tree_backend(FakeTree)
+
+    try:
+        for q in [1, 4]:
+            filt = filters.fir.Kaiser(
+                -60, 50e3, 100e3, pass_zero=False, Fs=(_Fs / q))
+
+            ph = Phase(1, filt=filt, tlim=[t - 1e-3, t + 1e-3], decimate=q)
+
+            # Extend on both sides at once, then on one side
+            ph.extend([t - 3e-3, t + 2e-3])
+            ph.extend([t, t + 4e-3])
+
+            ref = Phase(1, filt=filt, tlim=tlim, decimate=q)
+
+            tools.assert_equal(ph.t0, ref.t0)
+            tools.assert_equal(ph.Npts, ref.Npts)
+            np.testing.assert_equal(ph.windows, ref.windows)
+            np.testing.assert_allclose(ph.x, ref.x, rtol=0, atol=1e-10)
+    finally:
+        set_tree_backend(previous)
+
+    return
+
 # # There are some discrepancies between the manually computed
 # # vibration-subtracted CO2 phase (`ph_CO2_plasma`) and
 # # the automatically computed vibration-subtracted CO2 phase
@@ -0,0 +1,197 @@
+from nose import tools
+import glob
+import os
+import shutil
+import tempfile
+import numpy as np
+from scipy import signal as sig
+from bci.cache import WindowCache
+from bci.faketree import FakeTree
+from bci.signal import Phase, set_tree_backend
+from bci.spectra import (
+    SpectralDensity, CrossSpectralDensity, _realization_length,
+    _ensemble_ffts, _averaged_spectra)
+
+
+def test__realization_length():
+    # Realizations overlapping by 50% span the ensemble
+    tools.assert_equal(_realization_length(1100, 10), 200)
+    tools.assert_equal(_realization_length(1000, 1), 1000)
+
+    for Npts_per_ens, Nreal_per_ens in [(1000, 10), (8333, 7), (50, 3)]:
+        L = _realization_length(Npts_per_ens, Nreal_per_ens)
+        tools.assert_true(
+            ((Nreal_per_ens - 1) * (L // 2)) + L <= Npts_per_ens)
+
+    return
+
+
+def test__ensemble_ffts():
+    Nch = 2
+    Nens = 3
+    Npts_per_ens = 110
+    Nreal_per_ens = 4
+    L = _realization_length(Npts_per_ens, Nreal_per_ens)
+    window = np.hanning(L)
+
+    x = np.random.randn(Nch, Nens * Npts_per_ens)
+    x0 = x.copy()
+
+    X = _ensemble_ffts(x, Npts_per_ens, L, Nreal_per_ens, window)
+
+    tools.assert_equal(X.shape, (Nch, Nens, Nreal_per_ens, (L // 2) + 1))
+
+    # Compare to each realization, detrended and windowed individually
+    for i in range(Nch):
+        for e in range(Nens):
+            for r in range(Nreal_per_ens):
+                start = (e * Npts_per_ens) + (r * (L // 2))
+                xr = x[i, start:(start + L)]
+
+                np.testing.assert_allclose(
+                    X[i, e, r], np.fft.rfft((xr - xr.mean()) * window),
+                    rtol=0, atol=1e-12)
+
+    # `x` is not modified
+    np.testing.assert_equal(x, x0)
+
+    return
+
+
+def test_SpectralDensity():
+    tlim = [1., 1.02]
+    chords = ['V1', 'V2']
+    kwargs = {'chords': chords, 'filt': None, 'tlim': tlim, 'Tens': 2e-3,
+              'Nreal_per_ens': 5, 'cross': True}
+
+    trees = []
+
+    def backend(shot):
+        trees.append(FakeTree(shot))
+        return trees[-1]
+
+    previous = set_tree_backend(backend)
+    tmpdir = tempfile.mkdtemp()
+
+    try:
+        cache = WindowCache(tmpdir)
+        sd = SpectralDensity(1, cache=cache, **kwargs)
+        phases = [Phase(1, chord=chord, filt=None, tlim=tlim)
+                  for chord in chords]
+
+        # Remove the cached windows, such that only the cached
+        # spectral densities are available to a second instance
+        for fname in glob.glob(os.path.join(tmpdir, '1', 'PL*.npy')):
+            os.remove(fname)
+
+        Ntrees = len(trees)
+        sd2 = SpectralDensity(1, cache=cache, **kwargs)
+    finally:
+        set_tree_backend(previous)
+        shutil.rmtree(tmpdir)
+
+    # Second instance is served from the cache without opening the tree
+    tools.assert_equal(len(trees), Ntrees)
+    np.testing.assert_equal(sd2.Gxx, sd.Gxx)
+    np.testing.assert_equal(sd2.Gxy, sd.Gxy)
+
+    # Each ensemble matches Welch's method applied to
+    # the ensemble's portion of the retrieved phase
+    Npts_per_ens = int(np.round(2e-3 * sd.Fs))
+    L = _realization_length(Npts_per_ens, 5)
+    welch = {'fs': sd.Fs, 'window': np.hanning(L), 'nperseg': L,
+             'noverlap': (L - (L // 2)), 'detrend': 'constant'}
+
+    tools.assert_equal(sd.Gxx.shape, (2, len(sd.f), len(sd.t)))
+    tools.assert_equal(sd.pairs, [(0, 1)])
+
+    for e in range(len(sd.t)):
+        start = e * Npts_per_ens
+        stop = start + (4 * (L // 2)) + L
+        x = [ph.x[start:stop] for ph in phases]
+
+        for i in range(len(chords)):
+            f, Pxx = sig.welch(x[i], **welch)
+            np.testing.assert_allclose(f, sd.f)
+            np.testing.assert_allclose(
+                sd.Gxx[i, :, e], Pxx, rtol=0, atol=(1e-10 * Pxx.max()))
+
+        f, Pxy = sig.csd(x[0], x[1], **welch)
+        np.testing.assert_allclose(
+            sd.Gxy[0, :, e], Pxy, rtol=0, atol=(1e-10 * np.abs(Pxy).max()))
+
+    return
+
+
+def test__averaged_spectra():
+    X = np.random.randn(4, 3, 5, 7) + (1j * np.random.randn(4, 3, 5, 7))
+
+    Sxx, Sxy = _averaged_spectra(X)
+
+    tools.assert_equal(Sxx.shape, (4, 7, 3))
+    tools.assert_equal(Sxy.shape, (6, 7, 3))
+
+    np.testing.assert_allclose(
+        Sxx, np.swapaxes(np.mean(np.abs(X) ** 2, axis=-2), -1, -2))
+
+    pairs = [(i, j) for i in range(4) for j in range((i + 1), 4)]
+
+    for k, (i, j) in enumerate(pairs):
+        np.testing.assert_allclose(
+            Sxy[k], np.mean(np.conj(X[i]) * X[j], axis=-2).T)
+
+    tools.assert_true(_averaged_spectra(X, cross=False)[1] is None)
+
+    return
+
+
+def test_CrossSpectralDensity():
+    tlim = [1., 1.01]
+    delay = 5
+
+    phases = [
+        Phase(1, chord=chord, filt=None, tlim=tlim, lazy=True)
+        for chord in ['V1', 'V2', 'V3']]
+
+    # Second channel is a delayed copy of the first,
+    # and third channel is independent
+    N = phases[0].Npts
+    x = np.random.randn(N + delay)
+    phases[0].x = x[delay:]
+    phases[1].x = x[:N]
+    phases[2].x = np.random.randn(N)
+
+    csd = CrossSpectralDensity(phases, Tens=2e-3, Nreal_per_ens=5)
+
+    tools.assert_equal(csd.pairs, [(0, 1), (0, 2), (1, 2)])
+    tools.assert_equal(csd.chords, ['V1', 'V2', 'V3'])
+    tools.assert_equal(csd.Gxx.shape, (3, len(csd.f), len(csd.t)))
+    tools.assert_equal(csd.Gxy.shape, (3, len(csd.f), len(csd.t)))
+
+    # Spectral densities are consistent w/ Parseval's theorem
+    # (to within the variance of the estimate)
+    var = np.sum(csd.Gxx, axis=1) * csd.df
+    np.testing.assert_allclose(var, 1, rtol=0.2)
+
+    # Coherence is bounded by unity, and at least of the
+    # delayed copies it is close to unity at low frequencies
+    Cxy = csd.coherence()
+    tools.assert_true(np.all(Cxy <= (1 + 1e-12)))
+    tools.assert_true(np.mean(Cxy[0, :20]) > 0.9)
+    tools.assert_true(np.mean(Cxy[1, :20]) < 0.5)
+
+    # Correlation peaks at delay of second channel
+    tau, rho = csd.correlation(maxlag=(20 / csd.Fs))
+    tools.assert_equal(len(tau), 41)
+    np.testing.assert_allclose(
+        tau[np.argmax(np.mean(rho[0], axis=-1))], delay / csd.Fs)
+    tools.assert_true(np.all(np.abs(rho) <= (1 + 1e-12)))
+
+    # Time-bases must match
+    short = Phase(1, chord='V2', filt=None, tlim=[1., 1.009], lazy=True)
+    short.x = np.random.randn(short.Npts)
+    tools.assert_raises(
+        ValueError, CrossSpectralDensity, [phases[0], short])
+    tools.assert_raises(ValueError, CrossSpectralDensity, phases[:1])
+
+    return
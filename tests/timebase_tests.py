@@ -0,0 +1,87 @@
+from nose import tools
+import numpy as np
+from bci.timebase import TimeBase
+
+
+def test_TimeBase():
+    t0 = -1.4986927509307861
+    Fs = (5. / 3) * 1e6
+    N = 10000
+
+    tb = TimeBase(t0, Fs, N)
+    t = t0 + (np.arange(N) / Fs)
+
+    # Materialized time-base
+    tools.assert_equal(len(tb), N)
+    np.testing.assert_equal(np.asarray(tb), t)
+
+    # Array-like attributes do not require materialization
+    tools.assert_equal(tb.shape, t.shape)
+    tools.assert_equal(tb.size, t.size)
+    tools.assert_equal(tb.ndim, t.ndim)
+    tools.assert_equal(tb.dtype, t.dtype)
+    tools.assert_equal(tb[10:500:7].size, t[10:500:7].size)
+
+    # Integer indexing
+    tools.assert_equal(tb[0], t[0])
+    tools.assert_equal(tb[123], t[123])
+    tools.assert_equal(tb[-1], t[-1])
+    tools.assert_raises(IndexError, tb.__getitem__, N)
+
+    # Array indexing
+    ind = np.array([0, 5, -2])
+    np.testing.assert_equal(tb[ind], t[ind])
+    np.testing.assert_equal(tb[t > 0], t[t > 0])
+
+    # Slicing returns another time-base
+    for sl in [slice(10, 500), slice(10, 500, 7), slice(None, None, -3)]:
+        tools.assert_is_instance(tb[sl], TimeBase)
+        np.testing.assert_equal(np.asarray(tb[sl]), t[sl])
+
+    tools.assert_equal(tb[10:500].t0, t[10])
+    tools.assert_equal(tb[::4].Fs, Fs / 4)
+    np.testing.assert_equal(np.asarray(tb[10:500][::3]), t[10:500][::3])
+
+    # Arithmetic and comparisons act on the materialized time-base
+    np.testing.assert_equal(tb * 1e3, t * 1e3)
+    np.testing.assert_equal(tb - t0, t - t0)
+    np.testing.assert_equal(tb > 0, t > 0)
+
+    tools.assert_equal(tb.min(), t.min())
+    tools.assert_equal(tb.max(), t.max())
+
+    return
+
+
+def test_TimeBase_searchsorted():
+    t0 = -1.4986927509307861
+    Fs = (5. / 3) * 1e6
+    N = 10000
+
+    tb = TimeBase(t0, Fs, N)
+    t = t0 + (np.arange(N) / Fs)
+
+    # Times before, after, exactly on, and between digitization times
+    times = np.concatenate((
+        [t0 - 1, t[-1] + 1],
+        t[::97],
+        t[::97] + (0.5 / Fs),
+        t[::97] - (0.5 / Fs)))
+
+    for side in ['left', 'right']:
+        np.testing.assert_equal(
+            tb.searchsorted(times, side=side),
+            t.searchsorted(times, side=side))
+
+        tools.assert_equal(
+            tb.searchsorted(t[50], side=side),
+            t.searchsorted(t[50], side=side))
+
+        # Sliced time-base
+        np.testing.assert_equal(
+            tb[100:5000:3].searchsorted(times, side=side),
+            t[100:5000:3].searchsorted(times, side=side))
+
+    tools.assert_raises(ValueError, tb.searchsorted, 0, side='middle')
+
+    return